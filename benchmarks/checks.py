@@ -0,0 +1,72 @@
+# benchmarks/checks.py
+"""
+Correctness checks of utils functions on synthetic data, for regressions the timing
+cases would not notice.
+
+    python -m benchmarks.checks             # run every check, exit 1 on a failure
+    python -m benchmarks.checks --only nodal
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+def check_nodal_injections_all_profiled(work: Path):
+    """
+    Every element of the synthetic grid has a profile, so no capacity is injected
+    constantly; the model must still produce float injections equal to a direct sum.
+    """
+    from benchmarks.synthetic import write_simbench_grid
+    from utils.simbench_injections import build_injection_model, load_elements
+    from utils.simbench_store import open_profile_store
+
+    grid = write_simbench_grid(work / "1-complete_data-mixed-all-0-sw", rows=2 * 96, n_loads=40, n_nodes=12)
+    elements = load_elements(grid)
+    assert elements["p_column"].notna().all() and elements["q_column"].notna().all()
+
+    model = build_injection_model(grid, work / "store")
+    p, q = model.compute()
+    profiles = open_profile_store(grid, work / "store")
+    for quantity, result in (("p", p), ("q", q)):
+        expected = np.zeros(result.shape)
+        for _, element in elements.iterrows():
+            column = profiles[element["profile_file"]].column(element[f"{quantity}_column"])
+            expected[:, result.columns.get_loc(element["node"])] += element[quantity] * np.asarray(column, dtype=np.float64)
+        np.testing.assert_allclose(result.to_numpy(), expected, rtol=1e-6, atol=1e-12)
+
+
+CHECKS = {
+    "nodal_injections_all_profiled": check_nodal_injections_all_profiled,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="run only checks whose name contains this substring")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    with tempfile.TemporaryDirectory(prefix="power-data-checks-") as tmp:
+        # Keep the cache of the checks away from the user's
+        os.environ["POWER_DATA_CACHE_DIR"] = str(Path(tmp) / "cache")
+        for name, check in CHECKS.items():
+            if args.only and args.only not in name:
+                continue
+            work = Path(tmp) / name
+            work.mkdir()
+            try:
+                check(work)
+            except Exception as exc:
+                failed += 1
+                print(f"FAIL {name}: {type(exc).__name__}: {exc}")
+            else:
+                print(f"ok   {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# benchmarks/imports.py
+"""
+Import time of the utils modules, each measured in a fresh interpreter, and the heavy
+optional dependencies each import drags in.
+
+    python -m benchmarks.imports                 # print a report
+    python -m benchmarks.imports --check         # exit 1 if a loader imports a plotting/notebook dependency
+
+Loader, catalog and processing modules must stay importable without matplotlib or IPython,
+so headless workers do not pay for them.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies only plotting and notebook display should load
+HEAVY_MODULES = ("matplotlib", "IPython")
+
+# Modules that must import without HEAVY_MODULES
+LIGHT_MODULES = (
+    "utils.data_catalog",
+    "utils.columnar_cache",
+    "utils.opsd_loader",
+    "utils.agenceore_loader",
+    "utils.elmas_loader",
+    "utils.ember_loader",
+    "utils.simbench_loader",
+    "utils.zenodo_loader",
+    "utils.dataset",
+    "utils.alignment",
+    "utils.rollups",
+    "utils.ingestion",
+    "utils.validation",
+    "utils.anomalies",
+    "utils.repair",
+    "utils.out_of_core",
+)
+
+# Plotting modules, reported for comparison; they load matplotlib only when drawing
+PLOT_MODULES = (
+    "utils.opsd_60min_plotter",
+    "utils.simbench_plotter",
+    "utils.report",
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, repeat: int = 3) -> dict:
+    """
+    Best import time of `module` over `repeat` fresh interpreters, and the heavy modules it loaded.
+    """
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {"seconds": min(r["seconds"] for r in runs), "loaded": runs[0]["loaded"]}
+
+
+def run(repeat: int = 3) -> dict:
+    results = {}
+    for module in (*LIGHT_MODULES, *PLOT_MODULES):
+        results[module] = measure_import(module, repeat)
+        loaded = ", ".join(results[module]["loaded"]) or "-"
+        print(f"{module:32s} {results[module]['seconds'] * 1e3:8.1f} ms  heavy: {loaded}", flush=True)
+    return results
+
+
+def check(results: dict) -> list[str]:
+    """
+    Light modules that loaded a heavy dependency.
+    """
+    return [f"{m} imports {', '.join(r['loaded'])}" for m, r in results.items()
+            if m in LIGHT_MODULES and r["loaded"]]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module (best is reported)")
+    parser.add_argument("--check", action="store_true", help="fail if a light module loads matplotlib or IPython")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.check:
+        problems = check(results)
+        for line in problems:
+            print(f"[heavy import] {line}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
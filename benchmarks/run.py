@@ -0,0 +1,264 @@
+# benchmarks/run.py
+"""
+Time loading, filtering, aggregation, downsampling and plotting of the utils functions on
+synthetic data, with throughput and peak (traced) memory per case.
+
+    python -m benchmarks.run --scale 0.1                   # run and print a report
+    python -m benchmarks.run --scale 1 --save-baseline     # store results as the baseline
+    python -m benchmarks.run --scale 1 --compare           # exit 1 on regressions vs the baseline
+
+Baselines are stored per scale under benchmarks/baselines/.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Callable
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Slowdown (or memory growth) factor above which a case counts as a regression
+DEFAULT_THRESHOLD = 1.3
+
+
+def _count_rows(fp: Path) -> int:
+    with open(fp, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b"")) - 1
+
+
+def build_cases(files: dict[str, Path]) -> list[tuple[str, str, Callable, Path]]:
+    """
+    (name, group, callable, input file) for every benchmarked function. Imported here so
+    the cache directory can be pointed at the work directory first.
+    """
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    from utils.agenceore_consumption_plotter import plot_consumption_total_active_power
+    from utils.agenceore_loader import _parse_consumption_csv, _read_consumption_csv, aggregate_consumption
+    from utils.anomalies import detect_file_anomalies
+    from utils.dataset import open_dataset
+    from utils.downsampling import downsample
+    from utils.elmas_loader import _parse_elmas_csv, _read_elmas_csv
+    from utils.elmas_plotter import plot_total_elmas_load
+    from utils.ember_loader import _parse_ember_csv, _parse_ember_store, _read_ember_csv, ember_slice, ember_wide, load_ember
+    from utils.ember_plotter import plot_ember_summary
+    from utils.opsd_60min_plotter import (
+        plot_opsd_daily_avg_renewables,
+        plot_opsd_max_energy_by_category,
+        plot_opsd_total_load_over_time,
+    )
+    from utils.opsd_loader import _parse_opsd_csv, _read_opsd_csv, load_opsd, sum_opsd_columns
+    from utils.out_of_core import full_history_stats
+    from utils.profile_catalog import scan_file
+    from utils.repair import repair_profiles
+    from utils.rollups import compute_rollups, query_rollup
+    from utils.simbench_injections import nodal_injections
+    from utils.simbench_loader import _parse_simbench_csv, _read_simbench_csv
+    from utils.simbench_plotter import (
+        plot_simbench_profile_max_loads_as_bar,
+        plot_simbench_res_daily_avg_as_bar,
+        plot_simbench_total_load_over_time,
+        unnormalize_simbench_loadprofile,
+    )
+    from utils.simbench_store import open_profile_store, scale_simbench_grids
+    from utils.timestamps import parse_timestamps
+    from utils.validation import profile_dataset
+    from utils.zenodo_loader import _parse_zenodo_csv, _read_zenodo_csv
+    from utils.zenodo_plotter import plot_zenodo_2016
+
+    def plot(fn, *args, **kwargs):
+        def run():
+            fn(*args, **kwargs)
+            plt.close("all")
+        return run
+
+    opsd60, opsd15 = files["opsd_60min"], files["opsd_15min"]
+    grid = files["simbench"]
+    load_profile, res_profile = grid / "LoadProfile.csv", grid / "RESProfile.csv"
+    agenceore, zenodo, elmas, ember = files["agenceore"], files["zenodo"], files["elmas"], files["ember"]
+    zenodo_format = "%d.%m.%Y %H:%M:%S"
+
+    opsd_frame = _read_opsd_csv(opsd15)
+    load_series = opsd_frame["DE_load_actual_entsoe_transparency"]
+    simbench_times = pd.read_csv(load_profile, sep=";", usecols=["time"])["time"]
+    window = (opsd_frame.index[len(opsd_frame) // 2], opsd_frame.index[len(opsd_frame) // 2 + 7 * 96])
+
+    return [
+        ("opsd.parse_csv", "load", lambda: _parse_opsd_csv(opsd60), opsd60),
+        ("opsd.read_cached", "load", lambda: _read_opsd_csv(opsd60), opsd60),
+        ("simbench.parse_csv", "load", lambda: _parse_simbench_csv(load_profile), load_profile),
+        ("simbench.read_cached", "load", lambda: _read_simbench_csv(load_profile), load_profile),
+        ("simbench.open_profile_store", "load", lambda: open_profile_store(grid), load_profile),
+        ("agenceore.parse_csv", "load", lambda: _parse_consumption_csv(agenceore), agenceore),
+        ("agenceore.read_cached", "load", lambda: _read_consumption_csv(agenceore), agenceore),
+        ("zenodo.parse_csv", "load", lambda: _parse_zenodo_csv(zenodo, zenodo_format), zenodo),
+        ("zenodo.read_cached", "load", lambda: _read_zenodo_csv(zenodo, zenodo_format), zenodo),
+        ("elmas.parse_csv", "load", lambda: _parse_elmas_csv(elmas), elmas),
+        ("elmas.read_cached", "load", lambda: _read_elmas_csv(elmas), elmas),
+        ("ember.parse_csv", "load", lambda: _parse_ember_csv(ember), ember),
+        ("ember.read_cached", "load", lambda: _read_ember_csv(ember), ember),
+        ("ember.parse_store", "load", lambda: _parse_ember_store(ember), ember),
+        ("ember.load_store", "load", lambda: load_ember(ember), ember),
+        ("timestamps.parse_timestamps", "load", lambda: parse_timestamps(simbench_times, source="simbench"), load_profile),
+        ("opsd.load_opsd_window", "filter", lambda: load_opsd(fp=opsd15, countries=["DE"], start=window[0], end=window[1]), opsd15),
+        ("opsd.load_opsd_suffix", "filter", lambda: load_opsd(fp=opsd60, suffix="_load_actual_entsoe_transparency"), opsd60),
+        ("simbench.profile_window", "filter", lambda: open_profile_store(grid)["LoadProfile"].to_frame(
+            start="2016-01-02", end="2016-01-09"), load_profile),
+        ("dataset.collect_window", "filter", lambda: open_dataset("OPSD", fp=opsd15).select(
+            country="DE", attribute="generation_actual").between(*window).resample("1h").collect(), opsd15),
+        ("ember.slice", "filter", lambda: ember_slice(load_ember(ember), category="Electricity generation",
+                                                       unit="TWh", start="2020-01-01", end="2020-12-31"), ember),
+        ("ember.wide", "filter", lambda: ember_wide("Solar", df=load_ember(ember)), ember),
+        ("profile_catalog.scan_file", "filter", lambda: scan_file("OPSD", opsd15), opsd15),
+        ("opsd.sum_by_country_variable", "aggregate", lambda: sum_opsd_columns(
+            opsd_frame, by=["country", "variable"]), opsd15),
+        ("agenceore.aggregate_consumption", "aggregate", lambda: aggregate_consumption(agenceore, by=["time", "REGION"]), agenceore),
+        ("out_of_core.full_history_stats", "aggregate", lambda: full_history_stats(
+            "AgenceORE_Consumption_lt36kVA", files=[agenceore]), agenceore),
+        ("rollups.compute_rollups", "aggregate", lambda: compute_rollups(opsd_frame), opsd15),
+        ("rollups.query_rollup", "aggregate", lambda: query_rollup(opsd15, _parse_opsd_csv, "1D", "mean"), opsd15),
+        ("validation.profile_dataset", "aggregate", lambda: profile_dataset(opsd_frame), opsd15),
+        ("repair.repair_profiles", "aggregate", lambda: repair_profiles(opsd_frame, lower=0.0), opsd15),
+        ("anomalies.detect_file", "aggregate", lambda: detect_file_anomalies(opsd60, _parse_opsd_csv, source="OPSD"), opsd60),
+        ("simbench.unnormalize", "aggregate", lambda: unnormalize_simbench_loadprofile(
+            load_profile, grid / "Load.csv", output_fp=None, plot=False), load_profile),
+        ("simbench.scale_grids", "aggregate", lambda: scale_simbench_grids([grid]), load_profile),
+        ("simbench.nodal_injections", "aggregate", lambda: nodal_injections(grid), load_profile),
+        ("downsampling.minmax", "downsample", lambda: downsample(load_series, 1000, "minmax"), opsd15),
+        ("downsampling.lttb", "downsample", lambda: downsample(load_series, 1000, "lttb"), opsd15),
+        ("plot.opsd_total_load", "plot", plot(plot_opsd_total_load_over_time, opsd60), opsd60),
+        ("plot.opsd_max_energy", "plot", plot(plot_opsd_max_energy_by_category, opsd60), opsd60),
+        ("plot.opsd_daily_renewables", "plot", plot(plot_opsd_daily_avg_renewables, opsd60), opsd60),
+        ("plot.simbench_total_load", "plot", plot(plot_simbench_total_load_over_time, load_profile), load_profile),
+        ("plot.simbench_max_loads", "plot", plot(plot_simbench_profile_max_loads_as_bar, load_profile), load_profile),
+        ("plot.simbench_res_daily", "plot", plot(plot_simbench_res_daily_avg_as_bar, res_profile), res_profile),
+        ("plot.agenceore_total", "plot", plot(plot_consumption_total_active_power, agenceore), agenceore),
+        ("plot.zenodo", "plot", plot(plot_zenodo_2016, zenodo), zenodo),
+        ("plot.elmas_total", "plot", plot(plot_total_elmas_load, elmas), elmas),
+        ("plot.ember_summary", "plot", plot(plot_ember_summary, 2020, ember), ember),
+    ]
+
+
+def measure(fn: Callable, repeat: int) -> tuple[float, int]:
+    """
+    Best wall time over `repeat` runs and peak traced memory of one extra run.
+    The first run also warms caches, so cached readers report their warm time.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def run(scale: float, repeat: int, workdir: Path, only: str | None = None) -> dict:
+    os.environ["POWER_DATA_CACHE_DIR"] = str(workdir / "cache")
+    # Memoized compute results would turn every repeat into a lookup
+    os.environ["POWER_DATA_MEMO"] = "0"
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    import matplotlib
+    matplotlib.use("Agg")
+    from benchmarks.synthetic import generate_all
+
+    files = generate_all(workdir / "data", scale=scale)
+    rows = {}
+    results = {}
+    for name, group, fn, fp in build_cases(files):
+        if only is not None and only not in name:
+            continue
+        rows.setdefault(fp, _count_rows(fp))
+        with warnings.catch_warnings():
+            # Expected: NaN-only windows in numpy reductions and plt.show() on the Agg backend
+            warnings.filterwarnings("ignore", r"(All-NaN slice|Mean of empty slice)", RuntimeWarning)
+            warnings.filterwarnings("ignore", r".*non-interactive", UserWarning)
+            seconds, peak = measure(fn, repeat)
+        results[name] = {
+            "group": group,
+            "seconds": seconds,
+            "rows_per_s": rows[fp] / seconds if seconds else None,
+            "mb_per_s": fp.stat().st_size / 1e6 / seconds if seconds else None,
+            "peak_mb": peak / 1e6,
+        }
+        print(f"{name:36s} {seconds * 1e3:10.1f} ms  {results[name]['peak_mb']:9.1f} MB", flush=True)
+    return {
+        "scale": scale,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def _baseline_path(scale: float) -> Path:
+    return BASELINE_DIR / f"baseline-scale{scale:g}.json"
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """
+    Cases whose time or peak memory grew by more than `threshold` relative to the baseline.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for key, unit in (("seconds", "s"), ("peak_mb", "MB")):
+            if base[key] and result[key] > base[key] * threshold:
+                regressions.append(
+                    f"{name}: {key} {result[key]:.4g}{unit} vs baseline {base[key]:.4g}{unit} "
+                    f"({result[key] / base[key]:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=0.1, help="size relative to the real files")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is reported)")
+    parser.add_argument("--only", help="run only cases whose name contains this string")
+    parser.add_argument("--workdir", type=Path, help="where synthetic data and caches are written (default: temp dir)")
+    parser.add_argument("--output", type=Path, help="write the full report as JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="store the report as the baseline for this scale")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline for this scale")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="power-bench-") as tmp:
+        report = run(args.scale, args.repeat, args.workdir or Path(tmp), args.only)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        _baseline_path(args.scale).write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {_baseline_path(args.scale)}")
+    if args.compare:
+        baseline_fp = _baseline_path(args.scale)
+        if not baseline_fp.exists():
+            print(f"No baseline at {baseline_fp}; run with --save-baseline first.")
+            return 1
+        regressions = compare(report, json.loads(baseline_fp.read_text()), args.threshold)
+        for line in regressions:
+            print(f"[regression] {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# benchmarks/synthetic.py
+"""
+Synthetic files with the schemas of each source, so loaders and plotters can be measured
+without the (LFS-tracked) raw data. `scale` multiplies the default sizes, which are
+close to the real files at scale=1.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+OPSD_COUNTRIES = ["AT", "BE", "CH", "DE", "DK", "ES", "FR", "GB", "IT", "NL", "PL", "SE"]
+SIMBENCH_LOAD_PROFILES = ["H0-A", "H0-B", "H0-C", "G0-A", "G1-A", "G1-B", "L0-A", "L1-A"]
+SIMBENCH_RES_PROFILES = ["PV1", "PV2", "PV3", "WP1", "WP2", "BM1", "Hydro1"]
+AGENCEORE_REGIONS = [
+    "Auvergne-Rhône-Alpes", "Bourgogne-Franche-Comté", "Bretagne", "Centre-Val de Loire",
+    "Grand Est", "Hauts-de-France", "Normandie", "Nouvelle Aquitaine", "Occitanie",
+    "Pays de la Loire", "Provence-Alpes-Côte d'Azur", "Île-de-France",
+]
+EMBER_AREAS = ["Austria", "Belgium", "France", "Germany", "Italy", "Netherlands", "Poland", "Spain", "EU"]
+EMBER_VARIABLES = [
+    ("Electricity demand", "Demand", "Demand", "TWh"),
+    ("Electricity generation", "Fuel", "Solar", "TWh"),
+    ("Electricity generation", "Fuel", "Wind", "TWh"),
+    ("Electricity generation", "Fuel", "Hydro", "TWh"),
+    ("Electricity generation", "Fuel", "Bioenergy", "TWh"),
+    ("Electricity generation", "Fuel", "Gas", "TWh"),
+    ("Electricity generation", "Aggregate fuel", "Renewables", "TWh"),
+    ("Power sector emissions", "Total", "Total emissions", "mtCO2"),
+]
+
+# Rows (timesteps for wide sources) at scale=1
+DEFAULT_ROWS = {
+    "opsd_60min": 50_000,
+    "opsd_15min": 200_000,
+    "simbench": 35_136,
+    "agenceore": 17_568,
+    "zenodo": 35_136,
+    "elmas": 8_760,
+    "ember": 120,
+}
+
+
+def _rows(name: str, scale: float) -> int:
+    return max(10, int(DEFAULT_ROWS[name] * scale))
+
+
+def _profile(rng: np.random.Generator, n: int, steps_per_day: int, n_cols: int) -> np.ndarray:
+    """
+    Daily-periodic non-negative series with noise, one column per profile.
+    """
+    phase = 2 * np.pi * np.arange(n)[:, None] / steps_per_day
+    shift = rng.uniform(0, 2 * np.pi, n_cols)
+    return np.clip(0.5 + 0.4 * np.sin(phase + shift) + 0.1 * rng.standard_normal((n, n_cols)), 0, None)
+
+
+def write_opsd(fp: str | Path, rows: int, freq: str = "60min", seed: int = 0) -> Path:
+    """
+    OPSD singleindex: 'utc_timestamp', 'cet_cest_timestamp' and country-prefixed columns.
+    """
+    rng = np.random.default_rng(seed)
+    time = pd.date_range("2015-01-01", periods=rows, freq=freq, tz="UTC")
+    steps_per_day = int(pd.Timedelta("1D") / pd.Timedelta(freq))
+    columns = {
+        "utc_timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "cet_cest_timestamp": time.tz_convert("Europe/Brussels").strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    suffixes = [
+        ("load_actual_entsoe_transparency", 50_000),
+        ("load_forecast_entsoe_transparency", 50_000),
+        ("solar_capacity", 40_000),
+        ("solar_generation_actual", 20_000),
+        ("solar_profile", 1),
+        ("wind_onshore_capacity", 50_000),
+        ("wind_onshore_generation_actual", 25_000),
+        ("wind_offshore_generation_actual", 5_000),
+        ("price_day_ahead", 60),
+    ]
+    values = _profile(rng, rows, steps_per_day, len(OPSD_COUNTRIES) * len(suffixes))
+    i = 0
+    for country in OPSD_COUNTRIES:
+        for suffix, scale in suffixes:
+            columns[f"{country}_{suffix}"] = np.round(values[:, i] * scale, 2)
+            i += 1
+    df = pd.DataFrame(columns)
+    # Real files have leading gaps for series that start later
+    df.iloc[: rows // 20, 2::7] = np.nan
+    df.to_csv(fp, index=False)
+    return Path(fp)
+
+
+def write_simbench_grid(grid_dir: str | Path, rows: int, n_loads: int = 500, n_nodes: int = 300, seed: int = 0) -> Path:
+    """
+    SimBench grid folder: ';'-separated LoadProfile/RESProfile with 'time' (dd.mm.yyyy HH:MM)
+    and '_pload'/'_qload' columns, plus Node/Load/RES element tables.
+    """
+    rng = np.random.default_rng(seed)
+    grid_dir = Path(grid_dir)
+    grid_dir.mkdir(parents=True, exist_ok=True)
+    time = pd.date_range("2016-01-01", periods=rows, freq="15min").strftime("%d.%m.%Y %H:%M")
+
+    load = _profile(rng, rows, 96, 2 * len(SIMBENCH_LOAD_PROFILES))
+    profile = {"time": time}
+    for i, name in enumerate(SIMBENCH_LOAD_PROFILES):
+        profile[f"{name}_pload"] = np.round(load[:, 2 * i], 4)
+        profile[f"{name}_qload"] = np.round(load[:, 2 * i + 1] * 0.3, 4)
+    pd.DataFrame(profile).to_csv(grid_dir / "LoadProfile.csv", sep=";", index=False)
+
+    res = _profile(rng, rows, 96, len(SIMBENCH_RES_PROFILES))
+    pd.DataFrame({"time": time, **{name: np.round(res[:, i], 4) for i, name in enumerate(SIMBENCH_RES_PROFILES)}}).to_csv(
+        grid_dir / "RESProfile.csv", sep=";", index=False
+    )
+
+    nodes = [f"LV1.101 Bus {i}" for i in range(n_nodes)]
+    pd.DataFrame({"id": nodes, "type": "busbar", "vmSetp": 1.0}).to_csv(grid_dir / "Node.csv", sep=";", index=False)
+    pd.DataFrame({
+        "id": [f"LV1.101 Load {i}" for i in range(n_loads)],
+        "node": rng.choice(nodes, n_loads),
+        "profile": rng.choice(SIMBENCH_LOAD_PROFILES, n_loads),
+        "pLoad": np.round(rng.uniform(0.001, 0.01, n_loads), 5),
+        "qLoad": np.round(rng.uniform(0.0005, 0.004, n_loads), 5),
+        "sR": 0.01,
+    }).to_csv(grid_dir / "Load.csv", sep=";", index=False)
+    n_res = max(1, n_loads // 4)
+    pd.DataFrame({
+        "id": [f"LV1.101 SGen {i}" for i in range(n_res)],
+        "node": rng.choice(nodes, n_res),
+        "type": "PV",
+        "profile": rng.choice(SIMBENCH_RES_PROFILES, n_res),
+        "pRES": np.round(rng.uniform(0.002, 0.02, n_res), 5),
+        "qRES": 0.0,
+        "sR": 0.02,
+    }).to_csv(grid_dir / "RES.csv", sep=";", index=False)
+    return grid_dir
+
+
+def write_agenceore(fp: str | Path, rows: int, year: int = 2020, seed: int = 0) -> Path:
+    """
+    AgenceORE long format: 'HORODATE' (ISO with offset), 'REGION', profile/power-band keys,
+    'NB_POINTS_SOUTIRAGE' and 'ENERGIE_SOUTIREE'; `rows` is the number of half-hours.
+    """
+    rng = np.random.default_rng(seed)
+    time = pd.date_range(f"{year}-01-01", periods=rows, freq="30min", tz="Europe/Paris")
+    stamps = time.strftime("%Y-%m-%dT%H:%M:%S%z").str.replace(r"(\d\d)(\d\d)$", r"\1:\2", regex=True)
+    keys = [(r, p) for r in AGENCEORE_REGIONS for p in ("RES1", "RES2", "PRO1")]
+    n = rows * len(keys)
+    df = pd.DataFrame({
+        "HORODATE": np.repeat(stamps.to_numpy(), len(keys)),
+        "REGION": np.tile([k[0] for k in keys], rows),
+        "PROFIL": np.tile([k[1] for k in keys], rows),
+        "PLAGE_DE_PUISSANCE_SOUTIRAGE": "P0: Total <= 36 kVA",
+        "NB_POINTS_SOUTIRAGE": rng.integers(100_000, 2_000_000, n),
+        "ENERGIE_SOUTIREE": np.round(rng.uniform(1e7, 5e8, n)),
+    })
+    df.to_csv(fp, sep=";", index=False)
+    return Path(fp)
+
+
+def write_zenodo(fp: str | Path, rows: int, n_plants: int = 20, seed: int = 0) -> Path:
+    """
+    Zenodo industrial loads: ';'-separated, 'Time stamp' as dd.mm.yyyy HH:MM:SS, one column per plant.
+    """
+    rng = np.random.default_rng(seed)
+    time = pd.date_range("2016-01-01", periods=rows, freq="15min").strftime("%d.%m.%Y %H:%M:%S")
+    values = _profile(rng, rows, 96, n_plants) * 500
+    df = pd.DataFrame({"Time stamp": time, **{f"IP{i + 1}": np.round(values[:, i], 1) for i in range(n_plants)}})
+    df.to_csv(fp, sep=";", index=False)
+    return Path(fp)
+
+
+def write_elmas(fp: str | Path, rows: int, n_clusters: int = 18, seed: int = 0) -> Path:
+    """
+    ELMAS: 'Time' and one load column per cluster.
+    """
+    rng = np.random.default_rng(seed)
+    time = pd.date_range("2016-01-01", periods=rows, freq="60min").strftime("%Y-%m-%d %H:%M:%S")
+    values = _profile(rng, rows, 24, n_clusters) * 1000
+    df = pd.DataFrame({"Time": time, **{f"Cluster {i + 1}": np.round(values[:, i], 3) for i in range(n_clusters)}})
+    df.to_csv(fp, index=False)
+    return Path(fp)
+
+
+def write_ember(fp: str | Path, months: int, seed: int = 0) -> Path:
+    """
+    Ember monthly long format: one row per (Area, Date, Category, Subcategory, Variable, Unit).
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2015-01-01", periods=months, freq="MS").strftime("%Y-%m-%d")
+    index = pd.MultiIndex.from_product([EMBER_AREAS, dates, range(len(EMBER_VARIABLES))], names=["Area", "Date", "v"])
+    df = index.to_frame(index=False)
+    variables = pd.DataFrame(EMBER_VARIABLES, columns=["Category", "Subcategory", "Variable", "Unit"])
+    df = df.join(variables, on="v").drop(columns="v")
+    df.insert(1, "Country code", df["Area"].str[:3].str.upper())
+    df.insert(3, "Area type", np.where(df["Area"] == "EU", "Region", "Country"))
+    df["Value"] = np.round(rng.uniform(0.1, 50, len(df)), 2)
+    df["YoY absolute change"] = np.nan
+    df["YoY % change"] = np.nan
+    df.to_csv(fp, index=False)
+    return Path(fp)
+
+
+def generate_all(root: str | Path, scale: float = 0.1, seed: int = 0) -> dict[str, Path]:
+    """
+    Write one synthetic dataset per source under `root`; returns paths keyed by dataset name.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    return {
+        "opsd_60min": write_opsd(root / "time_series_60min_singleindex.csv", _rows("opsd_60min", scale), "60min", seed),
+        "opsd_15min": write_opsd(root / "time_series_15min_singleindex.csv", _rows("opsd_15min", scale), "15min", seed),
+        "simbench": write_simbench_grid(root / "1-complete_data-mixed-all-0-sw", _rows("simbench", scale), seed=seed),
+        "agenceore": write_agenceore(root / "consumption_30min_2020.csv", _rows("agenceore", scale), seed=seed),
+        "zenodo": write_zenodo(root / "LoadProfile_20IPs_2016.csv", _rows("zenodo", scale), seed=seed),
+        "elmas": write_elmas(root / "Time_series_18_clusters.csv", _rows("elmas", scale), seed=seed),
+        # Ember needs at least 2015-2020 for plot_ember_summary's default year
+        "ember": write_ember(root / "europe_monthly_full_release_long_format.csv", max(72, _rows("ember", scale)), seed),
+    }
@@ -1,46 +1,52 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
+from typing import Iterable
 
+from .agenceore_loader import aggregate_consumption
+from .downsampling import Method, downsample
+from .memo import memoize
 
-def _read_consumption_csv(fp: str | Path) -> pd.DataFrame:
-    """
-    Load consumption CSV and parse timestamps with UTC.
-    Assumes French CSVs with ';' separator and 'HORODATE' as datetime column.
-    """
-    df = pd.read_csv(fp, sep=";")
-    df.rename(columns={"HORODATE": "time"}, inplace=True)
-    df["time"] = pd.to_datetime(df["time"], utc=True)
-    df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
-    return df
 
-
-def plot_consumption_total_active_power(
-    fp: str | Path,
+@memoize
+def compute_consumption_total_active_power(
+    fp: str | Path | Iterable[str | Path],
     start_time: str | None = None,
     end_time: str | None = None,
     max_points: int = 500,
-):
+    downsample_method: Method = "minmax",
+) -> pd.DataFrame:
     """
-    Plot the total active power (in MW) over time.
+    Total active power (in MW) over time, downsampled for display.
+    `fp` may be a single yearly file or several, which are aggregated in bounded-size chunks.
     """
-    df = _read_consumption_csv(fp)
-
-    if start_time:
-        df = df[df["time"] >= pd.to_datetime(start_time, utc=True)]
-    if end_time:
-        df = df[df["time"] <= pd.to_datetime(end_time, utc=True)]
-
     # Sum energy consumption for all regions at each timestamp
-    df_grouped = df.groupby("time")["ENERGIE_SOUTIREE"].sum().reset_index()
+    df_grouped = aggregate_consumption(
+        fp, by="time", values="ENERGIE_SOUTIREE", start=start_time, end=end_time
+    )
 
     # Convert from Wh/30min to kW
     df_grouped["total_active_power_mw"] = df_grouped["ENERGIE_SOUTIREE"] / 0.5 / 1000000000
 
-    # Downsample if too many points
-    if len(df_grouped) > max_points:
-        step = max(1, len(df_grouped) // max_points)
-        df_grouped = df_grouped.iloc[::step]
+    # Downsample if too many points, keeping peaks and troughs
+    return downsample(
+        df_grouped.set_index("time")[["total_active_power_mw"]], max_points, downsample_method
+    ).reset_index()
+
+
+def plot_consumption_total_active_power(
+    fp: str | Path | Iterable[str | Path],
+    start_time: str | None = None,
+    end_time: str | None = None,
+    max_points: int = 500,
+    downsample_method: Method = "minmax",
+    show: bool = True,
+) -> pd.DataFrame | None:
+    """
+    Plot the total active power (in MW) over time; returns the plotted series when show=False.
+    """
+    import matplotlib.pyplot as plt
+
+    df_grouped = compute_consumption_total_active_power(fp, start_time, end_time, max_points, downsample_method)
 
     # Plot
     plt.figure(figsize=(12, 6))
@@ -51,4 +57,7 @@ def plot_consumption_total_active_power(
     plt.grid(True)
     plt.tight_layout()
     plt.legend()
-    plt.show()
+    if show:
+        plt.show()
+        return None
+    return df_grouped
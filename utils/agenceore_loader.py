@@ -0,0 +1,165 @@
+# utils/agenceore_loader.py
+import pandas as pd
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .columnar_cache import cached_entry, iter_cached_batches, read_cached
+from .timestamps import parse_timestamps
+
+AGENCEORE_RAW_DIR = Path(__file__).resolve().parent.parent / "AgenceORE_Consumption_lt36kVA" / "raw"
+
+# Rows per chunk; peak memory is bounded by one chunk plus the running aggregate
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def _clean_consumption_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.rename(columns={"HORODATE": "time"})
+    df["time"] = parse_timestamps(df["time"], source="agenceore", utc=True)
+    return df.loc[:, ~df.columns.str.contains("^Unnamed")]
+
+
+def _parse_consumption_csv(fp: str | Path) -> pd.DataFrame:
+    """
+    Parse consumption CSV and timestamps with UTC.
+    Assumes French CSVs with ';' separator and 'HORODATE' as datetime column.
+    """
+    return _clean_consumption_frame(pd.read_csv(fp, sep=";"))
+
+
+def _read_consumption_csv(fp: str | Path) -> pd.DataFrame:
+    """
+    Load consumption CSV through the columnar cache.
+    """
+    return read_cached(fp, _parse_consumption_csv)
+
+
+def _energy_by_region(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Time-indexed wide frame of energy per region (one column per REGION) from consumption rows.
+    """
+    return df.groupby(["time", "REGION"])["ENERGIE_SOUTIREE"].sum().unstack("REGION")
+
+
+def _parse_consumption_by_region(fp: str | Path) -> pd.DataFrame:
+    """
+    Time-indexed wide frame of energy per region (one column per REGION) for one file.
+    """
+    return _energy_by_region(aggregate_consumption(fp, by=["time", "REGION"], values="ENERGIE_SOUTIREE"))
+
+
+def consumption_files(years: Iterable[int] | None = None) -> list[Path]:
+    """
+    Raw half-hourly consumption files, optionally restricted to some years.
+    """
+    files = sorted(AGENCEORE_RAW_DIR.glob("consumption_30min_*.csv"))
+    if years is not None:
+        wanted = {str(y) for y in years}
+        files = [fp for fp in files if fp.stem.rsplit("_", 1)[-1] in wanted]
+    return files
+
+
+def iter_consumption_chunks(
+    fps: str | Path | Iterable[str | Path],
+    columns: list[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream consumption rows file by file in chunks of at most `chunksize` rows.
+    'HORODATE' is renamed to 'time' and parsed as UTC; rows outside [start, end] are dropped.
+    Files already in the columnar cache are streamed from Parquet instead of the CSV.
+    """
+    if isinstance(fps, (str, Path)):
+        fps = [fps]
+    start = pd.to_datetime(start, utc=True) if start else None
+    end = pd.to_datetime(end, utc=True) if end else None
+
+    for fp in fps:
+        read_columns = None if columns is None else ["time", *[c for c in columns if c != "time"]]
+        entry = cached_entry(fp, _parse_consumption_csv)
+        if entry is not None:
+            chunks = iter_cached_batches(entry, columns=read_columns, batch_size=chunksize)
+        else:
+            usecols = None if read_columns is None else [
+                "HORODATE" if c == "time" else c for c in read_columns
+            ]
+            chunks = pd.read_csv(fp, sep=";", usecols=usecols, chunksize=chunksize)
+
+        for chunk in chunks:
+            if "HORODATE" in chunk.columns:
+                chunk = _clean_consumption_frame(chunk)
+            if start is not None:
+                chunk = chunk[chunk["time"] >= start]
+            if end is not None:
+                chunk = chunk[chunk["time"] <= end]
+            if not chunk.empty:
+                yield chunk
+
+
+def aggregate_chunks(
+    chunks: Iterable[pd.DataFrame],
+    by: list[str],
+    values: list[str],
+) -> pd.DataFrame:
+    """
+    Sum `values` grouped by `by` over a stream of chunks.
+    Each chunk is reduced to partial sums and merged into a running total, so memory
+    scales with the number of groups rather than the number of input rows.
+    """
+    total = None
+    for chunk in chunks:
+        partial = chunk.groupby(by, sort=False)[values].sum()
+        total = partial if total is None else pd.concat([total, partial]).groupby(level=by, sort=False).sum()
+
+    if total is None:
+        return pd.DataFrame(columns=[*by, *values])
+    return total.sort_index().reset_index()
+
+
+def aggregate_consumption(
+    fps: str | Path | Iterable[str | Path] | None = None,
+    by: list[str] | str = "time",
+    values: list[str] | str = "ENERGIE_SOUTIREE",
+    start: str | None = None,
+    end: str | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    Streaming group-by sum over one or several consumption files (all raw years by default).
+    Typical groupings are ["time"] for national totals and ["time", "REGION"] per region.
+    """
+    fps = consumption_files() if fps is None else fps
+    by = [by] if isinstance(by, str) else list(by)
+    values = [values] if isinstance(values, str) else list(values)
+    chunks = iter_consumption_chunks(fps, columns=[*by, *values], start=start, end=end, chunksize=chunksize)
+    return aggregate_chunks(chunks, by, values)
+
+
+def pivot_consumption_by_region(
+    fps: str | Path | Iterable[str | Path] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Wide per-region tables used for the processed/consumer files:
+    one with '<REGION>_CONS_PTS' columns and one with '<REGION>_ACTIVE_ENERGY' columns,
+    both with a leading 'TIME' column and computed from the streaming aggregate.
+    """
+    grouped = aggregate_consumption(
+        fps,
+        by=["time", "REGION"],
+        values=["NB_POINTS_SOUTIRAGE", "ENERGIE_SOUTIREE"],
+        start=start,
+        end=end,
+        chunksize=chunksize,
+    ).rename(columns={"time": "TIME"})
+
+    tables = []
+    for value, suffix in [("NB_POINTS_SOUTIRAGE", "_CONS_PTS"), ("ENERGIE_SOUTIREE", "_ACTIVE_ENERGY")]:
+        wide = grouped.pivot(index="TIME", columns="REGION", values=value)
+        wide = wide[sorted(wide.columns)]
+        wide.columns = [f"{region}{suffix}" for region in wide.columns]
+        tables.append(wide.reset_index())
+    return tables[0], tables[1]
@@ -0,0 +1,253 @@
+# utils/alignment.py
+from pathlib import Path
+from typing import Callable, Iterator, Literal, NamedTuple
+
+import pandas as pd
+
+from .agenceore_loader import _parse_consumption_by_region, consumption_files
+from .columnar_cache import ensure_cached
+from .data_catalog import source_folder
+from .elmas_loader import ELMAS_RAW_FP, _parse_elmas_csv
+from .opsd_loader import _parse_opsd_csv, opsd_path
+from .simbench_loader import _parse_simbench_csv
+from .timestamps import parse_timestamps
+from .zenodo_loader import _parse_zenodo_csv
+
+Kind = Literal["power", "energy"]
+
+# Extra time read on each side of a window, so edge intervals are complete and a
+# fall-back DST hour is seen twice when localizing
+WINDOW_PADDING = pd.Timedelta("1D")
+
+# Length of the windows read and aligned at a time by iter_aligned
+DEFAULT_CHUNK = "30D"
+
+# Fixed UTC+1 for sources recorded in CET without DST shifts (a full year has no
+# missing or repeated hours); tz names follow the POSIX sign convention
+CET_STANDARD = "Etc/GMT-1"
+
+
+class AlignSpec(NamedTuple):
+    """
+    One source series to align. `kind` decides the resampling: "power" values are averaged
+    when coarsened and held when refined, "energy" values (per interval) are summed and split.
+    `tz` is the zone of naive timestamps (None: UTC); aware timestamps are converted.
+    With `combine`, the selected columns are summed into one "total" column.
+    """
+    name: str
+    fp: str | Path
+    reader: Callable[..., pd.DataFrame]
+    kind: Kind = "power"
+    tz: str | None = None
+    time_col: str | None = None
+    columns: list[str] | None = None
+    combine: bool = False
+    reader_kwargs: dict = {}
+
+
+def _parse_eco2mix_csv(fp: str | Path, sep: str = ";", encoding: str | None = None) -> pd.DataFrame:
+    """
+    Parse an eCO2mix export indexed by naive local (Europe/Paris) time. The timestamp is
+    built from the 'Date' and 'Heures' columns, or taken from a single 'Date - Heure' column.
+    Non-numeric columns (e.g. 'Périmètre', 'Nature') are dropped.
+    """
+    df = pd.read_csv(fp, sep=sep, encoding=encoding)
+    df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
+    if "Date - Heure" in df.columns:
+        raw = df.pop("Date - Heure")
+    else:
+        raw = df.pop("Date").astype(str) + " " + df.pop("Heures").astype(str)
+    time = parse_timestamps(raw.str.strip(), source="eco2mix")
+    if time.dt.tz is not None:
+        time = time.dt.tz_convert("Europe/Paris").dt.tz_localize(None)
+    df.index = pd.DatetimeIndex(time, name="time")
+    # Rows stay in file order: the repeated fall-back hour is only resolvable by position
+    df = df.apply(pd.to_numeric, errors="coerce").dropna(axis=1, how="all")
+    return df[df.index.notna()]
+
+
+def source_spec(source: str, fp: str | Path | None = None, **overrides) -> AlignSpec:
+    """
+    Alignment spec of a catalog source with its reader, time zone and power/energy kind;
+    any AlignSpec field can be overridden, e.g. source_spec("OPSD", columns=["FR_load_actual_entsoe_transparency"]).
+    """
+    if source == "OPSD":
+        spec = AlignSpec("OPSD", fp or opsd_path("60min"), _parse_opsd_csv)
+    elif source == "SimBench":
+        default = source_folder("SimBench") / "raw" / "consumer" / "LoadProfile.csv"
+        spec = AlignSpec("SimBench", fp or default, _parse_simbench_csv, tz=CET_STANDARD, time_col="time")
+    elif source == "Zenodo":
+        default = source_folder("Zenodo") / "raw" / "LoadProfile_20IPs_2016.csv"
+        spec = AlignSpec("Zenodo", fp or default, _parse_zenodo_csv, tz=CET_STANDARD,
+                         reader_kwargs={"time_format": "%d.%m.%Y %H:%M:%S"})
+    elif source == "ELMAS":
+        spec = AlignSpec("ELMAS", fp or ELMAS_RAW_FP, _parse_elmas_csv, kind="energy", tz=CET_STANDARD)
+    elif source == "AgenceORE_Consumption_lt36kVA":
+        spec = AlignSpec("AgenceORE", fp or consumption_files()[-1], _parse_consumption_by_region, kind="energy")
+    elif source == "eCO2mix_France_GenerationBySource":
+        if fp is None:
+            raise ValueError("eCO2mix has no raw files in the repository; pass `fp` explicitly.")
+        spec = AlignSpec("eCO2mix", fp, _parse_eco2mix_csv, tz="Europe/Paris")
+    else:
+        raise ValueError(f"No alignment spec defined for source '{source}'.")
+    return spec._replace(**overrides)
+
+
+def _native_bounds(spec: AlignSpec, start: pd.Timestamp, end: pd.Timestamp) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    Padded UTC window expressed in the source's own timestamps (naive local time for `tz` sources).
+    """
+    lo, hi = start - WINDOW_PADDING, end + WINDOW_PADDING
+    if spec.tz is None:
+        return lo, hi
+    return lo.tz_convert(spec.tz).tz_localize(None), hi.tz_convert(spec.tz).tz_localize(None)
+
+
+def _read_window(spec: AlignSpec, lo: pd.Timestamp, hi: pd.Timestamp) -> pd.DataFrame:
+    """
+    Rows of a source with lo <= time <= hi, indexed by time and in file order. Row groups
+    of the cached Parquet file outside the window are skipped using their statistics.
+    """
+    path = ensure_cached(spec.fp, spec.reader, **spec.reader_kwargs)
+    if path is None:
+        df = spec.reader(spec.fp, **spec.reader_kwargs)
+        df = df.set_index(spec.time_col) if spec.time_col is not None else df
+        df = _match_tz(df, lo)
+        return df[(df.index >= lo) & (df.index <= hi)]
+
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    time_col = spec.time_col
+    if time_col is None:
+        time_col = next(c for c in schema.pandas_metadata["index_columns"] if isinstance(c, str))
+    if getattr(schema.field(time_col).type, "tz", None) is not None:
+        lo, hi = _as_utc(lo), _as_utc(hi)
+    else:
+        lo, hi = _as_naive(lo), _as_naive(hi)
+
+    columns = None if spec.columns is None else list(spec.columns)
+    if columns is not None and spec.time_col is not None:
+        columns = [spec.time_col, *columns]
+    df = pd.read_parquet(path, engine="pyarrow", columns=columns, filters=[(time_col, ">=", lo), (time_col, "<=", hi)])
+    return df.set_index(spec.time_col) if spec.time_col is not None else df
+
+
+def _as_utc(ts: pd.Timestamp) -> pd.Timestamp:
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _as_naive(ts: pd.Timestamp) -> pd.Timestamp:
+    return ts if ts.tzinfo is None else ts.tz_convert("UTC").tz_localize(None)
+
+
+def _match_tz(df: pd.DataFrame, like: pd.Timestamp) -> pd.DataFrame:
+    """
+    Index converted to the awareness of `like`, so both can be compared when slicing.
+    """
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None and like.tzinfo is None:
+        df.index = index.tz_convert("UTC").tz_localize(None)
+    elif index.tz is None and like.tzinfo is not None:
+        df.index = index.tz_localize("UTC")
+    return df
+
+
+def _to_utc(index: pd.DatetimeIndex, tz: str | None) -> pd.DatetimeIndex:
+    """
+    UTC index for aware timestamps or naive wall times in `tz`. Repeated fall-back hours
+    are resolved by order; if that is impossible they, like skipped spring-forward times, become NaT.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        return index.tz_convert("UTC")
+    if tz is None:
+        return index.tz_localize("UTC")
+    try:
+        local = index.tz_localize(tz, ambiguous="infer", nonexistent="NaT")
+    except ValueError:
+        local = index.tz_localize(tz, ambiguous="NaT", nonexistent="NaT")
+    return local.tz_convert("UTC")
+
+
+def _native_step(index: pd.DatetimeIndex) -> pd.Timedelta | None:
+    if len(index) < 2:
+        return None
+    return pd.Timedelta(pd.Series(index).diff().median())
+
+
+def _to_grid(df: pd.DataFrame, grid: pd.DatetimeIndex, step: pd.Timedelta, kind: Kind) -> pd.DataFrame:
+    """
+    Values of `df` (UTC, intervals labelled by their start) on `grid` with spacing `step`.
+    """
+    native = _native_step(df.index) or step
+    if native >= step:
+        # Refine: hold each value over its interval; energy is split evenly
+        out = df.reindex(grid, method="ffill", tolerance=native - pd.Timedelta(1, "ns"))
+        return out * (step / native) if kind == "energy" else out
+    # Coarsen: bins start at the grid origin
+    bins = df.resample(step, origin=grid[0])
+    out = bins.sum(min_count=1) if kind == "energy" else bins.mean()
+    return out.reindex(grid)
+
+
+def _aligned_chunk(spec: AlignSpec, grid: pd.DatetimeIndex, step: pd.Timedelta) -> pd.DataFrame:
+    lo, hi = _native_bounds(spec, grid[0], grid[-1] + step)
+    df = _read_window(spec, lo, hi)
+    if spec.columns is not None:
+        df = df[list(spec.columns)]
+    df = df.select_dtypes(include="number")
+    df.index = _to_utc(df.index, spec.tz)
+    df = df[df.index.notna()]
+    df = df[~df.index.duplicated()].sort_index()
+    if spec.combine:
+        df = df.sum(axis=1, min_count=1).to_frame("total")
+    return _to_grid(df, grid, step, spec.kind)
+
+
+def iter_aligned(
+    specs: list[AlignSpec],
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+    freq: str = "1h",
+    chunk: str = DEFAULT_CHUNK,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the sources aligned on a common UTC grid of step `freq` over [start, end),
+    one `chunk` of time at a time; only that chunk (plus padding) is read from each source.
+    Columns are (source name, column). Naive `start`/`end` are interpreted as UTC.
+    """
+    step = pd.Timedelta(freq)
+    start, end = _as_utc(pd.Timestamp(start)), _as_utc(pd.Timestamp(end))
+    span = max(pd.Timedelta(chunk), step)
+    span = span - span % step
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Spec names must be unique, got {names}")
+
+    lo = start
+    while lo < end:
+        hi = min(lo + span, end)
+        grid = pd.date_range(lo, hi, freq=step, inclusive="left", name="time")
+        if len(grid):
+            yield pd.concat({spec.name: _aligned_chunk(spec, grid, step) for spec in specs}, axis=1)
+        lo = hi
+
+
+def align(
+    specs: list[AlignSpec],
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+    freq: str = "1h",
+    chunk: str = DEFAULT_CHUNK,
+) -> pd.DataFrame:
+    """
+    Sources aligned on a common UTC grid over [start, end), e.g. French load from three sources:
+
+        align([source_spec("OPSD", columns=["FR_load_actual_entsoe_transparency"]),
+               source_spec("AgenceORE_Consumption_lt36kVA", combine=True)],
+              "2020-01-01", "2020-02-01", freq="1h")
+
+    Power values are averaged (or held) and energy values summed (or split) onto the grid.
+    """
+    return pd.concat(list(iter_aligned(specs, start, end, freq, chunk)))
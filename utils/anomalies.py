@@ -0,0 +1,502 @@
+# utils/anomalies.py
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .columnar_cache import ensure_cached, iter_cached_batches
+
+# Rows evaluated at a time, and columns per block of the rolling-median pass; together
+# they bound the (rows x columns x MAD window) working set
+FRAME_ROWS = 4096
+HAMPEL_BLOCK_COLUMNS = 32
+
+# Consecutive Hampel windows screened together from the rows they share
+HAMPEL_GROUP = 4
+
+# Scale factor turning a median absolute deviation into a normal-equivalent std
+MAD_SCALE = 1.4826
+
+# Rules reported in the anomaly table
+ANOMALY_RULES = ("zscore", "mad", "flatline", "below_lower", "above_upper", "night_solar")
+
+ANOMALY_COLUMNS = ["column", "rule", "start", "end", "rows"]
+
+# Approximate (latitude, longitude) of country centroids, for night-time checks of solar columns
+COUNTRY_LOCATIONS = {
+    "AT": (47.6, 14.1), "BE": (50.6, 4.6), "BG": (42.7, 25.5), "CH": (46.8, 8.2), "CZ": (49.8, 15.5),
+    "DE": (51.2, 10.4), "DK": (56.0, 10.0), "EE": (58.6, 25.0), "ES": (40.2, -3.6), "FI": (64.5, 26.0),
+    "FR": (46.6, 2.4), "GB": (54.0, -2.5), "GR": (39.1, 22.9), "HR": (45.1, 15.2), "HU": (47.2, 19.5),
+    "IE": (53.2, -8.2), "IT": (42.8, 12.6), "LT": (55.2, 23.9), "LU": (49.8, 6.1), "LV": (56.9, 24.6),
+    "ME": (42.7, 19.4), "NL": (52.2, 5.5), "NO": (61.0, 8.5), "PL": (52.0, 19.1), "PT": (39.6, -8.0),
+    "RO": (45.9, 24.9), "RS": (44.0, 20.9), "SE": (62.0, 15.0), "SI": (46.1, 14.8), "SK": (48.7, 19.7),
+    "UA": (48.4, 31.2),
+}
+
+
+def _frames(chunks: Iterable[pd.DataFrame], frame_rows: int) -> Iterator[tuple[pd.DatetimeIndex, list[str], np.ndarray]]:
+    """
+    Re-chunk a stream of time-indexed frames into (times, columns, values) frames of exactly
+    `frame_rows` rows (the last one may be shorter), using the numeric columns of the first chunk.
+    """
+    columns = None
+    times, values, buffered = [], [], 0
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.select_dtypes(include="number").columns)
+        times.append(pd.DatetimeIndex(chunk.index))
+        values.append(chunk.reindex(columns=columns).to_numpy(dtype=np.float64))
+        buffered += len(chunk)
+        while buffered >= frame_rows:
+            all_times, all_values = times[0].append(times[1:]), np.concatenate(values)
+            yield all_times[:frame_rows], columns, all_values[:frame_rows]
+            times, values = [all_times[frame_rows:]], [all_values[frame_rows:]]
+            buffered -= frame_rows
+    if buffered:
+        yield times[0].append(times[1:]), columns, np.concatenate(values)
+
+
+def _runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (column, first row, last row) of every run of True in each column of a 2-D mask.
+    """
+    if not mask.any():
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, empty
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1]), dtype=np.int8)
+    padded[1:-1] = mask
+    edges = np.diff(padded, axis=0)
+    rows, cols = np.nonzero(edges)
+    # Rises and falls alternate within each column
+    order = np.lexsort((rows, cols))
+    rows, cols = rows[order], cols[order]
+    rising = edges[rows, cols] == 1
+    return cols[rising], rows[rising], rows[~rising] - 1
+
+
+def _trailing_zscore(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    |x - mean| / std over the `window` rows before each row, from cumulative sums.
+    Rows with fewer than half a window of valid history get NaN.
+    """
+    # All-NaN columns simply get no offset
+    offset = _nanmedian_last(x[: 4 * window].T) if len(x) else 0.0
+    centered = x - np.nan_to_num(offset)
+    valid = ~np.isnan(centered)
+    filled = np.where(valid, centered, 0.0)
+
+    def trailing(a: np.ndarray) -> np.ndarray:
+        np.cumsum(a, axis=0, out=a)
+        out = np.empty_like(a)
+        out[:1] = 0.0
+        out[1:] = a[:-1]
+        out[window + 1:] -= a[:-window - 1]
+        return out
+
+    n = trailing(valid.astype(np.float64))
+    s = trailing(filled.copy())
+    filled *= filled
+    ss = trailing(filled)
+    # In place, to avoid frame-sized temporaries
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.divide(s, n, out=s)
+        std = np.divide(ss, n, out=ss)
+        std -= np.multiply(mean, mean, out=filled)
+        np.maximum(std, 0.0, out=std)
+        np.sqrt(std, out=std)
+        z = np.subtract(centered, mean, out=centered)
+        np.abs(z, out=z)
+        z /= std
+    z[(n < window // 2) | (std <= 0)] = np.nan
+    return z
+
+
+def _nanmedian_last(a: np.ndarray) -> np.ndarray:
+    """
+    NaN-ignoring median along the last axis, via one partial sort when there are no gaps.
+    """
+    missing = np.isnan(a)
+    if not missing.any():
+        n = a.shape[-1]
+        middle = sorted({(n - 1) // 2, n // 2})
+        ordered = np.partition(a, middle, axis=-1)
+        return (ordered[..., (n - 1) // 2] + ordered[..., n // 2]) / 2
+    ordered = np.sort(a, axis=-1)
+    count = (~missing).sum(axis=-1)
+    lo = np.maximum((count - 1) // 2, 0)[..., None]
+    hi = np.maximum(count // 2, 0)[..., None]
+    median = (np.take_along_axis(ordered, lo, axis=-1) + np.take_along_axis(ordered, hi, axis=-1))[..., 0] / 2
+    median[count == 0] = np.nan
+    return median
+
+
+@lru_cache
+def _selection_network(n: int, ranks: tuple[int, ...]) -> tuple[tuple[int, int], ...]:
+    """
+    Comparators (i, j) of Batcher's odd-even merge sort of n values, without those that do
+    not lead into the sorted positions `ranks`.
+    """
+    pairs = []
+    p = 1
+    while p < n:
+        k = p
+        while k >= 1:
+            for j in range(k % p, n - k, 2 * k):
+                for i in range(min(k, n - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p):
+                        pairs.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    needed, kept = set(ranks), []
+    for i, j in reversed(pairs):
+        if i in needed or j in needed:
+            kept.append((i, j))
+            needed |= {i, j}
+    return tuple(reversed(kept))
+
+
+def _order_statistics(rows: list[np.ndarray], ranks: Iterable[int]) -> dict[int, np.ndarray]:
+    """
+    k-th smallest of `rows` (equally shaped arrays) at every position, for each k in `ranks`.
+    A sorting network applies the same min/max steps everywhere, so all positions are
+    handled by a few whole-array passes; positions where a row is NaN are undefined.
+    """
+    ranks = tuple(sorted(set(ranks)))
+    wires = [np.array(row) for row in rows]
+    spare = np.empty_like(wires[0])
+    for i, j in _selection_network(len(wires), ranks):
+        low, high = wires[i], wires[j]
+        np.minimum(low, high, out=spare)
+        np.maximum(low, high, out=high)
+        wires[i], spare = spare, low
+    return {k: wires[k] for k in ranks}
+
+
+def _hampel_ranks(count, extra) -> tuple:
+    """
+    Ranks in the sorted valid values of a core bounding the statistics of a window made of
+    them plus `extra` further valid values, `count` in all. The k-th smallest value of such
+    a window lies between the (k - extra)-th and the k-th smallest of its core; and with
+    p = (count - 1) // 2, p + 1 values lie within one MAD of the median, so the MAD is at
+    least the smaller distance from the median to the a-th or b-th smallest value below.
+    Returns (a, p - extra, q - extra, p, q, b - extra).
+    """
+    p, q = (count - 1) // 2, count // 2
+    a = p // 2
+    b = np.minimum(a + p + 1, count - 1)
+    return a, p - extra, q - extra, p, q, b - extra
+
+
+def _hampel_bounds(a, p_low, q_low, p, q, b_low) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lower and upper bound of the median, and a lower bound of the MAD, from the core values
+    at the ranks given by _hampel_ranks.
+    """
+    low = (p_low + q_low) / 2
+    high = (p + q) / 2
+    return low, high, np.minimum(low - a, b_low - high)
+
+
+def _hampel_outliers(x: np.ndarray, window: int, threshold: float) -> np.ndarray:
+    """
+    Rows further than `threshold` scaled MADs from the median of the trailing `window` rows
+    (itself included); never flagged for the first window - 1 rows or where the MAD is 0.
+    Runs of HAMPEL_GROUP windows are screened with bounds from the sorted rows they share,
+    and the exact median and MAD are only computed for the cells passing the screen.
+    """
+    flags = np.zeros(x.shape, dtype=bool)
+    if len(x) < window:
+        return flags
+    # Narrow windows share too few rows for useful bounds
+    group = max(1, min(HAMPEL_GROUP, window // 6))
+    width = window - group + 1
+    n = len(x) - window + 1
+    groups = -(-n // group)
+    # Slack so rounding in the bounds cannot drop a cell the exact test would flag
+    limit = threshold * MAD_SCALE * (1 - 1e-9)
+    # Column blocks keep the rows being sorted in cache
+    for lo in range(0, x.shape[1], HAMPEL_BLOCK_COLUMNS):
+        block = x[:, lo:lo + HAMPEL_BLOCK_COLUMNS]
+        values = block[window - 1:]
+        # Group g holds the windows ending at rows window - 1 + g * group onwards, which all
+        # contain the `width` rows ending at its first one; gaps are sorted last
+        gaps = np.isnan(block)
+        filled = np.where(gaps, np.inf, block)
+        ordered = _order_statistics([filled[group - 1 + j::group][:groups] for j in range(width)], range(width))
+        missing = np.zeros((len(block) + 1, block.shape[1]), dtype=np.int32)
+        np.cumsum(gaps, axis=0, out=missing[1:])
+        gappy = missing[window:] > missing[:n]
+
+        # Gap-free windows have gap-free cores of `width` values and group - 1 extra values
+        with np.errstate(invalid="ignore"):
+            ranks = _hampel_ranks(window, group - 1)
+            low, high, bound = (np.repeat(b, group, axis=0)[:n] for b in _hampel_bounds(*(ordered[k] for k in ranks)))
+            reach = np.maximum(np.abs(values - low), np.abs(values - high))
+            rows, cols = np.nonzero((reach > limit * bound) & ~gappy)
+
+        # Windows with gaps take the ranks of their own valid counts; a missing value is never flagged
+        gap_rows, gap_cols = np.nonzero(gappy & ~gaps[window - 1:])
+        if len(gap_rows):
+            first = gap_rows // group * group
+            count = window - (missing[gap_rows + window, gap_cols] - missing[gap_rows, gap_cols])
+            valid = width - (missing[first + window, gap_cols] - missing[first + group - 1, gap_cols])
+            ranks = _hampel_ranks(count, count - valid)
+            usable = (ranks[1] >= 0) & (ranks[4] < valid) & (ranks[5] < valid)
+            stacked = np.stack([ordered[k] for k in range(width)])
+            groups_at = gap_rows // group
+            with np.errstate(invalid="ignore"):
+                low, high, bound = _hampel_bounds(*(stacked[np.clip(k, 0, width - 1), groups_at, gap_cols] for k in ranks))
+                cell = values[gap_rows, gap_cols]
+                reach = np.maximum(np.abs(cell - low), np.abs(cell - high))
+                keep = ~usable | (reach > limit * bound)
+            rows, cols = np.concatenate([rows, gap_rows[keep]]), np.concatenate([cols, gap_cols[keep]])
+
+        if len(rows) == 0:
+            continue
+        windows = np.lib.stride_tricks.sliding_window_view(block, window, axis=0)[rows, cols]
+        median = _nanmedian_last(windows)
+        mad = _nanmedian_last(np.abs(windows - median[:, None])) * MAD_SCALE
+        with np.errstate(invalid="ignore", divide="ignore"):
+            flags[rows + window - 1, cols + lo] = (mad > 0) & (np.abs(values[rows, cols] - median) / mad > threshold)
+    return flags
+
+
+def _solar_elevation(times: pd.DatetimeIndex, latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """
+    Approximate solar elevation in degrees, (times x locations), from day of year and UTC time.
+    """
+    day = times.dayofyear.to_numpy()[:, None]
+    hours = (times.hour + times.minute / 60).to_numpy()[:, None]
+    declination = np.radians(-23.44) * np.cos(2 * np.pi * (day + 10) / 365)
+    hour_angle = np.radians(15 * (hours + longitude[None, :] / 15 - 12))
+    lat = np.radians(latitude)[None, :]
+    sin_elevation = np.sin(lat) * np.sin(declination) + np.cos(lat) * np.cos(declination) * np.cos(hour_angle)
+    return np.degrees(np.arcsin(np.clip(sin_elevation, -1, 1)))
+
+
+def _bound_matrix(bound, columns: list[str], values: np.ndarray) -> np.ndarray | None:
+    """
+    Per-cell bound from a scalar, or a mapping of column -> scalar or name of a bound column
+    (e.g. a time-varying capacity) present in the data.
+    """
+    if bound is None:
+        return None
+    if np.isscalar(bound):
+        return np.full(values.shape[1], float(bound))[None, :]
+    out = np.full(values.shape, np.nan)
+    positions = {c: i for i, c in enumerate(columns)}
+    for col, b in bound.items():
+        if col not in positions:
+            continue
+        if isinstance(b, str):
+            if b in positions:
+                out[:, positions[col]] = values[:, positions[b]]
+        elif b is not None:
+            out[:, positions[col]] = b
+    return out
+
+
+def _collect(found: list, rule: str, mask: np.ndarray, first_row: int, times: pd.DatetimeIndex,
+             before: pd.DatetimeIndex | None = None):
+    cols, starts, ends = _runs(mask)
+    if len(cols) == 0:
+        return
+    found.append(pd.DataFrame({
+        "col": cols,
+        "rule": rule,
+        "first": starts + first_row,
+        "last": ends + first_row,
+        "start": times[starts],
+        "end": times[ends],
+        "before": before[starts] if before is not None else times[starts],
+    }))
+
+
+def detect_anomalies(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    window: int = 96,
+    zscore: float | None = 6.0,
+    mad: float | None = None,
+    mad_window: int = 25,
+    flatline: int | None = 16,
+    lower: float | dict | None = 0.0,
+    upper: float | dict | None = None,
+    solar: dict[str, tuple[float, float]] | None = None,
+    night_elevation: float = -6.0,
+    night_tolerance: float = 0.01,
+    tz: str | None = None,
+) -> pd.DataFrame:
+    """
+    Flag anomalous intervals in a time-indexed wide frame, or a stream of such chunks.
+    All columns are checked at once with array operations, one fixed-size frame at a time,
+    carrying `window` rows of context between frames.
+
+    Rules (set a threshold to None to disable it):
+        zscore: |x - mean| / std of the previous `window` rows above the threshold (spikes).
+        mad: distance to the median of the last `mad_window` rows, in scaled MADs (Hampel filter).
+            Off by default: it about triples the cost of a scan (roughly 9 s more for 300
+            columns x 200k rows with scattered NaNs); pass e.g. mad=8.0 to enable it.
+        flatline: at least this many consecutive identical non-zero values (stuck meters).
+        below_lower / above_upper: values outside bounds; a bound is a scalar or a mapping of
+            column -> scalar or name of another column, e.g. {"DE_solar_generation_actual": "DE_solar_capacity"}.
+        night_solar: `solar` columns (column -> (latitude, longitude)) above `night_tolerance`
+            times their upper bound (or frame maximum) while the sun is below `night_elevation`.
+
+    Naive timestamps are taken as UTC unless `tz` is given.
+    Returns one row per flagged interval: column, rule, start, end and number of rows.
+    """
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    if mad_window > window:
+        raise ValueError("mad_window must not exceed window.")
+    found = []
+    context_times, context = None, None
+    offset = 0
+    columns = []
+
+    for times, columns, values in _frames(chunks, FRAME_ROWS):
+        if context is None:
+            context_times, context = times[:0], values[:0]
+        x = np.concatenate([context, values])
+        all_times = context_times.append(times)
+        k = len(context)
+
+        if zscore is not None:
+            with np.errstate(invalid="ignore"):
+                _collect(found, "zscore", _trailing_zscore(x, window)[k:] > zscore, offset, times)
+        if mad is not None:
+            with np.errstate(invalid="ignore"):
+                _collect(found, "mad", _hampel_outliers(x, mad_window, mad)[k:], offset, times)
+        if flatline is not None:
+            same = (x[1:] == x[:-1]) & (x[1:] != 0)
+            step = same[k - 1:] if k else np.vstack([np.zeros((1, x.shape[1]), bool), same])
+            before = all_times[k - 1:-1] if k else all_times[:1].append(all_times[:-1])
+            _collect(found, "flatline", step, offset, times, before)
+
+        lower_bound = _bound_matrix(lower, columns, values)
+        upper_bound = _bound_matrix(upper, columns, values)
+        with np.errstate(invalid="ignore"):
+            if lower_bound is not None:
+                _collect(found, "below_lower", values < lower_bound, offset, times)
+            if upper_bound is not None:
+                _collect(found, "above_upper", values > upper_bound, offset, times)
+
+        if solar:
+            positions = [columns.index(c) for c in solar if c in columns]
+            if positions:
+                locations = np.array([solar[columns[i]] for i in positions], dtype=np.float64)
+                if times.tz is None:
+                    utc = times.tz_localize(tz or "UTC", ambiguous="NaT", nonexistent="NaT").tz_convert("UTC")
+                else:
+                    utc = times.tz_convert("UTC")
+                night = _solar_elevation(utc, locations[:, 0], locations[:, 1]) < night_elevation
+                output = values[:, positions]
+                # Relative to the upper bound (capacity) where known, else to the frame maximum
+                peak = np.nanmax(np.where(np.isnan(output), -np.inf, output), axis=0)
+                scale = np.broadcast_to(peak, output.shape)
+                if upper_bound is not None:
+                    bound = np.broadcast_to(upper_bound, values.shape)[:, positions]
+                    scale = np.where(np.isnan(bound), scale, bound)
+                mask = np.zeros(values.shape, dtype=bool)
+                with np.errstate(invalid="ignore"):
+                    mask[:, positions] = night & (output > night_tolerance * scale)
+                _collect(found, "night_solar", mask, offset, times)
+
+        context_times, context = all_times[-window:], x[-window:]
+        offset += len(values)
+
+    return _merge_intervals(found, columns, flatline)
+
+
+def _merge_intervals(found: list[pd.DataFrame], columns: list[str], flatline: int | None) -> pd.DataFrame:
+    """
+    Join intervals that continue across frames and apply the flatline minimum length.
+    """
+    if not found:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+    df = pd.concat(found, ignore_index=True).sort_values(["rule", "col", "first"], kind="stable")
+    new = (
+        (df["rule"] != df["rule"].shift())
+        | (df["col"] != df["col"].shift())
+        | (df["first"] != df["last"].shift() + 1)
+    )
+    merged = df.groupby(new.cumsum()).agg(
+        col=("col", "first"), rule=("rule", "first"), first=("first", "first"), last=("last", "last"),
+        start=("start", "first"), end=("end", "last"), before=("before", "first"),
+    )
+    merged["rows"] = merged["last"] - merged["first"] + 1
+
+    # A flat run of n equal steps spans n + 1 values, starting one row earlier
+    flat = merged["rule"] == "flatline"
+    merged.loc[flat, "rows"] += 1
+    merged.loc[flat, "start"] = merged.loc[flat, "before"]
+    if flatline is not None:
+        merged = merged[~flat | (merged["rows"] >= flatline)]
+
+    merged["column"] = np.asarray(columns, dtype=object)[merged["col"].to_numpy()]
+    return merged[ANOMALY_COLUMNS].sort_values(["column", "start", "rule"]).reset_index(drop=True)
+
+
+def anomaly_kwargs(source: str, columns: Iterable[str]) -> dict:
+    """
+    Source-specific bounds for detect_anomalies: non-negative values except prices, OPSD
+    generation bounded by the matching capacity column and checked for night-time output,
+    SimBench profiles bounded by their rated (p.u.) maximum of 1.
+    """
+    columns = list(columns)
+    if source == "OPSD":
+        from .opsd_loader import opsd_column_index
+
+        index = opsd_column_index(columns=columns)
+        capacity = {(r.region, r.variable): c for c, r in index[index["attribute"] == "capacity"].iterrows()}
+        generation = index[index["attribute"] == "generation_actual"]
+        upper = {c: capacity.get((r.region, r.variable)) for c, r in generation.iterrows()}
+        solar = {
+            c: COUNTRY_LOCATIONS[r.country]
+            for c, r in generation[generation["variable"] == "solar"].iterrows()
+            if r.country in COUNTRY_LOCATIONS
+        }
+        lower = {c: (None if v == "price" else 0.0) for c, v in index["variable"].items()}
+        return {"lower": lower, "upper": {c: b for c, b in upper.items() if b is not None}, "solar": solar}
+    if source == "SimBench":
+        return {"lower": 0.0, "upper": 1.0, "tz": "Etc/GMT-1"}
+    if source == "ELMAS" or source == "Zenodo":
+        return {"lower": 0.0, "tz": "Etc/GMT-1"}
+    return {"lower": 0.0}
+
+
+def detect_file_anomalies(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    time_col: str | None = None,
+    batch_size: int = 200_000,
+    source: str | None = None,
+    reader_kwargs: dict | None = None,
+    **detect_kwargs,
+) -> pd.DataFrame:
+    """
+    Stream a file from its columnar cache entry in batches and flag anomalies; bounds default
+    to anomaly_kwargs(source) when `source` is given. Without a cache entry (cache disabled
+    or not writable), the parsed frame is passed on in batches instead.
+    """
+    path = ensure_cached(fp, reader, **(reader_kwargs or {}))
+    if path is None:
+        df = reader(fp, **(reader_kwargs or {}))
+        df = df.set_index(time_col) if time_col is not None else df
+        if source is not None:
+            detect_kwargs = {**anomaly_kwargs(source, df.columns), **detect_kwargs}
+        return detect_anomalies((df.iloc[i:i + batch_size] for i in range(0, len(df), batch_size)), **detect_kwargs)
+
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    if time_col is None:
+        time_col = next(c for c in schema.pandas_metadata["index_columns"] if isinstance(c, str))
+    if source is not None:
+        detect_kwargs = {**anomaly_kwargs(source, [c for c in schema.names if c != time_col]), **detect_kwargs}
+    batches = (
+        batch.set_index(time_col) if time_col in batch.columns else batch
+        for batch in iter_cached_batches(path, batch_size=batch_size)
+    )
+    return detect_anomalies(batches, **detect_kwargs)
@@ -0,0 +1,383 @@
+# utils/columnar_cache.py
+import hashlib
+import importlib.util
+import json
+import os
+import warnings
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import pandas as pd
+
+# Cache location can be overridden (e.g. on shared scratch disks) with POWER_DATA_CACHE_DIR
+CACHE_DIR = Path(os.environ.get(
+    "POWER_DATA_CACHE_DIR",
+    Path(__file__).resolve().parent.parent / ".cache",
+))
+
+# Bump when the on-disk layout or the output of a parser changes so old entries are ignored
+CACHE_VERSION = 2
+
+# Rows per Parquet row group; row-group statistics drive time-window pushdown
+ROW_GROUP_SIZE = 4096
+
+
+def _parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def cache_enabled() -> bool:
+    """
+    Caching is on unless POWER_DATA_CACHE=0 is set or pyarrow is not installed.
+    """
+    return os.environ.get("POWER_DATA_CACHE", "1") != "0" and _parquet_available()
+
+
+def file_identity(fp: str | Path) -> dict:
+    """
+    Identify a source file by resolved path, size and modification time.
+    """
+    path = Path(fp).resolve()
+    stat = path.stat()
+    return {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _reader_name(reader: Callable) -> str:
+    return f"{reader.__module__}.{reader.__qualname__}"
+
+
+def _path_hash(fp: str | Path) -> str:
+    return hashlib.sha1(str(Path(fp).resolve()).encode()).hexdigest()[:8]
+
+
+def cache_path(fp: str | Path, reader: Callable, **reader_kwargs) -> Path:
+    """
+    Location of the cached Parquet file for `reader(fp, **reader_kwargs)`.
+    The name embeds a hash of the path, a hash of (path, reader, kwargs) and a hash of the
+    file identity, so a changed source file maps to a new entry.
+    """
+    identity = file_identity(fp)
+    slot = json.dumps(
+        [identity["path"], _reader_name(reader), reader_kwargs, CACHE_VERSION],
+        sort_keys=True, default=str,
+    )
+    version = json.dumps([identity["size"], identity["mtime_ns"]])
+    slot_hash = hashlib.sha1(slot.encode()).hexdigest()[:8]
+    version_hash = hashlib.sha1(version.encode()).hexdigest()[:12]
+    return CACHE_DIR / f"{Path(fp).stem}-{_path_hash(fp)}-{slot_hash}-{version_hash}.parquet"
+
+
+def _drop_stale(target: Path):
+    """
+    Remove entries of the same source/reader slot other than `target`.
+    """
+    slot_prefix = target.name.rsplit("-", 1)[0]
+    for old in target.parent.glob(f"{slot_prefix}-*.parquet"):
+        if old != target:
+            old.unlink(missing_ok=True)
+
+
+def _write_parquet(df: pd.DataFrame, target: Path):
+    """
+    Write atomically and drop stale entries for the same source/reader slot.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp, engine="pyarrow", row_group_size=ROW_GROUP_SIZE)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, target)
+    _drop_stale(target)
+
+
+def _chunk_table(chunk: pd.DataFrame, schema=None):
+    """
+    Arrow table of one parsed chunk, cast to `schema` when given. Integer columns keep
+    int64 even where a chunk parsed them as float because of missing values: they come
+    back as float64 only if the column has nulls, as when the whole file is parsed at once.
+    Raises a pyarrow error if a column cannot be cast without loss.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(chunk, preserve_index=None)
+    return table if schema is None else _cast_table(table, schema)
+
+
+def _cast_table(table, schema):
+    import pyarrow as pa
+
+    if table.schema.equals(schema, check_metadata=False):
+        return table
+    columns = [table.column(field.name).cast(field.type) for field in schema]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _widen_schema(schema, other):
+    """
+    Schema that holds the columns of both: integers meeting non-integral floats become
+    float64, and columns a chunk parsed as all-missing take the other chunk's type
+    (e.g. string for a text column that is empty in the first chunk).
+    """
+    import pyarrow as pa
+
+    def is_text(t):
+        return pa.types.is_string(t) or pa.types.is_large_string(t)
+
+    fields = []
+    for field in schema:
+        ours, theirs = field.type, other.field(field.name).type
+        if ours == theirs:
+            fields.append(field)
+        elif pa.types.is_null(ours) or is_text(theirs):
+            fields.append(field.with_type(theirs))
+        elif pa.types.is_null(theirs) or is_text(ours):
+            fields.append(field)
+        elif (pa.types.is_integer(ours) or pa.types.is_floating(ours)) and (pa.types.is_integer(theirs) or pa.types.is_floating(theirs)):
+            fields.append(field.with_type(pa.float64()))
+        else:
+            raise TypeError(f"Column {field.name!r} is parsed as both {ours} and {theirs}.")
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+def _rewrite_widened(tmp: Path, schema):
+    """
+    Rewrite the row groups written so far to `schema`, one at a time, and return a
+    writer open on the result for the remaining chunks.
+    """
+    import pyarrow.parquet as pq
+
+    narrow = tmp.with_suffix(".narrow")
+    os.replace(tmp, narrow)
+    writer = pq.ParquetWriter(tmp, schema)
+    parquet_file = pq.ParquetFile(narrow)
+    for i in range(parquet_file.num_row_groups):
+        writer.write_table(_cast_table(parquet_file.read_row_group(i), schema), row_group_size=ROW_GROUP_SIZE)
+    narrow.unlink()
+    return writer
+
+
+def write_cached_chunks(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    chunks: Iterable[pd.DataFrame],
+    **reader_kwargs,
+) -> Path:
+    """
+    Build the cache entry for `reader(fp, **reader_kwargs)` from a stream of parsed chunks,
+    appending each to the Parquet file so the whole frame is never held in memory.
+    The chunks must be what `reader` would return for consecutive slices of the file;
+    the entry reads back with the dtypes `reader` gives for the whole file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    target = cache_path(fp, reader, **reader_kwargs)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = _chunk_table(chunk)
+                writer = pq.ParquetWriter(tmp, table.schema)
+            else:
+                try:
+                    table = _chunk_table(chunk, writer.schema)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    schema = _widen_schema(writer.schema, pa.Table.from_pandas(chunk, preserve_index=None).schema)
+                    writer.close()
+                    writer = _rewrite_widened(tmp, schema)
+                    table = _chunk_table(chunk, schema)
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No rows parsed from {fp}.")
+    os.replace(tmp, target)
+    _drop_stale(target)
+    return target
+
+
+def read_cached(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    refresh: bool = False,
+    **reader_kwargs,
+) -> pd.DataFrame:
+    """
+    Return `reader(fp, **reader_kwargs)`, converting the parsed frame to Parquet on
+    first use and reading it back from the cache while the source file is unchanged.
+    Index, parsed timestamps and numeric dtypes round-trip through Parquet. If the entry
+    cannot be written (full or read-only disk, a dtype Parquet cannot store), a warning is
+    issued and the parsed frame is returned uncached.
+    """
+    if not cache_enabled():
+        return reader(fp, **reader_kwargs)
+
+    target = cache_path(fp, reader, **reader_kwargs)
+    if target.exists() and not refresh:
+        return pd.read_parquet(target, engine="pyarrow")
+
+    df = reader(fp, **reader_kwargs)
+    try:
+        _write_parquet(df, target)
+    except (OSError, ValueError, TypeError, NotImplementedError) as e:
+        warnings.warn(f"Could not cache {fp}: {e}")
+    return df
+
+
+def cached_entry(fp: str | Path, reader: Callable[..., pd.DataFrame], **reader_kwargs) -> Path | None:
+    """
+    Path of an up-to-date cache entry for `reader(fp, **reader_kwargs)`, or None if the
+    cache is disabled or has not been built yet.
+    """
+    if not cache_enabled():
+        return None
+    target = cache_path(fp, reader, **reader_kwargs)
+    return target if target.exists() else None
+
+
+def iter_cached_batches(
+    path: str | Path,
+    columns: list[str] | None = None,
+    batch_size: int = 500_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a cached Parquet file as DataFrames of at most `batch_size` rows.
+    The stored index is restored when its column is read (i.e. `columns` is None).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Row groups are read one at a time: ParquetFile.iter_batches keeps decoded buffers
+    # alive across batches, so its memory grows with the file rather than the batch
+    parquet_file = pq.ParquetFile(path)
+    pending, pending_rows = [], 0
+    for i in range(parquet_file.num_row_groups):
+        pending.append(parquet_file.read_row_group(i, columns=columns))
+        pending_rows += pending[-1].num_rows
+        if pending_rows < batch_size:
+            continue
+        table = pa.concat_tables(pending)
+        full = table.num_rows - table.num_rows % batch_size
+        for lo in range(0, full, batch_size):
+            yield table.slice(lo, batch_size).to_pandas()
+        pending, pending_rows = [table.slice(full)], table.num_rows - full
+    if pending_rows:
+        yield pa.concat_tables(pending).to_pandas()
+
+
+def ensure_cached(fp: str | Path, reader: Callable[..., pd.DataFrame], **reader_kwargs) -> Path | None:
+    """
+    Build the cache entry for `reader(fp, **reader_kwargs)` if needed and return its path.
+    Returns None if the cache is disabled, or if the entry cannot be written (with a warning,
+    as in read_cached); callers then read the source with `reader` instead.
+    """
+    if not cache_enabled():
+        return None
+    target = cache_path(fp, reader, **reader_kwargs)
+    if not target.exists():
+        df = reader(fp, **reader_kwargs)
+        try:
+            _write_parquet(df, target)
+        except (OSError, ValueError, TypeError, NotImplementedError) as e:
+            warnings.warn(f"Could not cache {fp}: {e}")
+            return None
+    return target
+
+
+def _index_column(parquet_file) -> str | None:
+    """
+    Name of the stored pandas index column, or None for a RangeIndex.
+    """
+    index_columns = parquet_file.schema_arrow.pandas_metadata.get("index_columns", [])
+    stored = [c for c in index_columns if isinstance(c, str)]
+    return stored[0] if stored else None
+
+
+def cached_columns(fp: str | Path, reader: Callable[..., pd.DataFrame], **reader_kwargs) -> list[str]:
+    """
+    Data column names of a cached source, read from the Parquet schema without loading rows.
+    """
+    path = ensure_cached(fp, reader, **reader_kwargs)
+    if path is None:
+        return list(reader(fp, **reader_kwargs).columns)
+
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    index_col = _index_column(parquet_file)
+    return [c for c in parquet_file.schema_arrow.names
+            if c != index_col and not c.startswith("__index_level_")]
+
+
+def _row_groups_in_window(parquet_file, column: str, start, end) -> list[int]:
+    """
+    Row groups whose min/max statistics for `column` overlap [start, end].
+    Groups without statistics are always kept.
+    """
+    position = parquet_file.schema_arrow.get_field_index(column)
+    selected = []
+    for i in range(parquet_file.metadata.num_row_groups):
+        stats = parquet_file.metadata.row_group(i).column(position).statistics
+        if stats is None or not stats.has_min_max:
+            selected.append(i)
+            continue
+        if start is not None and pd.Timestamp(stats.max) < start:
+            continue
+        if end is not None and pd.Timestamp(stats.min) > end:
+            continue
+        selected.append(i)
+    return selected
+
+
+def read_cached_window(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    columns: list[str] | None = None,
+    **reader_kwargs,
+) -> pd.DataFrame:
+    """
+    Read only `columns` and the rows with start <= index <= end from a cached source.
+    Row groups outside the window are skipped using their timestamp statistics, so narrow
+    windows touch a few thousand rows instead of the whole file. The reader must return a
+    frame indexed by a sorted DatetimeIndex; `start`/`end` must match its timezone.
+    """
+    path = ensure_cached(fp, reader, **reader_kwargs)
+    if path is None:
+        df = reader(fp, **reader_kwargs)
+        if columns is not None:
+            df = df[columns]
+        return df.loc[start:end]
+
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    index_col = _index_column(parquet_file)
+    if index_col is None:
+        raise ValueError("Time-window reads require a cached frame with a named DatetimeIndex.")
+
+    row_groups = _row_groups_in_window(parquet_file, index_col, start, end)
+    read_columns = None if columns is None else [index_col, *columns]
+    table = parquet_file.read_row_groups(row_groups, columns=read_columns, use_pandas_metadata=True)
+    df = table.to_pandas()
+    if columns is not None:
+        df = df[columns]
+    return df.loc[start:end]
+
+
+def clear_cache(fp: str | Path | None = None):
+    """
+    Remove all cached entries, or only those of the source file `fp` (for every reader),
+    leaving files of the same name in other directories cached.
+    """
+    if not CACHE_DIR.exists():
+        return
+    pattern = f"{Path(fp).stem}-{_path_hash(fp)}-*.parquet" if fp is not None else "*.parquet"
+    for entry in CACHE_DIR.glob(pattern):
+        entry.unlink(missing_ok=True)
@@ -1,7 +1,14 @@
 # utils/data_catalog.py
 
+import abc
+import re
+import weakref
+import numpy as np
 import pandas as pd
-from IPython.display import HTML
+from pathlib import Path
+
+# Repository root; catalog folders are relative to it
+DATA_ROOT = Path(__file__).resolve().parent.parent
 
 EU_COUNTRIES = [
     "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czech Republic", "Denmark", "Estonia",
@@ -10,8 +17,8 @@ EU_COUNTRIES = [
     "Spain", "Sweden"
 ]
 
-def load_data_sources():
-    data_sources = [
+def _data_source_records():
+    return [
         {
             "Source": "AgenceORE_Consumption_lt36kVA",
             "Description": "Aggregated half-hourly electricity consumption data from consumption points with power subscriptions below 36kVA.",
@@ -139,7 +146,9 @@ def load_data_sources():
             "Folder": "Zenodo/"
         }
     ]
-    df = pd.DataFrame(data_sources)
+
+def load_data_sources():
+    df = pd.DataFrame(_data_source_records())
 
     # Make 'Folder' column clickable links
     df["Folder"] = df["Folder"].apply(lambda f: f'<a href="{f}">Open Folder</a>')
@@ -147,33 +156,240 @@ def load_data_sources():
     pd.set_option('display.max_colwidth', None)
     return df
 
-def query_data_sources(df, **filters):
-    result = df.copy()
+def source_folder(source: str) -> Path:
+    """
+    Absolute folder of a catalog source, e.g. source_folder("OPSD").
+    """
+    for record in _data_source_records():
+        if record["Source"] == source:
+            return DATA_ROOT / record["Folder"]
+    names = [record["Source"] for record in _data_source_records()]
+    raise ValueError(f"Unknown source '{source}'. Available sources: {names}")
 
-    for key, value in filters.items():
-        if key not in df.columns:
-            raise ValueError(f"'{key}' is not a valid column. Available columns: {list(df.columns)}")
+def source_files(source: str, pattern: str = "raw/**/*.csv") -> list[Path]:
+    """
+    Data files of a catalog source matching a glob pattern relative to its folder.
+    """
+    return sorted(source_folder(source).glob(pattern))
+
+# Representative length of calendar-based resolutions, for ordering comparisons
+_NAMED_RESOLUTIONS = {
+    "hourly": pd.Timedelta("1h"),
+    "daily": pd.Timedelta("1D"),
+    "weekly": pd.Timedelta("7D"),
+    "monthly": pd.Timedelta(days=30.436875),
+    "yearly": pd.Timedelta(days=365.2425),
+}
+
+def _resolution_length(resolution: str) -> pd.Timedelta:
+    key = resolution.strip().lower()
+    if key in _NAMED_RESOLUTIONS:
+        return _NAMED_RESOLUTIONS[key]
+    return pd.Timedelta(key)
+
+def _horizon_years(horizon) -> tuple[int, int] | None:
+    years = [int(y) for y in re.findall(r"\d{4}", str(horizon))]
+    return (min(years), max(years)) if years else None
+
+
+class CatalogQuery(abc.ABC):
+    """
+    Base class of catalog filter expressions; combine with &, | and ~.
+    """
+
+    @abc.abstractmethod
+    def rows(self, index: "CatalogIndex") -> frozenset:
+        """
+        Positions of the catalog rows matching this query.
+        """
+
+    def __and__(self, other: "CatalogQuery") -> "CatalogQuery":
+        return _Combined(self, other, frozenset.intersection)
+
+    def __or__(self, other: "CatalogQuery") -> "CatalogQuery":
+        return _Combined(self, other, frozenset.union)
+
+    def __invert__(self) -> "CatalogQuery":
+        return _Not(self)
+
+
+class _Combined(CatalogQuery):
+    def __init__(self, left, right, op):
+        self.left, self.right, self.op = left, right, op
+
+    def rows(self, index):
+        return self.op(self.left.rows(index), self.right.rows(index))
+
+
+class _Not(CatalogQuery):
+    def __init__(self, inner):
+        self.inner = inner
+
+    def rows(self, index):
+        return index.all_rows - self.inner.rows(index)
+
+
+class Has(CatalogQuery):
+    """
+    Rows whose list column contains all `values` (or any of them with any_of=True);
+    for scalar columns, rows equal to one of `values`. "EU" in Location expands to its members.
+    """
+
+    def __init__(self, column: str, *values, any_of: bool = False):
+        self.column, self.values, self.any_of = column, values, any_of
 
-        if isinstance(df[key].iloc[0], list):
-            if isinstance(value, str):
-                value = [value]
+    def rows(self, index):
+        postings = [index.lookup(self.column, v) for v in self.values]
+        if not postings:
+            return index.all_rows
+        if self.any_of or self.column not in index.list_columns:
+            return frozenset().union(*postings)
+        return frozenset.intersection(*postings)
 
-            def list_match(source_list):
-                expanded = []
-                for item in source_list:
-                    if item == "EU":
-                        expanded.extend(EU_COUNTRIES)
-                    else:
-                        expanded.append(item)
-                return all(v in expanded for v in value)
 
-            result = result[result[key].apply(list_match)]
+class Horizon(CatalogQuery):
+    """
+    Rows whose "Horizon" years overlap [start, end] (how="overlaps"), lie inside it
+    (how="within") or span all of it (how="covers"). Open bounds are allowed.
+    """
+
+    def __init__(self, start: int | None = None, end: int | None = None, how: str = "overlaps"):
+        if how not in ("overlaps", "within", "covers"):
+            raise ValueError("how must be 'overlaps', 'within' or 'covers'")
+        self.start, self.end, self.how = start, end, how
+
+    def rows(self, index):
+        lo = -np.inf if self.start is None else self.start
+        hi = np.inf if self.end is None else self.end
+        first, last = index.horizon_start, index.horizon_end
+        if self.how == "overlaps":
+            mask = (first <= hi) & (last >= lo)
+        elif self.how == "within":
+            mask = (first >= lo) & (last <= hi)
         else:
-            result = result[result[key] == value]
+            mask = (first <= lo) & (last >= hi)
+        return frozenset(np.flatnonzero(mask).tolist())
+
+
+class Resolution(CatalogQuery):
+    """
+    Rows offering at least one time resolution satisfying `op` against `resolution`,
+    e.g. Resolution("<=", "15min") or Resolution(">=", "hourly").
+    """
+
+    _OPS = {
+        "<": np.less, "<=": np.less_equal, "==": np.equal,
+        ">=": np.greater_equal, ">": np.greater,
+    }
+
+    def __init__(self, op: str, resolution: str):
+        if op not in self._OPS:
+            raise ValueError(f"op must be one of {list(self._OPS)}")
+        self.op, self.length = op, _resolution_length(resolution)
+
+    def rows(self, index):
+        mask = self._OPS[self.op](index.resolution_lengths, self.length.value)
+        return frozenset(np.unique(index.resolution_rows[mask]).tolist())
+
+
+class CatalogIndex:
+    """
+    Inverted indexes (value -> row positions) over a catalog DataFrame, built once.
+    List-valued columns index each element, with "EU" in "Location" expanded to
+    EU_COUNTRIES; Horizon years and time resolutions are held as NumPy arrays.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.all_rows = frozenset(range(len(df)))
+        self.list_columns = {
+            c for c in df.columns if df[c].map(lambda v: isinstance(v, list)).any()
+        }
+
+        self.postings = {}
+        for col in df.columns:
+            postings = {}
+            for row, value in enumerate(df[col]):
+                items = value if isinstance(value, list) else [value]
+                for item in items:
+                    expanded = EU_COUNTRIES + ["EU"] if col == "Location" and item == "EU" else [item]
+                    for v in expanded:
+                        try:
+                            postings.setdefault(v, set()).add(row)
+                        except TypeError:
+                            continue
+            self.postings[col] = {v: frozenset(rows) for v, rows in postings.items()}
 
-    return result.reset_index(drop=True)
+        horizons = [_horizon_years(h) for h in df.get("Horizon", pd.Series([None] * len(df)))]
+        self.horizon_start = np.array([h[0] if h else np.nan for h in horizons], dtype=float)
+        self.horizon_end = np.array([h[1] if h else np.nan for h in horizons], dtype=float)
+
+        rows, lengths = [], []
+        for row, values in enumerate(df.get("Time Resolution", pd.Series([[]] * len(df)))):
+            for value in values if isinstance(values, list) else [values]:
+                try:
+                    lengths.append(_resolution_length(str(value)).value)
+                except ValueError:
+                    continue
+                rows.append(row)
+        self.resolution_rows = np.array(rows, dtype=np.int64)
+        self.resolution_lengths = np.array(lengths, dtype=np.int64)
+
+    def lookup(self, column: str, value) -> frozenset:
+        if column not in self.postings:
+            raise ValueError(f"'{column}' is not a valid column. Available columns: {list(self.df.columns)}")
+        try:
+            return self.postings[column].get(value, frozenset())
+        except TypeError:
+            return frozenset()
+
+    def query(self, *expressions: CatalogQuery) -> pd.DataFrame:
+        rows = self.all_rows
+        for expression in expressions:
+            rows = rows & expression.rows(self)
+        return self.df.iloc[sorted(rows)].reset_index(drop=True)
+
+
+# Indexes of recently queried catalogs, so repeated queries skip the build
+_INDEX_CACHE = {}
+
+def build_catalog_index(df: pd.DataFrame) -> CatalogIndex:
+    """
+    Index for `df`, reused while the same DataFrame object is queried again.
+    Rebuild (or pass a fresh frame) after mutating the catalog in place.
+    """
+    cached = _INDEX_CACHE.get(id(df))
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+    index = CatalogIndex(df)
+    _INDEX_CACHE.clear()
+    _INDEX_CACHE[id(df)] = (weakref.ref(df), index)
+    return index
+
+def query_data_sources(df, *expressions, **filters):
+    """
+    Filter the catalog. Keyword filters keep the original semantics: list columns must
+    contain every given value, scalar columns must be equal. Positional arguments are
+    CatalogQuery expressions, e.g.
+    query_data_sources(df, Has("Renewable", "solar", "wind", any_of=True) & ~Has("Synthetic", True),
+                       Horizon(2016, 2018), Resolution("<=", "15min"))
+    """
+    index = build_catalog_index(df)
+    for key in filters:
+        if key not in df.columns:
+            raise ValueError(f"'{key}' is not a valid column. Available columns: {list(df.columns)}")
+
+    keyword_queries = [
+        Has(key, *(value if isinstance(value, list) else [value]))
+        if key in index.list_columns else Has(key, value)
+        for key, value in filters.items()
+    ]
+    return index.query(*keyword_queries, *expressions)
 
 def show_data_table(results):
+    # IPython is only needed for notebook display, not for catalog queries
+    from IPython.display import HTML
+
     if results.empty:
         return HTML("<b>No datasets match your query.</b>")
 
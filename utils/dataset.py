@@ -0,0 +1,293 @@
+# utils/dataset.py
+from pathlib import Path
+
+import pandas as pd
+
+from .alignment import AlignSpec, source_spec
+from .columnar_cache import cache_enabled, ensure_cached
+from .ember_loader import EMBER_RAW_FP, _parse_ember_series
+from .opsd_loader import OPSD_RESOLUTIONS, opsd_column_index, opsd_path, select_opsd_columns, sum_opsd_columns
+from .rollups import ROLLUP_STATS, pick_level, query_rollup
+
+# Aggregations accepted by Dataset.resample
+RESAMPLE_HOWS = ("mean", "sum", "min", "max")
+
+# Parts of an OPSD column name usable in Dataset.select and Dataset.sum
+_OPSD_PARTS = ("country", "region", "variable", "attribute", "source")
+
+
+class Dataset:
+    """
+    Lazy handle on one source file, e.g. open_dataset("OPSD", resolution="15min").
+
+    Columns, dtypes and the time range come from the cached Parquet metadata, so holding
+    a handle costs no data reads. select(), between(), resample() and sum() return new
+    handles with the step added to a plan; collect() runs it, reading only the selected
+    columns and row groups, or a rollup when the plan starts with a coarse resample.
+    A new handle starts from the spec's `columns`, and its plan with sum() if `combine` is set.
+    """
+
+    def __init__(
+        self,
+        spec: AlignSpec,
+        columns: list[str] | None = None,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+        steps: tuple = (),
+    ):
+        if columns is None and spec.columns is not None:
+            columns = list(spec.columns)
+        if not steps and spec.combine:
+            steps = (("sum", None),)
+        self.spec = spec
+        self._columns = columns
+        self.start = start
+        self.end = end
+        self.steps = steps
+
+    def __repr__(self) -> str:
+        plan = [f"{len(self.columns)} columns"]
+        if self.start is not None or self.end is not None:
+            plan.append(f"between {self.start} and {self.end}")
+        plan += [" ".join(str(part) for part in step if part is not None) for step in self.steps]
+        return f"Dataset({self.spec.name!r}, {Path(self.spec.fp).name}: {', '.join(plan)})"
+
+    def _replace(self, **changes) -> "Dataset":
+        state = {"spec": self.spec, "columns": self._columns, "start": self.start, "end": self.end, "steps": self.steps}
+        return Dataset(**{**state, **changes})
+
+    # Metadata
+
+    def _empty(self) -> pd.DataFrame:
+        """
+        Zero-row frame with the source's columns, dtypes and index, from the Parquet schema.
+        """
+        path = ensure_cached(self.spec.fp, self.spec.reader, **self.spec.reader_kwargs)
+        if path is None:
+            df = self.spec.reader(self.spec.fp, **self.spec.reader_kwargs).iloc[:0]
+        else:
+            import pyarrow.parquet as pq
+
+            df = pq.read_schema(path).empty_table().to_pandas()
+        return df.set_index(self.spec.time_col) if self.spec.time_col is not None else df
+
+    @property
+    def time_col(self) -> str:
+        if self.spec.time_col is not None:
+            return self.spec.time_col
+        return self._empty().index.name
+
+    @property
+    def all_columns(self) -> list[str]:
+        return list(self._empty().columns)
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._columns) if self._columns is not None else self.all_columns
+
+    @property
+    def dtypes(self) -> pd.Series:
+        return self._empty()[self.columns].dtypes
+
+    @property
+    def tz(self):
+        """
+        Time zone of the stored timestamps; None for naive local or UTC times (see spec.tz).
+        """
+        return pd.DatetimeIndex(self._empty().index).tz
+
+    def time_range(self) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        """
+        First and last timestamp, from row-group statistics when available.
+        """
+        path = ensure_cached(self.spec.fp, self.spec.reader, **self.spec.reader_kwargs)
+        if path is not None:
+            import pyarrow.parquet as pq
+
+            parquet_file = pq.ParquetFile(path)
+            position = parquet_file.schema_arrow.get_field_index(self.time_col)
+            bounds = []
+            for i in range(parquet_file.metadata.num_row_groups):
+                stats = parquet_file.metadata.row_group(i).column(position).statistics
+                if stats is None or not stats.has_min_max:
+                    bounds = None
+                    break
+                bounds += [pd.Timestamp(stats.min), pd.Timestamp(stats.max)]
+            if bounds:
+                tz = self.tz
+                lo, hi = min(bounds), max(bounds)
+                if tz is not None and lo.tzinfo is None:
+                    lo, hi = lo.tz_localize("UTC").tz_convert(tz), hi.tz_localize("UTC").tz_convert(tz)
+                return lo, hi
+        index = self._read(columns=[]).index
+        return (index.min(), index.max()) if len(index) else None
+
+    # Plan
+
+    def select(self, columns: str | list[str] | None = None, **parts) -> "Dataset":
+        """
+        Keep the given columns, or for OPSD the columns whose name parts match, e.g.
+        select(country="DE", variable="solar", attribute="generation_actual").
+        """
+        current = self.columns
+        if columns is not None:
+            columns = [columns] if isinstance(columns, str) else list(columns)
+            missing = [c for c in columns if c not in current]
+            if missing:
+                raise KeyError(f"Columns not in {self.spec.name}: {missing}")
+        if parts:
+            if self.spec.name != "OPSD":
+                raise ValueError(f"Selecting by name parts is only supported for OPSD, not {self.spec.name}.")
+            unknown = set(parts) - set(_OPSD_PARTS)
+            if unknown:
+                raise ValueError(f"Unknown OPSD name parts {sorted(unknown)}; use {_OPSD_PARTS}.")
+            matched = set(select_opsd_columns(opsd_column_index(columns=current), **parts))
+            columns = [c for c in (columns or current) if c in matched]
+        return self._replace(columns=columns if columns is not None else current)
+
+    def between(self, start: str | pd.Timestamp | None = None, end: str | pd.Timestamp | None = None) -> "Dataset":
+        """
+        Keep rows with start <= time <= end. Naive bounds are in the stored timestamps' zone
+        (UTC for aware sources); repeated calls narrow the window.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        if self.start is not None:
+            start = self.start if start is None else max(start, self.start)
+        if self.end is not None:
+            end = self.end if end is None else min(end, self.end)
+        return self._replace(start=start, end=end)
+
+    def resample(self, freq: str, how: str | None = None) -> "Dataset":
+        """
+        Aggregate to `freq`; by default power values are averaged and energy values summed.
+        """
+        how = how or ("sum" if self.spec.kind == "energy" else "mean")
+        if how not in RESAMPLE_HOWS:
+            raise ValueError(f"how must be one of {RESAMPLE_HOWS}")
+        return self._replace(steps=self.steps + (("resample", freq, how),))
+
+    def sum(self, by: str | list[str] | None = None) -> "Dataset":
+        """
+        Sum the columns into one "total" column, or for OPSD into one column per group of
+        name parts, e.g. sum(by=["country", "variable"]).
+        """
+        if by is not None:
+            if self.spec.name != "OPSD":
+                raise ValueError(f"Grouped sums are only supported for OPSD, not {self.spec.name}.")
+            by = [by] if isinstance(by, str) else list(by)
+        return self._replace(steps=self.steps + (("sum", by),))
+
+    # Execution
+
+    def _bound(self, ts: pd.Timestamp | None, tz) -> pd.Timestamp | None:
+        """
+        A window bound in the stored timestamps' awareness.
+        """
+        if ts is None:
+            return None
+        if tz is not None:
+            return ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+        if ts.tzinfo is not None:
+            return ts.tz_convert(self.spec.tz or "UTC").tz_localize(None)
+        return ts
+
+    def _read(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        Selected columns and window of the source, with the cached file's row groups and
+        columns pruned by pyarrow.
+        """
+        spec = self.spec
+        columns = self.columns if columns is None else columns
+        path = ensure_cached(spec.fp, spec.reader, **spec.reader_kwargs)
+        if path is None:
+            df = spec.reader(spec.fp, **spec.reader_kwargs)
+            df = df.set_index(spec.time_col) if spec.time_col is not None else df
+            tz = pd.DatetimeIndex(df.index).tz
+            start, end = self._bound(self.start, tz), self._bound(self.end, tz)
+            mask = pd.Series(True, index=df.index)
+            if start is not None:
+                mask &= df.index >= start
+            if end is not None:
+                mask &= df.index <= end
+            return df.loc[mask.to_numpy(), columns]
+
+        tz, time_col = self.tz, self.time_col
+        start, end = self._bound(self.start, tz), self._bound(self.end, tz)
+        filters = []
+        if start is not None:
+            filters.append((time_col, ">=", start))
+        if end is not None:
+            filters.append((time_col, "<=", end))
+        read_columns = [spec.time_col, *columns] if spec.time_col is not None else list(columns)
+        df = pd.read_parquet(path, engine="pyarrow", columns=read_columns, filters=filters or None)
+        return df.set_index(spec.time_col) if spec.time_col is not None else df
+
+    def _rollup(self, freq: str, how: str) -> pd.DataFrame | None:
+        """
+        Answer a leading resample from the source's rollups, when a level can serve it.
+        """
+        if not cache_enabled() or how not in ROLLUP_STATS or self.start is not None or self.end is not None:
+            return None
+        try:
+            pick_level(freq)
+        except ValueError:
+            return None
+        spec = self.spec
+        dtypes = self.dtypes
+        columns = [c for c in self.columns if pd.api.types.is_numeric_dtype(dtypes[c])]
+        return query_rollup(spec.fp, spec.reader, freq, how, columns=columns,
+                            time_col=spec.time_col, **spec.reader_kwargs)
+
+    def collect(self) -> pd.DataFrame:
+        """
+        Run the plan and return the resulting frame.
+        """
+        steps = list(self.steps)
+        df = None
+        if steps and steps[0][0] == "resample":
+            df = self._rollup(*steps[0][1:])
+            if df is not None:
+                steps = steps[1:]
+        if df is None:
+            df = self._read()
+
+        for step in steps:
+            # Text columns (e.g. OPSD's local timestamp) do not aggregate
+            df = df.select_dtypes(include="number")
+            if step[0] == "resample":
+                _, freq, how = step
+                bins = df.resample(freq)
+                df = bins.sum(min_count=1) if how == "sum" else getattr(bins, how)()
+            elif step[1] is None:
+                df = df.sum(axis=1, min_count=1).to_frame("total")
+            else:
+                df = sum_opsd_columns(df, by=step[1], index=opsd_column_index(columns=list(df.columns)))
+        return df
+
+
+def open_dataset(name: str, resolution: str | None = None, fp: str | Path | None = None, **options) -> Dataset:
+    """
+    Lazy Dataset for a catalog source, e.g. open_dataset("OPSD", resolution="15min").
+
+    For OPSD `resolution` picks the file; for other sources it adds a resample step.
+    Ember takes `variable` (default "Demand"), `unit` and `category` and yields one monthly
+    column per area. Other keyword options override fields of the source's AlignSpec;
+    `columns` is the initial selection and `combine` sums it into one "total" column.
+    """
+    if name == "OPSD" and fp is None and resolution in (None, *OPSD_RESOLUTIONS):
+        return Dataset(source_spec("OPSD", opsd_path(resolution or "60min"), **options))
+
+    if name == "Ember":
+        reader_kwargs = {
+            "variable": options.pop("variable", "Demand"),
+            "unit": options.pop("unit", "TWh"),
+            "category": options.pop("category", None),
+        }
+        spec = AlignSpec("Ember", fp or EMBER_RAW_FP, _parse_ember_series, kind="energy", reader_kwargs=reader_kwargs)
+        spec = spec._replace(**options)
+    else:
+        spec = source_spec(name, fp, **options)
+
+    dataset = Dataset(spec)
+    return dataset.resample(resolution) if resolution is not None else dataset
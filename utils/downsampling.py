@@ -0,0 +1,103 @@
+# utils/downsampling.py
+import numpy as np
+import pandas as pd
+from typing import Literal
+
+Method = Literal["lttb", "minmax"]
+
+
+def _as_float_x(index: pd.Index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit("ns").asi8.astype(np.float64)
+    return np.asarray(index, dtype=np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of `n_out` points that preserve the visual
+    shape of (x, y). NaNs are dropped first; the first and last remaining points are
+    always kept.
+    """
+    valid = ~np.isnan(y)
+    if not valid.all():
+        positions = np.flatnonzero(valid)
+        return positions[lttb_indices(x[positions], y[positions], n_out)]
+
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("LTTB needs at least 3 output points.")
+
+    # n_out - 2 buckets over the interior points: [edges[b], edges[b + 1])
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = edges[:-1]
+
+    # Bucket averages in one pass; the next bucket's average is each triangle's third vertex
+    avg_x = np.add.reduceat(x[:n - 1], starts) / np.diff(edges)
+    avg_y = np.add.reduceat(y[:n - 1], starts) / np.diff(edges)
+    next_x = np.append(avg_x[1:], x[n - 1])
+    next_y = np.append(avg_y[1:], y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax, ay = x[prev], y[prev]
+        area = np.abs((ax - next_x[b]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[b] - ay))
+        prev = lo + int(np.argmax(area))
+        selected[b + 1] = prev
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Positions of the minimum and maximum of each of `(n_out - 2) // 2` equal-width buckets,
+    plus the first and last point, so every local extremum at bucket scale survives.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 4:
+        raise ValueError("Min/max downsampling needs at least 4 output points.")
+    n_buckets = (n_out - 2) // 2
+
+    size = int(np.ceil(n / n_buckets))
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    blocks = padded.reshape(n_buckets, size)
+    valid = ~np.all(np.isnan(blocks), axis=1)
+
+    offsets = np.arange(n_buckets)[valid] * size
+    lo = offsets + np.nanargmin(blocks[valid], axis=1)
+    hi = offsets + np.nanargmax(blocks[valid], axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lo, hi]))
+
+
+def downsample(
+    data: pd.Series | pd.DataFrame,
+    max_points: int,
+    method: Method = "minmax",
+) -> pd.Series | pd.DataFrame:
+    """
+    Reduce a series (or each column of a frame) to at most `max_points` points for plotting.
+    "minmax" keeps per-bucket extrema (true peaks are never dropped); "lttb" keeps the points
+    that best preserve the overall shape. For frames each column selects an equal share of
+    the points and the selected rows are combined, so each column keeps its own extrema.
+    """
+    if len(data) <= max_points:
+        return data
+
+    columns = [data] if isinstance(data, pd.Series) else [data[c] for c in data.columns]
+    share = max_points // max(1, len(columns))
+    picks = []
+    for column in columns:
+        y = column.to_numpy(dtype=np.float64)
+        if method == "lttb":
+            picks.append(lttb_indices(_as_float_x(data.index), y, share))
+        elif method == "minmax":
+            picks.append(minmax_indices(y, share))
+        else:
+            raise ValueError("method must be 'lttb' or 'minmax'")
+    return data.iloc[np.unique(np.concatenate(picks))]
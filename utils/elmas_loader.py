@@ -0,0 +1,26 @@
+# utils/elmas_loader.py
+import pandas as pd
+
+from .columnar_cache import read_cached
+from .data_catalog import source_folder
+from .timestamps import parse_timestamps
+
+# Clustered load time series shipped with the ELMAS source
+ELMAS_RAW_FP = source_folder("ELMAS") / "raw" / "Time_series_18_clusters.csv"
+
+
+def _parse_elmas_csv(filepath):
+    # Load CSV
+    df = pd.read_csv(filepath)
+
+    # Parse datetime and set index
+    df["Time"] = parse_timestamps(df["Time"], source="elmas")
+    df.set_index("Time", inplace=True)
+
+    # Ensure all cluster columns are numeric
+    df = df.apply(pd.to_numeric, errors="coerce")
+    return df
+
+
+def _read_elmas_csv(filepath):
+    return read_cached(filepath, _parse_elmas_csv)
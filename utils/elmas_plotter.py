@@ -1,22 +1,18 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
 
-def plot_total_elmas_load(
-    filepath="raw/Time_series_18_clusters.csv",
+from .downsampling import downsample
+from .elmas_loader import ELMAS_RAW_FP, _read_elmas_csv
+from .memo import memoize
+
+@memoize
+def compute_total_elmas_load(
+    filepath=ELMAS_RAW_FP,
     start_time=None,
     end_time=None,
-    max_points=1000
+    max_points=1000,
+    downsample_method="minmax"
 ):
-    # Load CSV
-    df = pd.read_csv(filepath)
-
-    # Parse datetime and set index
-    df["Time"] = pd.to_datetime(df["Time"])
-    df.set_index("Time", inplace=True)
-
-    # Ensure all cluster columns are numeric
-    df = df.apply(pd.to_numeric, errors="coerce")
+    df = _read_elmas_csv(filepath)
 
     # Filter by time range
     if start_time:
@@ -24,13 +20,22 @@ def plot_total_elmas_load(
     if end_time:
         df = df[df.index <= pd.to_datetime(end_time)]
 
-    # Fast downsampling using iloc (assumes regular time intervals)
-    if len(df) > max_points:
-        step = max(1, int(len(df) / max_points))
-        df = df.iloc[::step]
-
-    # Compute total load
+    # Compute total load at full resolution, then downsample for display
     total_load = df.sum(axis=1)
+    return downsample(total_load, max_points, downsample_method)
+
+def plot_total_elmas_load(
+    filepath=ELMAS_RAW_FP,
+    start_time=None,
+    end_time=None,
+    max_points=1000,
+    downsample_method="minmax",
+    show=True
+):
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as ticker
+
+    total_load = compute_total_elmas_load(filepath, start_time, end_time, max_points, downsample_method)
 
     # Plot
     plt.figure(figsize=(24, 6))
@@ -41,4 +46,7 @@ def plot_total_elmas_load(
     plt.ylabel("Total Load (kWh)")
     plt.grid(True)
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    if show:
+        plt.show()
+        return None
+    return total_load
@@ -0,0 +1,126 @@
+# utils/ember_loader.py
+import pandas as pd
+from pathlib import Path
+from typing import Iterable
+
+from .columnar_cache import read_cached
+from .memo import memoize
+from .timestamps import parse_timestamps
+
+EMBER_RAW_FP = Path(__file__).resolve().parent.parent / "Ember" / "raw" / "europe_monthly_full_release_long_format.csv"
+
+# Index levels of the long-format store; lookups on a prefix of these are index slices
+EMBER_INDEX = ["Area", "Category", "Variable", "Unit", "Date"]
+
+Selector = str | Iterable[str] | None
+
+
+def _parse_ember_csv(fp):
+    df = pd.read_csv(fp)
+    df["Date"] = parse_timestamps(df["Date"], source="ember")
+    return df
+
+
+def _read_ember_csv(fp):
+    return read_cached(fp, _parse_ember_csv)
+
+
+def _parse_ember_store(fp: str | Path) -> pd.DataFrame:
+    """
+    Parse the Ember long-format CSV with every text column as a Categorical and
+    a sorted (Area, Category, Variable, Unit, Date) MultiIndex.
+    """
+    df = pd.read_csv(fp)
+    df["Date"] = parse_timestamps(df["Date"], source="ember")
+    text_cols = [c for c in df.columns if c != "Date" and not pd.api.types.is_numeric_dtype(df[c])]
+    df[text_cols] = df[text_cols].astype("category")
+    return df.set_index(EMBER_INDEX).sort_index()
+
+
+@memoize
+def load_ember(fp: str | Path = EMBER_RAW_FP) -> pd.DataFrame:
+    """
+    Ember data indexed by (Area, Category, Variable, Unit, Date), with categorical text columns.
+    Categories and the index are kept through the columnar cache, so repeated loads skip parsing.
+    """
+    return read_cached(fp, _parse_ember_store)
+
+
+def _level_key(df: pd.DataFrame, level: str, value: Selector):
+    """
+    .loc key for one index level; list selectors keep only the labels present in the
+    level, so an unknown label drops out instead of failing the whole lookup.
+    """
+    if value is None:
+        return slice(None)
+    if isinstance(value, str):
+        return value
+    present = set(df.index.unique(level=level))
+    return [v for v in value if v in present]
+
+
+def ember_slice(
+    df: pd.DataFrame | None = None,
+    area: Selector = None,
+    category: Selector = None,
+    variable: Selector = None,
+    unit: Selector = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    subcategory: Selector = None,
+) -> pd.DataFrame:
+    """
+    Rows of the Ember store matching every given selector, e.g.
+    ember_slice(category="Electricity generation", unit="TWh", start="2020-01", end="2020-12").
+    Each selector is a value or a list of values; labels missing from the data are ignored.
+    `start`/`end` bound Date inclusively.
+    Index levels are looked up on the sorted index; `subcategory` filters the column.
+    """
+    df = load_ember() if df is None else df
+    selectors = (area, category, variable, unit)
+    key = (
+        *(_level_key(df, level, value) for level, value in zip(EMBER_INDEX, selectors)),
+        slice(pd.Timestamp(start) if start is not None else None, pd.Timestamp(end) if end is not None else None),
+    )
+    # Only a selector matching nothing (an unknown scalar or a list without known labels) is empty
+    if any(isinstance(k, list) and not k for k in key):
+        return df.iloc[:0]
+    try:
+        out = df.loc[key, :]
+    except KeyError:
+        return df.iloc[:0]
+    if subcategory is not None:
+        out = out[out["Subcategory"].isin([subcategory] if isinstance(subcategory, str) else list(subcategory))]
+    return out
+
+
+def ember_wide(
+    variable: str,
+    unit: str = "TWh",
+    category: Selector = None,
+    area: Selector = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    df: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """
+    One variable as a wide table, areas x months, e.g. ember_wide("Solar", category="Electricity generation").
+    """
+    rows = ember_slice(df, area=area, category=category, variable=variable, unit=unit, start=start, end=end)
+    values = rows["Value"].groupby(level=["Area", "Date"], observed=True).sum()
+    return values.unstack("Date").sort_index(axis=1)
+
+
+def _parse_ember_series(
+    fp: str | Path,
+    variable: str,
+    unit: str = "TWh",
+    category: Selector = None,
+) -> pd.DataFrame:
+    """
+    One Ember variable as monthly time series, indexed by Date with one column per area.
+    """
+    wide = ember_wide(variable, unit=unit, category=category, df=load_ember(fp)).T
+    wide.columns = pd.Index(wide.columns.astype(str), name=None)
+    wide.index.name = "Date"
+    return wide
@@ -1,74 +1,89 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-
-def plot_ember_summary(year=2020):
-    # --- Load and Prepare Data ---
-    df = pd.read_csv("raw/europe_monthly_full_release_long_format.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Year"] = df["Date"].dt.year
-    df["Month"] = df["Date"].dt.month
+from .ember_loader import EMBER_RAW_FP, ember_slice, load_ember
+from .memo import memoize
 
+@memoize
+def compute_ember_summary(year=2020, fp=EMBER_RAW_FP):
+    """
+    Monthly total demand, annual renewable output per source and average daily
+    renewable output per source for one year, keyed "demand", "renewables", "daily_avg".
+    """
     # --- Validate Year ---
     valid_years = list(range(2015, 2025))
     if year not in valid_years:
         raise ValueError(f"Year must be one of {valid_years}")
-    df_year = df[df["Year"] == year]
 
-    # --- Graph 1: Total Electricity Demand (Monthly) ---
-    df_demand = df_year[
-        (df_year["Category"] == "Electricity demand") &
-        (df_year["Variable"] == "Demand") &
-        (df_year["Unit"] == "TWh")
-    ]
-    demand_total = df_demand.groupby("Date")["Value"].sum()
+    # --- Load Data (categorical store indexed by Area, Category, Variable, Unit, Date) ---
+    df = load_ember(fp)
+    window = {"start": f"{year}-01-01", "end": f"{year}-12-31"}
 
-    plt.figure(figsize=(10, 6))
-    demand_total.plot(kind='line', marker='o', title=f"Total Electricity Demand in {year}")
-    plt.ylabel("Total Demand (TWh)")
-    plt.xlabel("Month")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+    # --- Total Electricity Demand (Monthly) ---
+    df_demand = ember_slice(df, category="Electricity demand", variable="Demand", unit="TWh", **window)
+    demand_total = df_demand.groupby(level="Date")["Value"].sum()
 
-    # --- Graph 2: Total Annual Renewable Output per Source ---
+    # --- Total Annual Renewable Output per Source ---
     renewable_sources = [
         "Wind", "Solar", "Hydro", "Bioenergy", "Onshore wind", "Other renewables"
     ]
 
-    df_renewable = df_year[
-        (df_year["Category"] == "Electricity generation") &
-        (df_year["Unit"] == "TWh") &
-        (
-            df_year["Subcategory"].isin(renewable_sources) |
-            df_year["Variable"].isin(renewable_sources)
-        )
+    df_generation = ember_slice(df, category="Electricity generation", unit="TWh", **window).reset_index()
+    df_renewable = df_generation[
+        df_generation["Subcategory"].isin(renewable_sources) |
+        df_generation["Variable"].isin(renewable_sources)
     ].copy()
 
-    df_renewable["Source"] = df_renewable["Subcategory"].where(
+    subcategory = df_renewable["Subcategory"].astype(str)
+    df_renewable["Source"] = subcategory.where(
         df_renewable["Subcategory"].isin(renewable_sources),
-        df_renewable["Variable"]
+        df_renewable["Variable"].astype(str)
     )
 
     annual_totals = df_renewable.groupby("Source")["Value"].sum().sort_values(ascending=False)
 
+    # --- Daily Average Renewable Output per Source ---
+    df_renewable["DaysInMonth"] = df_renewable["Date"].dt.days_in_month
+    df_renewable["DailyAvg"] = df_renewable["Value"] / df_renewable["DaysInMonth"]
+
+    daily_avg_per_source = df_renewable.groupby("Source")["DailyAvg"].mean().sort_values(ascending=False)
+
+    return {"demand": demand_total, "renewables": annual_totals, "daily_avg": daily_avg_per_source}
+
+def plot_ember_summary(year=2020, fp=EMBER_RAW_FP, show=True):
+    """
+    Plot the three Ember summary graphs for one year, each shown as it is drawn.
+    With show=False the figures stay open and their series are returned.
+    """
+    import matplotlib.pyplot as plt
+
+    summary = compute_ember_summary(year, fp)
+
+    # --- Graph 1: Total Electricity Demand (Monthly) ---
     plt.figure(figsize=(10, 6))
-    annual_totals.plot(kind='bar', title=f"Total Renewable Output by Source in {year}")
+    summary["demand"].plot(kind='line', marker='o', title=f"Total Electricity Demand in {year}")
+    plt.ylabel("Total Demand (TWh)")
+    plt.xlabel("Month")
+    plt.grid(True)
+    plt.tight_layout()
+    if show:
+        plt.show()
+
+    # --- Graph 2: Total Annual Renewable Output per Source ---
+    plt.figure(figsize=(10, 6))
+    summary["renewables"].plot(kind='bar', title=f"Total Renewable Output by Source in {year}")
     plt.ylabel("Total Output (TWh)")
     plt.xlabel("Renewable Type")
     plt.grid(axis='y')
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
 
     # --- Graph 3: Daily Average Renewable Output per Source ---
-    df_renewable["DaysInMonth"] = df_renewable["Date"].dt.days_in_month
-    df_renewable["DailyAvg"] = df_renewable["Value"] / df_renewable["DaysInMonth"]
-
-    daily_avg_per_source = df_renewable.groupby("Source")["DailyAvg"].mean().sort_values(ascending=False)
-
     plt.figure(figsize=(10, 6))
-    daily_avg_per_source.plot(kind='bar', title=f"Avg Daily Renewable Output by Source in {year}")
+    summary["daily_avg"].plot(kind='bar', title=f"Avg Daily Renewable Output by Source in {year}")
     plt.ylabel("Average Daily Output (TWh/day)")
     plt.xlabel("Renewable Type")
     plt.grid(axis='y')
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+        return None
+    return summary
@@ -0,0 +1,341 @@
+# utils/incremental.py
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from .agenceore_loader import _energy_by_region, _parse_consumption_by_region, _parse_consumption_csv
+from .columnar_cache import (
+    CACHE_DIR,
+    ROW_GROUP_SIZE,
+    _chunk_table,
+    _drop_stale,
+    _reader_name,
+    _rewrite_widened,
+    _widen_schema,
+    cache_enabled,
+    cache_path,
+    file_identity,
+)
+from .data_catalog import source_files
+from .elmas_loader import _parse_elmas_csv
+from .ember_loader import _parse_ember_csv
+from .opsd_loader import _parse_opsd_csv
+from .rollups import ROLLUP_LEVELS, _rollup_path, compute_rollups, write_rollups
+from .simbench_loader import _parse_simbench_csv
+from .zenodo_loader import _parse_zenodo_csv
+
+INCREMENTAL_DIR = CACHE_DIR / "incremental"
+
+# Bytes hashed at the start of the file and just before the high-water mark; if either
+# changed, the file was rewritten rather than appended to
+FINGERPRINT_BYTES = 64 * 1024
+
+# Bump when the on-disk layout changes so old stores are rebuilt
+INCREMENTAL_VERSION = 1
+
+
+def _store_dir(fp: str | Path, reader: Callable, **reader_kwargs) -> Path:
+    slot = json.dumps([str(Path(fp).resolve()), _reader_name(reader), reader_kwargs], sort_keys=True, default=str)
+    return INCREMENTAL_DIR / f"{Path(fp).stem}-{hashlib.sha1(slot.encode()).hexdigest()[:8]}"
+
+
+def _fingerprint(fp: Path, offset: int) -> str:
+    """
+    Hash of the file head and of the bytes just before `offset`.
+    """
+    digest = hashlib.sha1()
+    with open(fp, "rb") as f:
+        digest.update(f.read(min(offset, FINGERPRINT_BYTES)))
+        f.seek(max(0, offset - FINGERPRINT_BYTES))
+        digest.update(f.read(offset - f.tell()))
+    return digest.hexdigest()
+
+
+def _read_state(store: Path) -> dict | None:
+    state_fp = store / "state.json"
+    if not state_fp.exists():
+        return None
+    state = json.loads(state_fp.read_text())
+    return state if state.get("version") == INCREMENTAL_VERSION else None
+
+
+def _write_state(store: Path, state: dict):
+    tmp = store / f"state.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(state, indent=1, default=str))
+    os.replace(tmp, store / "state.json")
+
+
+def _time_values(df: pd.DataFrame, time_col: str | None) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(df[time_col] if time_col is not None else df.index)
+
+
+def _parse_range(fp: Path, store: Path, offset: int, reader: Callable, **reader_kwargs) -> tuple[pd.DataFrame, int]:
+    """
+    Parse the complete lines between `offset` and the end of `fp` with `reader`, by writing
+    them after the header line into a temporary file. Returns the rows and the new offset.
+    A trailing partial line is left for the next run.
+    """
+    with open(fp, "rb") as f:
+        header = f.readline()
+        f.seek(max(offset, len(header)))
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    if end == 0:
+        return None, offset
+    new_offset = max(offset, len(header)) + end
+
+    tmp = store / f"append.{os.getpid()}{fp.suffix}"
+    tmp.write_bytes(header + data[:end])
+    try:
+        return reader(tmp, **reader_kwargs), new_offset
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_part(store: Path, df: pd.DataFrame, offset: int):
+    """
+    Append rows as a Parquet part named by the byte offset they start at, cast to the
+    schema of the stored parts so all parts read back as one table. If the new rows do not
+    fit that schema (e.g. 1.5 in a column stored as integers), the schema is widened as in
+    write_cached_chunks and the stored parts are rewritten to it.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parts = store / "parts"
+    parts.mkdir(parents=True, exist_ok=True)
+    existing = sorted(parts.glob("part-*.parquet"))
+    if not existing:
+        table = _chunk_table(df)
+    else:
+        schema = pq.read_schema(existing[0])
+        try:
+            table = _chunk_table(df, schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            schema = _widen_schema(schema, _chunk_table(df).schema)
+            for part in existing:
+                _rewrite_widened(part, schema).close()
+            table = _chunk_table(df, schema)
+    tmp = parts / f"part.{os.getpid()}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, parts / f"part-{offset:015d}.parquet")
+
+
+def _drop_parts_from(store: Path, offset: int):
+    """
+    Remove parts written at or after `offset` (left behind by an interrupted run).
+    """
+    for part in (store / "parts").glob("part-*.parquet"):
+        if int(part.stem.split("-")[1]) >= offset:
+            part.unlink()
+
+
+def _publish_cache_entry(fp: Path, store: Path, reader: Callable, **reader_kwargs) -> Path:
+    """
+    Copy the stored parts, row group by row group, into the columnar cache entry of
+    `reader(fp)` for the current file version, so read_cached and the loaders built on it
+    read the ingested rows instead of parsing the grown file again.
+    """
+    import pyarrow.parquet as pq
+
+    target = cache_path(fp, reader, **reader_kwargs)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    parts = sorted((store / "parts").glob("part-*.parquet"))
+    with pq.ParquetWriter(tmp, pq.read_schema(parts[0])) as writer:
+        for part in parts:
+            parquet_file = pq.ParquetFile(part)
+            for i in range(parquet_file.num_row_groups):
+                writer.write_table(parquet_file.read_row_group(i), row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, target)
+    _drop_stale(target)
+    return target
+
+
+def read_incremental(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    columns: list[str] | None = None,
+    **reader_kwargs,
+) -> pd.DataFrame:
+    """
+    All rows ingested so far for `reader(fp)`, read back from the append-only store.
+    """
+    store = _store_dir(fp, reader, **reader_kwargs)
+    return pd.read_parquet(store / "parts", engine="pyarrow", columns=columns)
+
+
+def _read_since(store: Path, column: str | None, since: pd.Timestamp) -> pd.DataFrame:
+    """
+    Stored rows with a timestamp at or after `since`; row groups are pruned by statistics.
+    """
+    import pyarrow.parquet as pq
+
+    parts = store / "parts"
+    schema = pq.read_schema(next(parts.glob("part-*.parquet")))
+    if column is None:
+        column = next(c for c in schema.pandas_metadata["index_columns"] if isinstance(c, str))
+    return pd.read_parquet(parts, engine="pyarrow", filters=[(column, ">=", since)])
+
+
+def _month_start(ts: pd.Timestamp) -> pd.Timestamp:
+    return ts.normalize().replace(day=1)
+
+
+def _update_rollups(
+    fp: Path,
+    store: Path,
+    reader: Callable,
+    time_col: str | None,
+    state: dict,
+    touched_from: pd.Timestamp | None,
+    rollup_view: tuple[Callable, Callable] | None = None,
+    **reader_kwargs,
+):
+    """
+    Publish the rollup pyramid for the current file version, recomputing only the periods
+    from the (month-aligned) earliest new timestamp on and keeping earlier periods as stored.
+    With a (view_reader, frame) `rollup_view`, the pyramid is the one of view_reader(fp),
+    computed as frame(stored rows).
+    """
+    def to_frame(df: pd.DataFrame) -> pd.DataFrame:
+        if rollup_view is not None:
+            return rollup_view[1](df)
+        return df.set_index(time_col) if time_col is not None else df
+
+    previous = Path(state["rollups"]) if state.get("rollups") else None
+    if touched_from is None or previous is None or not previous.exists():
+        rollups = compute_rollups(to_frame(pd.read_parquet(store / "parts", engine="pyarrow")))
+    else:
+        cut = _month_start(touched_from)
+        fresh = compute_rollups(to_frame(_read_since(store, time_col, cut)))
+        rollups = {}
+        for level in ROLLUP_LEVELS:
+            kept = pd.read_parquet(previous / f"{level}.parquet")
+            rollups[level] = pd.concat([kept[kept.index < cut], fresh[level]])
+
+    path = _rollup_path(fp, rollup_view[0]) if rollup_view is not None else _rollup_path(fp, reader, **reader_kwargs)
+    state["rollups"] = str(write_rollups(path, rollups))
+
+
+def ingest_incremental(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    time_col: str | None = None,
+    rollups: bool = True,
+    rollup_view: tuple[Callable, Callable] | None = None,
+    **reader_kwargs,
+) -> dict:
+    """
+    Bring the append-only store of `reader(fp)` up to date, parsing only bytes appended
+    since the last run.
+
+    A high-water mark (byte offset of the last complete line, fingerprint of the bytes
+    before it, last timestamp) is kept per file. If the file only grew, the new lines are
+    parsed with `reader` and appended as a new Parquet part; if it was rewritten or shrunk,
+    the store is rebuilt, so files replaced by each release (e.g. Ember) always take the
+    full path. The store is then copied into the columnar cache entry of `reader(fp)`, which
+    the loaders read through read_cached, unless the file ends in a partial line.
+
+    With `rollups`, the rollup pyramid served by query_rollup(fp, reader) is updated for the
+    touched periods only. Rollups aggregate every numeric column, so long-format readers
+    either disable them or pass a `rollup_view` (view_reader, frame): the pyramid served by
+    query_rollup(fp, view_reader) is then built from frame(stored rows), a time-indexed
+    wide frame such as the per-region totals of AgenceORE.
+
+    Returns a summary with the mode ("unchanged", "append" or "full"), the number of new rows,
+    the earliest new timestamp and the high-water mark.
+    """
+    fp = Path(fp)
+    store = _store_dir(fp, reader, **reader_kwargs)
+    store.mkdir(parents=True, exist_ok=True)
+    identity = file_identity(fp)
+    state = _read_state(store)
+
+    if state is not None and (state["size"], state["mtime_ns"]) == (identity["size"], identity["mtime_ns"]):
+        return {"mode": "unchanged", "rows": 0, "touched_from": None, **_summary(state)}
+
+    appendable = (
+        state is not None
+        and identity["size"] >= state["offset"]
+        and _fingerprint(fp, state["offset"]) == state["fingerprint"]
+    )
+    if appendable:
+        mode, offset = "append", state["offset"]
+        _drop_parts_from(store, offset)
+    else:
+        mode, offset = "full", 0
+        shutil.rmtree(store / "parts", ignore_errors=True)
+        state = {"version": INCREMENTAL_VERSION, "rows": 0, "last_timestamp": None, "rollups": None}
+
+    df, new_offset = _parse_range(fp, store, offset, reader, **reader_kwargs)
+    touched_from = None
+    if df is not None and len(df):
+        _write_part(store, df, offset)
+        times = _time_values(df, time_col)
+        touched_from = times.min()
+        last = times.max() if state["last_timestamp"] is None else max(times.max(), pd.Timestamp(state["last_timestamp"]))
+        state["last_timestamp"] = str(last)
+        state["rows"] += len(df)
+
+    state.update({
+        "size": identity["size"],
+        "mtime_ns": identity["mtime_ns"],
+        "offset": new_offset,
+        "fingerprint": _fingerprint(fp, new_offset),
+    })
+    # The cache entry stands for the whole file, so it is only published once the store
+    # holds every line; a trailing partial line is parsed with the file until completed
+    if state["rows"] and cache_enabled() and new_offset == identity["size"]:
+        _publish_cache_entry(fp, store, reader, **reader_kwargs)
+    if rollups and state["rows"]:
+        _update_rollups(
+            fp, store, reader, time_col, state, None if mode == "full" else touched_from, rollup_view, **reader_kwargs
+        )
+    _write_state(store, state)
+
+    return {"mode": mode, "rows": 0 if df is None else len(df), "touched_from": touched_from, **_summary(state)}
+
+
+def _summary(state: dict) -> dict:
+    return {"offset": state["offset"], "last_timestamp": state["last_timestamp"], "total_rows": state["rows"]}
+
+
+def incremental_spec(source: str) -> tuple[Callable, str | None, bool | tuple[Callable, Callable], dict]:
+    """
+    (reader, time_col, rollups, reader_kwargs) used for incremental ingestion of a catalog
+    source; `rollups` is a bool or a rollup_view for ingest_incremental. AgenceORE updates
+    the per-region pyramid used by build_source_rollups; Ember is stored without rollups.
+    """
+    if source == "OPSD":
+        return _parse_opsd_csv, None, True, {}
+    if source == "SimBench":
+        return _parse_simbench_csv, "time", True, {}
+    if source == "Zenodo":
+        return _parse_zenodo_csv, None, True, {"time_format": "%d.%m.%Y %H:%M:%S"}
+    if source == "ELMAS":
+        return _parse_elmas_csv, None, True, {}
+    if source == "AgenceORE_Consumption_lt36kVA":
+        return _parse_consumption_csv, "time", (_parse_consumption_by_region, _energy_by_region), {}
+    if source == "Ember":
+        return _parse_ember_csv, "Date", False, {}
+    raise ValueError(f"No incremental ingestion defined for source '{source}'.")
+
+
+def ingest_source_incremental(source: str, pattern: str | None = None) -> dict[str, dict]:
+    """
+    Incrementally ingest every time-series file of a catalog source; summaries keyed by path.
+    """
+    if pattern is None:
+        pattern = "raw/**/*Profile*.csv" if source == "SimBench" else "raw/**/*.csv"
+    reader, time_col, rollups, reader_kwargs = incremental_spec(source)
+    view = rollups if isinstance(rollups, tuple) else None
+    return {
+        str(fp): ingest_incremental(fp, reader, time_col=time_col, rollups=bool(rollups), rollup_view=view, **reader_kwargs)
+        for fp in source_files(source, pattern)
+    }
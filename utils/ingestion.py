@@ -0,0 +1,98 @@
+# utils/ingestion.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable
+
+import pandas as pd
+
+from .agenceore_loader import _read_consumption_csv
+from .data_catalog import source_files
+from .elmas_loader import _read_elmas_csv
+from .ember_loader import _read_ember_csv
+from .opsd_loader import _read_opsd_csv
+from .simbench_loader import _read_simbench_csv
+from .zenodo_loader import _read_zenodo_csv
+
+
+def _read_semicolon_csv(fp: str | Path) -> pd.DataFrame:
+    return pd.read_csv(fp, sep=";")
+
+
+def default_reader(source: str, fp: str | Path) -> Callable[[str | Path], pd.DataFrame]:
+    """
+    Loader used for a file of a catalog source; time-series files go through the
+    columnar cache, static tables (e.g. SimBench Node.csv) are read as plain CSV.
+    """
+    name = Path(fp).name
+    if source == "OPSD":
+        return _read_opsd_csv
+    if source == "AgenceORE_Consumption_lt36kVA":
+        return _read_consumption_csv
+    if source == "SimBench":
+        return _read_simbench_csv if "Profile" in name else _read_semicolon_csv
+    if source == "Zenodo":
+        return partial(_read_zenodo_csv, time_format="%d.%m.%Y %H:%M:%S")
+    if source == "ELMAS":
+        return _read_elmas_csv
+    if source == "Ember":
+        return _read_ember_csv
+    return pd.read_csv
+
+
+def _call(reader: Callable, fp: str | Path, return_exceptions: bool):
+    if not return_exceptions:
+        return reader(fp)
+    try:
+        return reader(fp)
+    except Exception as e:
+        return e
+
+
+def read_files(
+    files: Iterable[str | Path],
+    reader: Callable[[str | Path], pd.DataFrame] | list[Callable] = pd.read_csv,
+    max_workers: int | None = None,
+    return_exceptions: bool = False,
+) -> list:
+    """
+    Parse files concurrently in a process pool and return the results in input order.
+
+    Parameters:
+        files: Paths to read.
+        reader: Module-level callable taking a path, or one callable per file.
+        max_workers: Worker processes (default: os.cpu_count()); 1 reads serially in-process.
+        return_exceptions: Return a failing file's exception in its slot instead of raising.
+    """
+    files = list(files)
+    readers = reader if isinstance(reader, list) else [reader] * len(files)
+    if len(readers) != len(files):
+        raise ValueError("Expected one reader per file.")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(files))
+    if max_workers <= 1:
+        return [_call(r, fp, return_exceptions) for r, fp in zip(readers, files)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_call, r, fp, return_exceptions) for r, fp in zip(readers, files)]
+        return [future.result() for future in futures]
+
+
+def ingest_dataset(
+    source: str,
+    pattern: str = "raw/**/*.csv",
+    max_workers: int | None = None,
+    return_exceptions: bool = False,
+) -> dict[Path, pd.DataFrame]:
+    """
+    Load every file of a catalog source (see load_data_sources()) in parallel,
+    e.g. ingest_dataset("AgenceORE_Consumption_lt36kVA"). Returns {path: frame} in file order.
+    """
+    files = source_files(source, pattern)
+    if not files:
+        raise ValueError(f"No files matching '{pattern}' for source '{source}'.")
+    readers = [default_reader(source, fp) for fp in files]
+    frames = read_files(files, readers, max_workers=max_workers, return_exceptions=return_exceptions)
+    return dict(zip(files, frames))
@@ -0,0 +1,259 @@
+# utils/memo.py
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from .columnar_cache import CACHE_DIR, _reader_name
+
+MEMO_DIR = CACHE_DIR / "memo"
+
+# In-memory budget shared by all memoized functions, overridable with POWER_DATA_MEMO_MB
+MEMO_MAX_BYTES = int(float(os.environ.get("POWER_DATA_MEMO_MB", 512)) * 1e6)
+
+# Bump when the pickled layout changes so old entries are ignored
+MEMO_VERSION = 2
+
+
+def memo_enabled() -> bool:
+    """
+    Memoization is on unless POWER_DATA_MEMO=0 is set.
+    """
+    return os.environ.get("POWER_DATA_MEMO", "1") != "0"
+
+
+def _persist_default() -> bool:
+    return os.environ.get("POWER_DATA_MEMO_PERSIST", "0") == "1"
+
+
+def _nbytes(value) -> int:
+    """
+    Approximate memory held by a result.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _detach(value):
+    """
+    Deep copy of pandas results, so callers cannot modify cached entries, not even through
+    their underlying arrays.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=True)
+    if isinstance(value, dict):
+        return {k: _detach(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return tuple(_detach(v) for v in value)
+    if isinstance(value, list):
+        return [_detach(v) for v in value]
+    return value
+
+
+def _normalize(value, versions: list):
+    """
+    JSON-able stand-in for an argument. Existing files are replaced by their resolved path
+    and their (size, mtime) is collected into `versions`; frames are content-hashed.
+    """
+    if isinstance(value, (str, Path)):
+        path = Path(value)
+        if path.is_file():
+            stat = path.stat()
+            versions.append([stat.st_size, stat.st_mtime_ns])
+            return str(path.resolve())
+        return str(value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.sha1(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        names = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(json.dumps(names, default=str).encode())
+        return f"<{type(value).__name__} {digest.hexdigest()}>"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=str) if isinstance(value, (set, frozenset)) else value
+        return [_normalize(v, versions) for v in items]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v, versions) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    return value
+
+
+def _make_key(fn: Callable, signature: inspect.Signature, args, kwargs) -> tuple[str, str]:
+    """
+    (slot, version) hashes of a call: the slot covers the function and its normalized
+    arguments (defaults applied), the version covers the identities of the files passed in.
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    versions = []
+    params = _normalize(dict(bound.arguments), versions)
+    slot = json.dumps([_reader_name(fn), params, MEMO_VERSION], sort_keys=True, default=str)
+    version = json.dumps(versions)
+    slot_hash = hashlib.sha1(slot.encode()).hexdigest()[:16]
+    return f"{_slot_prefix(fn)}{slot_hash}", hashlib.sha1(version.encode()).hexdigest()[:12]
+
+
+def _slot_prefix(fn: Callable) -> str:
+    """
+    Start of every slot of `fn`; the hash of its module-qualified name keeps functions of
+    the same name in different modules apart.
+    """
+    return f"{fn.__qualname__}-{hashlib.sha1(_reader_name(fn).encode()).hexdigest()[:8]}-"
+
+
+class _MemoStore:
+    """
+    Size-bounded LRU of results keyed by (slot, version). A slot holds only its latest
+    version, so results for changed files are dropped as soon as they are recomputed.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, slot: str, version: str):
+        with self.lock:
+            entry = self.entries.get(slot)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(slot)
+            self.hits += 1
+            return entry
+
+    def put(self, slot: str, version: str, value):
+        size = _nbytes(value)
+        with self.lock:
+            self._discard(slot)
+            if size > self.max_bytes:
+                return
+            self.entries[slot] = (version, value, size)
+            self.total += size
+            while self.total > self.max_bytes:
+                self._discard(next(iter(self.entries)))
+
+    def _discard(self, slot: str):
+        entry = self.entries.pop(slot, None)
+        if entry is not None:
+            self.total -= entry[2]
+
+    def clear(self, prefix: str = ""):
+        with self.lock:
+            for slot in [s for s in self.entries if s.startswith(prefix)]:
+                self._discard(slot)
+            if not prefix:
+                self.hits = self.misses = 0
+
+
+_store = _MemoStore(MEMO_MAX_BYTES)
+
+
+def _disk_path(slot: str, version: str) -> Path:
+    return MEMO_DIR / f"{slot}-{version}.pkl"
+
+
+def _read_disk(path: Path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+def _write_disk(path: Path, value):
+    """
+    Pickle atomically and drop older versions of the same slot.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+    slot_prefix = path.name.rsplit("-", 1)[0]
+    for old in path.parent.glob(f"{slot_prefix}-*.pkl"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def memoize(fn: Callable | None = None, *, persist: bool | None = None):
+    """
+    Memoize a pure compute function on its arguments and the identity of the files it is
+    given. Results live in a process-wide LRU bounded by POWER_DATA_MEMO_MB; with `persist`
+    (default: POWER_DATA_MEMO_PERSIST=1) they are also pickled under the cache directory, so a
+    restarted notebook reuses them. Modifying a source file invalidates its results.
+
+    Usable as @memoize or @memoize(persist=True). The wrapper has `cache_clear()`.
+    """
+    if fn is None:
+        return functools.partial(memoize, persist=persist)
+
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not memo_enabled():
+            return fn(*args, **kwargs)
+        slot, version = _make_key(fn, signature, args, kwargs)
+        entry = _store.get(slot, version)
+        if entry is not None:
+            return _detach(entry[1])
+
+        on_disk = _persist_default() if persist is None else persist
+        path = _disk_path(slot, version) if on_disk else None
+        value = _read_disk(path) if path is not None and path.exists() else None
+        if value is None:
+            value = fn(*args, **kwargs)
+            if path is not None:
+                _write_disk(path, value)
+        _store.put(slot, version, value)
+        return _detach(value)
+
+    def cache_clear():
+        clear_memo(fn)
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def clear_memo(fn: Callable | None = None, disk: bool = True):
+    """
+    Drop memoized results of `fn` (or of all functions) from memory and, with `disk`,
+    from the cache directory.
+    """
+    prefix = _slot_prefix(fn) if fn is not None else ""
+    _store.clear(prefix)
+    if disk and MEMO_DIR.exists():
+        for entry in MEMO_DIR.glob(f"{prefix}*.pkl"):
+            entry.unlink(missing_ok=True)
+
+
+def memo_info() -> dict:
+    """
+    Hits, misses, number of entries and bytes held by the in-memory store.
+    """
+    with _store.lock:
+        return {
+            "hits": _store.hits,
+            "misses": _store.misses,
+            "entries": len(_store.entries),
+            "bytes": _store.total,
+            "max_bytes": _store.max_bytes,
+        }
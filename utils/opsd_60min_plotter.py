@@ -1,45 +1,61 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import Literal
 
-# Load OPSD 60min CSV with datetime parsing
+from .downsampling import Method, downsample
+from .memo import memoize
+from .opsd_loader import OPSD_RENEWABLES, _parse_opsd_csv, load_opsd, opsd_column_index, select_opsd_columns
+from .rollups import query_rollup
+
+# Load OPSD 60min data (parsed once, then served from the columnar cache)
 def _read_opsd_60min_csv(fp: str | Path) -> pd.DataFrame:
     """
-    Load OPSD 60-minute dataset and parse timestamps.
+    Load OPSD 60-minute dataset with parsed timestamps.
     """
-    df = pd.read_csv(fp)
-    df["utc_timestamp"] = pd.to_datetime(df["utc_timestamp"], utc=True)
-    df = df.set_index("utc_timestamp")
-    df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
-    return df
+    return load_opsd(fp=fp)
 
-# Plot summed actual vs forecast load over time
-def plot_opsd_total_load_over_time(
+# Summed actual vs forecast load over time
+@memoize
+def compute_opsd_total_load(
     fp: str | Path,
     start_time: str | None = None,
     end_time: str | None = None,
     max_points: int = 500,
-):
+    downsample_method: Method = "minmax",
+) -> pd.DataFrame:
     """
-    Plot total actual vs forecast load across all countries in OPSD dataset.
+    Total actual and forecast load across all countries, computed at full resolution
+    and then downsampled for display.
     """
-    df = _read_opsd_60min_csv(fp)
+    index = opsd_column_index(fp=fp)
+    load = {"variable": "load", "source": "entsoe_transparency"}
+    actual_cols = select_opsd_columns(index, attribute="actual", **load)
+    forecast_cols = select_opsd_columns(index, attribute="forecast", **load)
 
-    if start_time:
-        df = df[df.index >= pd.to_datetime(start_time).tz_localize("UTC")]
-    if end_time:
-        df = df[df.index <= pd.to_datetime(end_time).tz_localize("UTC")]
- 
-    actual_cols = [c for c in df.columns if c.endswith("_load_actual_entsoe_transparency")]
-    forecast_cols = [c for c in df.columns if c.endswith("_load_forecast_entsoe_transparency")]
+    # Read only the load columns inside the requested window
+    df = load_opsd(fp=fp, columns=actual_cols + forecast_cols, start=start_time, end=end_time)
 
     df["total_actual"] = df[actual_cols].sum(axis=1)
     df["total_forecast"] = df[forecast_cols].sum(axis=1)
 
-    if len(df) > max_points:
-        step = max(1, len(df) // max_points)
-        df = df.iloc[::step]
+    return downsample(df[["total_actual", "total_forecast"]], max_points, downsample_method)
+
+
+def plot_opsd_total_load_over_time(
+    fp: str | Path,
+    start_time: str | None = None,
+    end_time: str | None = None,
+    max_points: int = 500,
+    downsample_method: Method = "minmax",
+    show: bool = True,
+) -> pd.DataFrame | None:
+    """
+    Plot total actual vs forecast load across all countries in OPSD dataset.
+    Returns the plotted totals when show=False.
+    """
+    import matplotlib.pyplot as plt
+
+    df = compute_opsd_total_load(fp, start_time, end_time, max_points, downsample_method)
 
     # Plot
     plt.figure(figsize=(12, 6))
@@ -51,38 +67,32 @@ def plot_opsd_total_load_over_time(
     plt.grid(True)
     plt.tight_layout()
     plt.legend()
-    plt.show()
+    if show:
+        plt.show()
+        return None
+    return df
 
-# Plot max output for solar, wind onshore, wind offshore
-def plot_opsd_max_energy_by_category(
+# Max output for solar, wind onshore, wind offshore
+@memoize
+def compute_opsd_max_energy_by_category(
     fp: str | Path,
     start_time: str | None = None,
     end_time: str | None = None,
-    max_points: int = 500,
-):
+) -> pd.Series:
     """
-    Plot max power generation for Solar, Wind Onshore, Wind Offshore in OPSD.
+    Max summed power generation for Solar, Wind Onshore, Wind Offshore in OPSD,
+    taken over every timestamp in the window.
     """
-    df = _read_opsd_60min_csv(fp)
-
-    if start_time:
-        df = df[df.index >= pd.to_datetime(start_time).tz_localize("UTC")]
-    if end_time:
-        df = df[df.index <= pd.to_datetime(end_time).tz_localize("UTC")]
-
-    if len(df) > max_points:
-        step = max(1, len(df) // max_points)
-        df = df.iloc[::step]
-
+    index = opsd_column_index(fp=fp)
     category_map = {
-        "solar": [c for c in df.columns if "_solar_generation_actual" in c],
-        "wind_onshore": [c for c in df.columns if "_wind_onshore_generation_actual" in c],
-        "wind_offshore": [c for c in df.columns if (
-            "_wind_offshore_generation_actual" in c or 
-            ("_wind_generation_actual" in c and "_offshore" in c))
-        ]
+        variable: select_opsd_columns(index, variable=variable, attribute="generation_actual")
+        for variable in ["solar", "wind_onshore", "wind_offshore"]
     }
 
+    # Read only the generation columns inside the requested window
+    needed = sorted({c for cols in category_map.values() for c in cols})
+    df = load_opsd(fp=fp, columns=needed, start=start_time, end=end_time)
+
     max_by_type = {}
     for label, cols in category_map.items():
         if not cols:
@@ -93,12 +103,28 @@ def plot_opsd_max_energy_by_category(
 
     if not max_by_type:
         raise ValueError("No renewable energy types found in dataset.")
+    return pd.Series(max_by_type).sort_values(ascending=False)
+
+
+def plot_opsd_max_energy_by_category(
+    fp: str | Path,
+    start_time: str | None = None,
+    end_time: str | None = None,
+    max_points: int = 500,
+    show: bool = True,
+) -> pd.Series | None:
+    """
+    Plot max power generation for Solar, Wind Onshore, Wind Offshore in OPSD.
+    `max_points` is kept for backwards compatibility and does not affect the result.
+    Returns the plotted maxima when show=False.
+    """
+    import matplotlib.pyplot as plt
+
+    max_by_type = compute_opsd_max_energy_by_category(fp, start_time, end_time)
 
     # Plot
     plt.figure(figsize=(10, 6))
-    ax = pd.Series(max_by_type).sort_values(ascending=False).plot(
-        kind='bar', color='skyblue', edgecolor='black'
-    )
+    ax = max_by_type.plot(kind='bar', color='skyblue', edgecolor='black')
     
     plt.ylabel("Max Power (W)")
     plt.title(f"Maximum Renewable Output by Type\n{start_time or 'Start'} → {end_time or 'End'}")
@@ -114,41 +140,52 @@ def plot_opsd_max_energy_by_category(
                     ha='center', va='bottom', fontsize=10)
 
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+        return None
+    return max_by_type
 
 
-def plot_opsd_daily_avg_renewables(
+@memoize
+def compute_opsd_daily_avg_renewables(
     fp: str | Path,
     start_time: str | None = None,
     end_time: str | None = None
-):
+) -> pd.Series:
     """
-    Plot the **yearly average of daily average renewable output** for each renewable profile.
-    Categories include solar, wind onshore, and wind offshore (if available).
+    Yearly average of daily average output for each renewable profile.
     """
-    df = _read_opsd_60min_csv(fp)
-
-    if start_time:
-        df = df[df.index >= pd.to_datetime(start_time).tz_localize("UTC")]
-    if end_time:
-        df = df[df.index <= pd.to_datetime(end_time).tz_localize("UTC")]
-
     # Identify all renewable columns
-    renewable_cols = [c for c in df.columns if any(sub in c for sub in [
-        "_solar_generation_actual",
-        "_wind_onshore_generation_actual",
-        "_wind_offshore_generation_actual",
-        "_wind_generation_actual"
-    ])]
+    renewable_cols = select_opsd_columns(
+        opsd_column_index(fp=fp), variable=OPSD_RENEWABLES, attribute="generation_actual"
+    )
 
     if not renewable_cols:
         raise ValueError("No renewable energy profiles found.")
 
-    # Compute daily averages
-    df_daily_avg = df[renewable_cols].resample("1D").mean()
+    # Daily averages from the precomputed daily rollup
+    df_daily_avg = query_rollup(
+        fp, _parse_opsd_csv, "1D", "mean", columns=renewable_cols, start=start_time, end=end_time
+    )
 
     # Compute yearly average of the daily averages for each column
-    yearly_avg_per_profile = df_daily_avg.mean().sort_values(ascending=False)
+    return df_daily_avg.mean().sort_values(ascending=False)
+
+
+def plot_opsd_daily_avg_renewables(
+    fp: str | Path,
+    start_time: str | None = None,
+    end_time: str | None = None,
+    show: bool = True,
+) -> pd.Series | None:
+    """
+    Plot the **yearly average of daily average renewable output** for each renewable profile.
+    Categories include solar, wind onshore, and wind offshore (if available).
+    Returns the plotted averages when show=False.
+    """
+    import matplotlib.pyplot as plt
+
+    yearly_avg_per_profile = compute_opsd_daily_avg_renewables(fp, start_time, end_time)
 
     # Plot
     plt.figure(figsize=(24, 6))
@@ -168,4 +205,7 @@ def plot_opsd_daily_avg_renewables(
                     ha="center", va="bottom", fontsize=9)
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    if show:
+        plt.show()
+        return None
+    return yearly_avg_per_profile
@@ -0,0 +1,221 @@
+# utils/opsd_loader.py
+import functools
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterable, Iterator, Literal
+
+from .columnar_cache import cached_columns, read_cached, read_cached_window
+from .timestamps import parse_timestamps
+
+OPSD_RAW_DIR = Path(__file__).resolve().parent.parent / "OPSD_TimeSeries" / "raw"
+
+OPSD_RESOLUTIONS = ("15min", "30min", "60min")
+
+Resolution = Literal["15min", "30min", "60min"]
+
+# Parts of an OPSD column name, e.g. DE_50hertz_wind_offshore_generation_actual is
+# country DE, region DE_50hertz, variable wind_offshore, attribute generation_actual, no source
+OPSD_COLUMN_FIELDS = ["country", "region", "variable", "attribute", "source"]
+
+# Longer variable/attribute names come first so "wind_offshore" is not read as "wind"
+_OPSD_COLUMN_RE = re.compile(
+    r"^(?P<region>.+?)_"
+    r"(?P<variable>wind_offshore|wind_onshore|solar|wind|load|price)_"
+    r"(?P<attribute>generation_actual|actual|forecast|capacity|profile|day_ahead)"
+    r"(?:_(?P<source>.+))?$"
+)
+
+# Renewable generation variables, as used for technology sums
+OPSD_RENEWABLES = ["solar", "wind", "wind_onshore", "wind_offshore"]
+
+Selector = str | Iterable[str] | None
+
+
+def opsd_path(resolution: Resolution) -> Path:
+    """
+    Path of the raw OPSD singleindex file for a given resolution.
+    """
+    if resolution not in OPSD_RESOLUTIONS:
+        raise ValueError(f"Resolution must be one of {OPSD_RESOLUTIONS}")
+    return OPSD_RAW_DIR / f"time_series_{resolution}_singleindex.csv"
+
+
+def _clean_opsd_frame(df: pd.DataFrame) -> pd.DataFrame:
+    df["utc_timestamp"] = parse_timestamps(df["utc_timestamp"], source="opsd", utc=True)
+    df = df.set_index("utc_timestamp")
+    return df.loc[:, ~df.columns.str.contains("^Unnamed")]
+
+
+def _parse_opsd_csv(fp: str | Path) -> pd.DataFrame:
+    """
+    Parse an OPSD singleindex CSV (any resolution) indexed by UTC timestamp.
+    """
+    return _clean_opsd_frame(pd.read_csv(fp))
+
+
+def iter_opsd_chunks(fp: str | Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Parse an OPSD CSV `chunksize` rows at a time; each chunk is what _parse_opsd_csv
+    returns for those rows.
+    """
+    for chunk in pd.read_csv(fp, chunksize=chunksize):
+        yield _clean_opsd_frame(chunk)
+
+
+def _read_opsd_csv(fp: str | Path) -> pd.DataFrame:
+    """
+    Load a full OPSD file through the columnar cache.
+    """
+    return read_cached(fp, _parse_opsd_csv)
+
+
+def _to_utc(ts: str | pd.Timestamp | None) -> pd.Timestamp | None:
+    """
+    Interpret naive times as UTC, convert aware times to UTC.
+    """
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def opsd_columns(resolution: Resolution = "60min", fp: str | Path | None = None) -> list[str]:
+    """
+    Column names of an OPSD file, taken from the cached schema without reading rows.
+    """
+    fp = fp if fp is not None else opsd_path(resolution)
+    return cached_columns(fp, _parse_opsd_csv)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_opsd_column(column: str) -> tuple[str | None, ...]:
+    """
+    (country, region, variable, attribute, source) of an OPSD column name; parts that do
+    not apply are None. Unrecognized names only get a country, from an upper-case prefix.
+    Region is the full prefix, i.e. the country or a TSO/bidding zone such as DE_50hertz or GB_UKM.
+    """
+    match = _OPSD_COLUMN_RE.match(column)
+    if match is None:
+        prefix = column.split("_", 1)[0]
+        return prefix if prefix.isupper() else None, None, None, None, None
+    region, variable, attribute, source = match.group("region", "variable", "attribute", "source")
+    if variable == "wind" and "offshore" in column:
+        variable = "wind_offshore"
+    return region.split("_", 1)[0], region, variable, attribute, source
+
+
+def opsd_column_index(
+    resolution: Resolution = "60min",
+    fp: str | Path | None = None,
+    columns: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Parsed OPSD column names, one row per column (indexed by name) with the parts of
+    OPSD_COLUMN_FIELDS. Columns are taken from the cached schema unless given explicitly.
+    """
+    columns = list(columns) if columns is not None else opsd_columns(resolution, fp)
+    return pd.DataFrame(
+        [parse_opsd_column(c) for c in columns],
+        index=pd.Index(columns, name="column"),
+        columns=OPSD_COLUMN_FIELDS,
+    )
+
+
+def _matches(values: pd.Series, wanted: Selector) -> np.ndarray:
+    if wanted is None:
+        return np.ones(len(values), dtype=bool)
+    wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+    return values.isin(wanted).to_numpy()
+
+
+def select_opsd_columns(
+    index: pd.DataFrame,
+    country: Selector = None,
+    region: Selector = None,
+    variable: Selector = None,
+    attribute: Selector = None,
+    source: Selector = None,
+) -> list[str]:
+    """
+    Column names whose parts match every given selector (a value or a list of values),
+    e.g. select_opsd_columns(index, country="DE", variable="wind_offshore", attribute="generation_actual").
+    """
+    mask = (
+        _matches(index["country"], country)
+        & _matches(index["region"], region)
+        & _matches(index["variable"], variable)
+        & _matches(index["attribute"], attribute)
+        & _matches(index["source"], source)
+    )
+    return index.index[mask].tolist()
+
+
+def sum_opsd_columns(
+    df: pd.DataFrame,
+    by: str | list[str] = "country",
+    index: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """
+    Sum the columns of an OPSD frame per group of parsed name parts, e.g. by="country" or
+    by=["country", "variable"]. Missing values count as zero, as in DataFrame.sum.
+    Columns whose group parts are unknown are left out.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    index = opsd_column_index(columns=df.columns) if index is None else index.reindex(df.columns)
+    keys = index[by].dropna()
+    if keys.empty:
+        return pd.DataFrame(index=df.index)
+
+    groups = pd.MultiIndex.from_frame(keys) if len(by) > 1 else pd.Index(keys[by[0]])
+    codes, labels = pd.factorize(groups, sort=True)
+    indicator = np.zeros((len(keys), len(labels)))
+    indicator[np.arange(len(keys)), codes] = 1.0
+    values = np.nan_to_num(df[keys.index].to_numpy(dtype=np.float64))
+    if isinstance(labels, pd.MultiIndex):
+        labels = labels.set_names(by)
+    else:
+        labels = pd.Index(labels, name=by[0])
+    return pd.DataFrame(values @ indicator, index=df.index, columns=labels)
+
+
+def load_opsd(
+    resolution: Resolution = "60min",
+    columns: list[str] | None = None,
+    countries: list[str] | str | None = None,
+    suffix: str | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    fp: str | Path | None = None,
+    variable: Selector = None,
+    attribute: Selector = None,
+    source: Selector = None,
+) -> pd.DataFrame:
+    """
+    Load an OPSD time series reading only the requested columns and time window.
+
+    Parameters:
+        resolution: "15min", "30min" or "60min" (ignored when `fp` is given).
+        columns: Explicit column names to load.
+        countries: Keep columns whose country/region prefix (e.g. "DE", "GB_UKM") matches.
+        suffix: Keep columns ending with this suffix (e.g. "_load_actual_entsoe_transparency").
+        start, end: Inclusive time window; naive values are interpreted as UTC.
+        fp: Explicit path to an OPSD singleindex CSV.
+        variable, attribute, source: Keep columns whose parsed name parts match
+            (see parse_opsd_column), e.g. variable="solar", attribute="generation_actual".
+    """
+    fp = fp if fp is not None else opsd_path(resolution)
+
+    parts = {"variable": variable, "attribute": attribute, "source": source}
+    if countries is not None or suffix is not None or any(v is not None for v in parts.values()):
+        index = opsd_column_index(fp=fp, columns=columns)
+        if countries is not None:
+            # A country also matches its TSO/bidding-zone regions (DE -> DE_50hertz, DE_LU)
+            countries = [countries] if isinstance(countries, str) else list(countries)
+            index = index[index["region"].isin(countries) | index["country"].isin(countries)]
+        if suffix is not None:
+            index = index[index.index.str.endswith(suffix)]
+        columns = select_opsd_columns(index, **parts)
+
+    return read_cached_window(fp, _parse_opsd_csv, start=_to_utc(start), end=_to_utc(end), columns=columns)
@@ -0,0 +1,446 @@
+# utils/out_of_core.py
+import os
+import shutil
+import sys
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .agenceore_loader import _parse_consumption_csv, consumption_files, iter_consumption_chunks
+from .columnar_cache import CACHE_DIR, _chunk_table, cache_enabled, cached_entry, iter_cached_batches, write_cached_chunks
+from .opsd_loader import _parse_opsd_csv, iter_opsd_chunks, opsd_path
+
+# Time partitions of cache entries, one directory per entry and period
+PARTITION_DIR = CACHE_DIR / "partitions"
+
+# Memory ceiling of out-of-core runs, overridable with POWER_DATA_MEMORY_MB
+DEFAULT_MEMORY_MB = 1024
+
+# Share of the ceiling one parsed chunk or batch may take while spilling and partitioning
+CHUNK_BUDGET = 0.1
+
+# In-memory size of a parsed row relative to its final frame, covering read_csv temporaries
+PARSE_OVERHEAD = 3.0
+
+# Seconds between RSS samples taken while a step runs
+RSS_SAMPLE_SECONDS = 0.005
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def memory_limit() -> int:
+    """
+    Memory ceiling in bytes, from POWER_DATA_MEMORY_MB.
+    """
+    return int(float(os.environ.get("POWER_DATA_MEMORY_MB", DEFAULT_MEMORY_MB)) * 1e6)
+
+
+def current_rss() -> int | None:
+    """
+    Resident set size of this process in bytes, or None where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _lifetime_peak_rss() -> int | None:
+    """
+    Highest RSS of the process so far in bytes, or None where the resource module is
+    unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _RSSSampler(threading.Thread):
+    """
+    Background thread recording the highest RSS seen until stop() is called.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss() or 0
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            rss = current_rss()
+            if rss is not None and rss > self.peak:
+                self.peak = rss
+
+    def stop(self) -> int:
+        self.done.set()
+        self.join()
+        return max(self.peak, current_rss() or 0)
+
+
+class MemoryCeilingWarning(RuntimeWarning):
+    """
+    A telemetry step peaked above the memory ceiling.
+    """
+
+
+class StepStats(NamedTuple):
+    step: str
+    seconds: float
+    start_rss_mb: float
+    peak_rss_mb: float
+    rows: int | None
+
+
+class Telemetry:
+    """
+    Wall time and peak resident memory of named steps, e.g.
+
+        telemetry = Telemetry()
+        full_history_stats("OPSD", telemetry=telemetry)
+        telemetry.to_frame()
+
+    RSS is sampled from /proc/self/statm by a background thread while a step runs; without
+    /proc the process-lifetime maximum is reported instead, and NaN where neither is
+    available. Steps peaking above `limit`
+    (default: memory_limit()) emit a MemoryCeilingWarning. The comparison is against the
+    whole process's RSS, including the interpreter and imported libraries (pandas and
+    pyarrow alone take a few hundred MB), whereas the MemoryError check before reading a
+    partition only estimates the bytes of that partition.
+    """
+
+    def __init__(self, limit: int | None = None, interval: float = RSS_SAMPLE_SECONDS):
+        self.limit = memory_limit() if limit is None else limit
+        self.interval = interval
+        self.steps: list[StepStats] = []
+
+    @contextmanager
+    def step(self, name: str):
+        """
+        Measure the enclosed block; set info["rows"] inside it to record the rows processed.
+        """
+        info = {"rows": None}
+        sampler = _RSSSampler(self.interval)
+        start_rss = current_rss()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield info
+        finally:
+            peak = sampler.stop() if start_rss is not None else _lifetime_peak_rss()
+            self.steps.append(StepStats(
+                name,
+                time.perf_counter() - start,
+                start_rss / 1e6 if start_rss is not None else np.nan,
+                peak / 1e6 if peak is not None else np.nan,
+                info["rows"],
+            ))
+            if peak is not None and peak > self.limit:
+                warnings.warn(f"Step '{name}' peaked at {peak / 1e6:.0f} MB RSS, above the "
+                              f"{self.limit / 1e6:.0f} MB ceiling", MemoryCeilingWarning)
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return max((s.peak_rss_mb for s in self.steps if not np.isnan(s.peak_rss_mb)), default=0.0)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.steps, columns=StepStats._fields).set_index("step")
+
+
+class OutOfCoreSpec(NamedTuple):
+    """
+    How a source file is parsed in chunks: `reader` names the cache entry the chunks build,
+    `chunks(fp, rows)` yields what `reader` returns for consecutive slices of the file.
+    `time_is_index` says whether `reader` returns `time_col` as the index or as a column.
+    """
+    reader: Callable[..., pd.DataFrame]
+    time_col: str
+    time_is_index: bool
+    chunks: Callable[[Path, int], Iterator[pd.DataFrame]]
+    read_csv_kwargs: dict = {}
+    files: Callable[[], list[Path]] | None = None
+
+
+def _consumption_chunks(fp: Path, rows: int) -> Iterator[pd.DataFrame]:
+    return iter_consumption_chunks(fp, chunksize=rows)
+
+
+def source_out_of_core_spec(source: str) -> OutOfCoreSpec:
+    """
+    Chunked parsing of the sources too large to parse at once.
+    """
+    if source == "OPSD":
+        return OutOfCoreSpec(_parse_opsd_csv, "utc_timestamp", True, iter_opsd_chunks,
+                             files=lambda: [opsd_path("15min")])
+    if source == "AgenceORE_Consumption_lt36kVA":
+        return OutOfCoreSpec(_parse_consumption_csv, "time", False, _consumption_chunks, {"sep": ";"},
+                             files=consumption_files)
+    raise ValueError(f"No out-of-core definition for source '{source}'.")
+
+
+def chunk_rows(fp: str | Path, read_csv_kwargs: dict | None = None, budget: int | None = None,
+               sample_rows: int = 1000) -> int:
+    """
+    Rows per parsed chunk so that one chunk takes about `budget` bytes (by default
+    CHUNK_BUDGET of the ceiling), estimated from the first `sample_rows` rows.
+    """
+    budget = int(memory_limit() * CHUNK_BUDGET) if budget is None else budget
+    sample = pd.read_csv(fp, nrows=sample_rows, **(read_csv_kwargs or {}))
+    row_bytes = sample.memory_usage(deep=True).sum() / max(len(sample), 1) * PARSE_OVERHEAD
+    return max(int(budget // max(row_bytes, 1)), 1000)
+
+
+def spill(fp: str | Path, source: str, telemetry: Telemetry | None = None) -> Path:
+    """
+    Cache entry of a source file, built chunk by chunk when missing so the parsed file
+    never has to fit in memory.
+    """
+    spec = source_out_of_core_spec(source)
+    entry = cached_entry(fp, spec.reader)
+    if entry is not None:
+        return entry
+    telemetry = telemetry or Telemetry()
+    with telemetry.step(f"spill {Path(fp).name}") as info:
+        info["rows"] = 0
+
+        def counted(chunks):
+            for chunk in chunks:
+                info["rows"] += len(chunk)
+                yield chunk
+
+        rows = chunk_rows(fp, spec.read_csv_kwargs)
+        return write_cached_chunks(fp, spec.reader, counted(spec.chunks(Path(fp), rows)))
+
+
+def _period_labels(times, period: str) -> np.ndarray:
+    """
+    UTC period of each timestamp as a string, e.g. "2020-01" for period="M".
+    """
+    times = pd.DatetimeIndex(times)
+    if times.tz is not None:
+        times = times.tz_convert("UTC").tz_localize(None)
+    return times.to_period(period).astype(str).to_numpy()
+
+
+def _batch_rows(entry: Path) -> int:
+    """
+    Rows per batch read from a cache entry, from its uncompressed size per row.
+    """
+    import pyarrow.parquet as pq
+
+    metadata = pq.ParquetFile(entry).metadata
+    total = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    row_bytes = total / max(metadata.num_rows, 1) * PARSE_OVERHEAD
+    return max(int(memory_limit() * CHUNK_BUDGET // max(row_bytes, 1)), 1000)
+
+
+def build_partitions(fp: str | Path, source: str, period: str = "M", telemetry: Telemetry | None = None) -> Path:
+    """
+    Split a source file into one Parquet file per UTC `period` (a pandas period alias such as
+    "M" or "Y") under the cache directory, streaming its cache entry in batches.
+    Partitions are rebuilt when the source file changes.
+    """
+    import pyarrow.parquet as pq
+
+    spec = source_out_of_core_spec(source)
+    entry = spill(fp, source, telemetry)
+    target = PARTITION_DIR / f"{entry.stem}-{period}"
+    if target.exists():
+        return target
+
+    telemetry = telemetry or Telemetry()
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    writers, parts, schema = {}, {}, None
+    with telemetry.step(f"partition {Path(fp).name} by {period}") as info:
+        rows = 0
+        try:
+            for batch in iter_cached_batches(entry, batch_size=_batch_rows(entry)):
+                times = batch.index if spec.time_is_index else batch[spec.time_col]
+                labels = _period_labels(times, period)
+                current = pd.unique(labels)
+                # Entries are in time order, so a period absent from this batch is complete;
+                # closing its writer keeps one file's buffers open instead of one per period
+                for label in set(writers) - set(current):
+                    writers.pop(label).close()
+                for label in current:
+                    table = _chunk_table(batch[labels == label], schema)
+                    schema = table.schema
+                    writer = writers.get(label)
+                    if writer is None:
+                        # A period seen again after its writer closed goes to a further part file
+                        parts[label] = parts.get(label, -1) + 1
+                        name = label if parts[label] == 0 else f"{label}~{parts[label]}"
+                        writer = writers[label] = pq.ParquetWriter(tmp / f"{name}.parquet", schema)
+                    writer.write_table(table)
+                rows += len(batch)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        info["rows"] = rows
+    os.replace(tmp, target)
+
+    # Partitions of older versions of the same file and period
+    slot_prefix = entry.stem.rsplit("-", 1)[0]
+    for old in PARTITION_DIR.glob(f"{slot_prefix}-*-{period}"):
+        if old != target:
+            shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+def _partition_bytes(path: Path, columns: list[str] | None) -> int:
+    """
+    Uncompressed size of the selected columns of a partition file.
+    """
+    import pyarrow.parquet as pq
+
+    metadata = pq.ParquetFile(path).metadata
+    total = 0
+    for i in range(metadata.num_row_groups):
+        group = metadata.row_group(i)
+        for j in range(group.num_columns):
+            column = group.column(j)
+            if columns is None or column.path_in_schema in columns:
+                total += column.total_uncompressed_size
+    return total
+
+
+def _partition_loaders(
+    source: str,
+    files: Iterable[str | Path] | None,
+    period: str,
+    columns: list[str] | None,
+    telemetry: Telemetry | None,
+) -> Iterator[tuple[str, Callable[[], pd.DataFrame]]]:
+    """
+    (period label, loader) for every partition of the source's files; nothing is read
+    until a loader is called.
+    """
+    spec = source_out_of_core_spec(source)
+    files = spec.files() if files is None else files
+    if isinstance(files, (str, Path)):
+        files = [files]
+
+    for fp in files:
+        if not cache_enabled():
+            df = spec.reader(fp)
+            times = df.index if spec.time_is_index else df[spec.time_col]
+            labels = _period_labels(times, period)
+            for label in pd.unique(labels):
+                part = df[labels == label]
+                yield label, lambda part=part: part[columns] if columns is not None else part
+            continue
+
+        folder = build_partitions(fp, source, period, telemetry)
+        read_columns = None if columns is None else [c for c in columns if c != spec.time_col]
+        # An index column is restored by pandas without being listed
+        if read_columns is not None and not spec.time_is_index:
+            read_columns = [spec.time_col, *read_columns]
+        labelled = {}
+        for path in sorted(folder.glob("*.parquet")):
+            labelled.setdefault(path.stem.split("~")[0], []).append(path)
+        for label, paths in labelled.items():
+            needed = sum(_partition_bytes(path, read_columns) for path in paths) * PARSE_OVERHEAD
+            if needed > memory_limit():
+                raise MemoryError(
+                    f"Partition {label} of {Path(fp).name} needs about {needed / 1e6:.0f} MB, above the "
+                    f"{memory_limit() / 1e6:.0f} MB ceiling; use a shorter period or fewer columns."
+                )
+            yield label, lambda paths=paths: pd.concat(
+                [pd.read_parquet(path, engine="pyarrow", columns=read_columns) for path in paths]
+            )
+
+
+def iter_partitions(
+    source: str,
+    files: Iterable[str | Path] | None = None,
+    period: str = "M",
+    columns: list[str] | None = None,
+    telemetry: Telemetry | None = None,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    Yield (period label, frame) for every partition of the source's files, one at a time.
+    A period spanning two files is yielded once per file. Partitions whose selected columns
+    would not fit under memory_limit() raise MemoryError; use a shorter period.
+    Without the columnar cache each file is parsed whole and split in memory.
+    """
+    for label, load in _partition_loaders(source, files, period, columns, telemetry):
+        yield label, load()
+
+
+def map_partitions(
+    source: str,
+    fn: Callable[[pd.DataFrame], pd.DataFrame | pd.Series],
+    files: Iterable[str | Path] | None = None,
+    period: str = "M",
+    columns: list[str] | None = None,
+    combine: Callable[[list], pd.DataFrame] | None = None,
+    telemetry: Telemetry | None = None,
+):
+    """
+    Apply `fn` to each time partition of a source in turn and merge the results with
+    `combine` (default: concatenation). Only one partition is in memory at a time, so
+    results should be reductions; e.g. daily national AgenceORE totals over all years:
+
+        map_partitions("AgenceORE_Consumption_lt36kVA",
+                       lambda df: df.groupby(df["time"].dt.floor("1D"))["ENERGIE_SOUTIREE"].sum(),
+                       combine=lambda parts: pd.concat(parts).groupby(level=0).sum())
+
+    Pass a Telemetry to get the time and peak RSS of every spill, partition and map step.
+    """
+    telemetry = telemetry or Telemetry()
+    name = getattr(fn, "__name__", "map")
+    results = []
+    for label, load in _partition_loaders(source, files, period, columns, telemetry):
+        with telemetry.step(f"{name} {label}") as info:
+            df = load()
+            info["rows"] = len(df)
+            results.append(fn(df))
+            del df
+    if not results:
+        raise ValueError(f"No partitions found for {source}.")
+    return combine(results) if combine is not None else pd.concat(results)
+
+
+def _column_stats(df: pd.DataFrame) -> pd.DataFrame:
+    values = df.select_dtypes(include="number")
+    return pd.DataFrame({
+        "count": values.count(),
+        "sum": values.sum(),
+        "min": values.min(),
+        "max": values.max(),
+    })
+
+
+def _merge_stats(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    stats = pd.concat(parts).groupby(level=0, sort=False).agg(
+        {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+    )
+    stats["mean"] = stats["sum"] / stats["count"].where(stats["count"] > 0)
+    return stats
+
+
+def full_history_stats(
+    source: str,
+    files: Iterable[str | Path] | None = None,
+    columns: list[str] | None = None,
+    period: str = "M",
+    telemetry: Telemetry | None = None,
+) -> pd.DataFrame:
+    """
+    Count, sum, min, max and mean of every numeric column over all files of a source
+    (all OPSD 15-minute data or every AgenceORE year by default), computed out of core.
+    """
+    return map_partitions(source, _column_stats, files, period, columns, _merge_stats, telemetry)
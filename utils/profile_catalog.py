@@ -0,0 +1,277 @@
+# utils/profile_catalog.py
+import hashlib
+import io
+import json
+import re
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .columnar_cache import CACHE_DIR, file_identity
+from .data_catalog import source_files
+from .opsd_loader import parse_opsd_column
+from .timestamps import parse_timestamps
+
+PROFILE_CATALOG_FP = CACHE_DIR / "profile_catalog.parquet"
+
+# Rows read from the head of each file; the tail is read separately for the end timestamp
+SAMPLE_ROWS = 2000
+TAIL_BYTES = 64 * 1024
+
+PROFILE_COLUMNS = [
+    "source", "file", "profile", "profile_type", "country", "unit",
+    "resolution", "start", "end", "null_fraction", "file_hash",
+]
+
+# Per-source layout: glob pattern, separator, timestamp column and parse options
+_SOURCE_LAYOUTS = {
+    "OPSD": {"pattern": "raw/*.csv", "sep": ",", "time": "utc_timestamp", "utc": True},
+    "SimBench": {"pattern": "raw/**/*Profile*.csv", "sep": ";", "time": "time", "utc": False},
+    "Zenodo": {"pattern": "raw/*.csv", "sep": ";", "time": "Time stamp", "utc": False},
+    "ELMAS": {"pattern": "raw/*.csv", "sep": ",", "time": "Time", "utc": False},
+    "AgenceORE_Consumption_lt36kVA": {"pattern": "raw/*.csv", "sep": ";", "time": "HORODATE", "utc": True},
+    "Ember": {"pattern": "raw/*.csv", "sep": ",", "time": "Date", "utc": False},
+}
+
+# OPSD (variable or attribute) -> (profile type, unit), see parse_opsd_column
+_OPSD_TYPES = {
+    "capacity": ("capacity", "MW"),
+    "profile": ("capacity factor", "share"),
+    "price": ("price", "EUR/MWh"),
+    "actual": ("load", "MW"),
+    "forecast": ("forecast", "MW"),
+}
+
+_SIMBENCH_RES_TYPES = {"PV": "solar", "WP": "wind", "BM": "biomass", "Hydro": "hydro"}
+
+_EMBER_TYPES = {
+    "Electricity demand": "load",
+    "Electricity generation": "production",
+    "Electricity imports": "imports",
+    "Power sector emissions": "emissions",
+    "Capacity": "capacity",
+}
+
+
+def _file_hash(fp: Path) -> str:
+    identity = file_identity(fp)
+    return hashlib.sha1(json.dumps([identity["size"], identity["mtime_ns"]]).encode()).hexdigest()[:16]
+
+
+def _read_tail(fp: Path, sep: str, columns: list[str]) -> pd.DataFrame:
+    """
+    Last complete lines of a file parsed with the header's column names,
+    without reading anything before the final TAIL_BYTES.
+    """
+    with open(fp, "rb") as f:
+        size = f.seek(0, io.SEEK_END)
+        f.seek(max(0, size - TAIL_BYTES))
+        data = f.read()
+    # The first line is either cut in the middle or, for small files, the header
+    lines = data.splitlines()[1:]
+    text = b"\n".join(line for line in lines if line.strip()).decode("utf-8", errors="replace")
+    return pd.read_csv(io.StringIO(text), sep=sep, names=columns, header=None)
+
+
+def _infer_resolution(times: pd.DatetimeIndex) -> str | None:
+    steps = pd.Series(times).drop_duplicates().sort_values().diff().dropna()
+    if steps.empty:
+        return None
+    step = steps.mode().iloc[0]
+    if step >= pd.Timedelta(days=28):
+        return "monthly"
+    return f"{int(step.total_seconds() // 60)}min"
+
+
+def _opsd_profile(column: str) -> tuple[str | None, str | None, str | None]:
+    country, _, variable, attribute, _ = parse_opsd_column(column)
+    if attribute == "generation_actual":
+        return variable.replace("_", " "), country, "MW"
+    profile_type, unit = _OPSD_TYPES.get(variable if variable == "price" else attribute, (None, None))
+    return profile_type, country, unit
+
+
+def _simbench_profile(column: str, file_stem: str) -> tuple[str | None, str | None, str | None]:
+    if column.endswith("_pload"):
+        return "load active", "DE", "p.u."
+    if column.endswith("_qload"):
+        return "load reactive", "DE", "p.u."
+    for prefix, profile_type in _SIMBENCH_RES_TYPES.items():
+        if column.startswith(prefix) and file_stem.startswith("RES"):
+            return profile_type, "DE", "p.u."
+    if file_stem.startswith("PowerPlant"):
+        return "powerplant", "DE", "p.u."
+    if file_stem.startswith("Storage"):
+        return "storage", "DE", "p.u."
+    return None, "DE", "p.u."
+
+
+def _wide_profiles(source: str, fp: Path, layout: dict) -> list[dict]:
+    """
+    One entry per value column of a wide time-series file, from a head sample and the tail.
+    """
+    sample = pd.read_csv(fp, sep=layout["sep"], nrows=SAMPLE_ROWS)
+    sample = sample.loc[:, ~sample.columns.str.contains("^Unnamed")]
+    time_col = next((c for c in sample.columns if c.lower() == layout["time"].lower()), None)
+    if time_col is None:
+        raise ValueError(f"No '{layout['time']}' column in {fp.name}")
+
+    times = pd.DatetimeIndex(parse_timestamps(sample[time_col], source=source, utc=layout["utc"]))
+    tail = _read_tail(fp, layout["sep"], list(pd.read_csv(fp, sep=layout["sep"], nrows=0).columns))
+    end = pd.DatetimeIndex(parse_timestamps(tail[time_col], source=source, utc=layout["utc"])).max()
+    resolution = _infer_resolution(times)
+    null_fraction = sample.isna().mean()
+
+    entries = []
+    for column in sample.columns:
+        if column == time_col or not pd.api.types.is_numeric_dtype(sample[column]):
+            continue
+        if source == "OPSD":
+            profile_type, country, unit = _opsd_profile(column)
+        elif source == "SimBench":
+            profile_type, country, unit = _simbench_profile(column, fp.stem)
+        elif source == "Zenodo":
+            profile_type, country, unit = "load", "DE", "kW"
+        elif column.lower().startswith("temperature"):
+            profile_type, country, unit = "temperature", "FR", "degC"
+        else:
+            profile_type, country, unit = "load", "FR", "kWh"
+        entries.append({
+            "profile": column,
+            "profile_type": profile_type,
+            "country": country,
+            "unit": unit,
+            "resolution": resolution,
+            "start": times.min(),
+            "end": end,
+            "null_fraction": float(null_fraction[column]),
+        })
+    return entries
+
+
+def _agenceore_profiles(fp: Path, layout: dict) -> list[dict]:
+    """
+    One entry per REGION; every region appears within the first timestamps of the file.
+    """
+    sample = pd.read_csv(fp, sep=layout["sep"], nrows=SAMPLE_ROWS)
+    times = pd.DatetimeIndex(parse_timestamps(sample["HORODATE"], source="agenceore", utc=True))
+    tail = _read_tail(fp, layout["sep"], list(sample.columns))
+    end = pd.DatetimeIndex(parse_timestamps(tail["HORODATE"], source="agenceore", utc=True)).max()
+    resolution = _infer_resolution(times)
+    nulls = sample.groupby("REGION")["ENERGIE_SOUTIREE"].apply(lambda s: s.isna().mean())
+    return [
+        {
+            "profile": region,
+            "profile_type": "load",
+            "country": "FR",
+            "unit": "Wh",
+            "resolution": resolution,
+            "start": times.min(),
+            "end": end,
+            "null_fraction": float(nulls[region]),
+        }
+        for region in sorted(sample["REGION"].dropna().unique())
+    ]
+
+
+def _ember_profiles(fp: Path) -> list[dict]:
+    """
+    One entry per (Area, Variable, Unit) series. Only the identifying columns are read.
+    """
+    df = pd.read_csv(fp, usecols=["Area", "Category", "Variable", "Unit", "Date", "Value"])
+    df["Date"] = parse_timestamps(df["Date"], source="ember")
+    grouped = df.groupby(["Area", "Category", "Variable", "Unit"], observed=True).agg(
+        start=("Date", "min"), end=("Date", "max"), null_fraction=("Value", lambda s: s.isna().mean())
+    ).reset_index()
+    return [
+        {
+            "profile": f"{row.Area} | {row.Variable} ({row.Unit})",
+            "profile_type": _EMBER_TYPES.get(row.Category, row.Category),
+            "country": row.Area,
+            "unit": row.Unit,
+            "resolution": "monthly",
+            "start": row.start,
+            "end": row.end,
+            "null_fraction": float(row.null_fraction),
+        }
+        for row in grouped.itertuples()
+    ]
+
+
+def scan_file(source: str, fp: str | Path) -> pd.DataFrame:
+    """
+    Profile-level catalog entries for one file, read from its header, a bounded head
+    sample and its tail (Ember reads only its key columns).
+    """
+    fp = Path(fp)
+    layout = _SOURCE_LAYOUTS[source]
+    if source == "AgenceORE_Consumption_lt36kVA":
+        entries = _agenceore_profiles(fp, layout)
+    elif source == "Ember":
+        entries = _ember_profiles(fp)
+    else:
+        entries = _wide_profiles(source, fp, layout)
+
+    df = pd.DataFrame(entries, columns=[c for c in PROFILE_COLUMNS if c not in ("source", "file", "file_hash")])
+    df.insert(0, "source", source)
+    df.insert(1, "file", str(fp))
+    df["file_hash"] = _file_hash(fp)
+    for col in ("start", "end"):
+        df[col] = df[col].astype(str)
+    return df
+
+
+def build_profile_catalog(
+    sources: list[str] | None = None,
+    refresh: bool = False,
+    catalog_fp: str | Path = PROFILE_CATALOG_FP,
+) -> pd.DataFrame:
+    """
+    Per-profile catalog across sources, persisted to `catalog_fp`. Only files that are new
+    or whose hash (size + mtime) changed are rescanned; entries of deleted files are dropped.
+    Files that cannot be scanned (e.g. un-pulled LFS pointers) are skipped with a warning.
+    """
+    sources = list(_SOURCE_LAYOUTS) if sources is None else sources
+    catalog_fp = Path(catalog_fp)
+    existing = pd.read_parquet(catalog_fp) if catalog_fp.exists() and not refresh else pd.DataFrame(columns=PROFILE_COLUMNS)
+
+    keep = existing[~existing["source"].isin(sources)]
+    parts = [keep]
+    for source in sources:
+        for fp in source_files(source, _SOURCE_LAYOUTS[source]["pattern"]):
+            current = existing[existing["file"] == str(fp)]
+            if len(current) and (current["file_hash"] == _file_hash(fp)).all():
+                parts.append(current)
+                continue
+            try:
+                parts.append(scan_file(source, fp))
+            except Exception as e:
+                warnings.warn(f"Skipping {fp}: {e}")
+
+    parts = [p for p in parts if len(p)]
+    catalog = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=PROFILE_COLUMNS)
+    catalog_fp.parent.mkdir(parents=True, exist_ok=True)
+    catalog.to_parquet(catalog_fp, engine="pyarrow")
+    return catalog
+
+
+def query_profiles(catalog: pd.DataFrame, **filters) -> pd.DataFrame:
+    """
+    Individual profiles matching every filter; a list value matches any of its items,
+    a string starting with "~" is a case-insensitive regex, e.g.
+    query_profiles(catalog, profile_type=["solar", "wind"], country="DE", profile="~50hertz").
+    """
+    mask = np.ones(len(catalog), dtype=bool)
+    for key, value in filters.items():
+        if key not in catalog.columns:
+            raise ValueError(f"'{key}' is not a valid column. Available columns: {list(catalog.columns)}")
+        column = catalog[key]
+        if isinstance(value, list):
+            mask &= column.isin(value).to_numpy()
+        elif isinstance(value, str) and value.startswith("~"):
+            mask &= column.astype(str).str.contains(value[1:], flags=re.IGNORECASE, regex=True).to_numpy()
+        else:
+            mask &= (column == value).to_numpy()
+    return catalog[mask].reset_index(drop=True)
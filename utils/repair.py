@@ -0,0 +1,203 @@
+# utils/repair.py
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .alignment import _native_step, _to_utc, source_spec
+from .anomalies import anomaly_kwargs
+from .columnar_cache import read_cached
+
+# Columns repaired at a time; bounds the temporary (rows x columns) index and weight arrays
+REPAIR_BLOCK_COLUMNS = 64
+
+# Gaps of up to this many missing rows are interpolated linearly; longer ones use the weekly profile
+DEFAULT_LINEAR_LIMIT = 4
+
+# Weeks searched on each side of a long gap for a value at the same weekday and time of day
+DEFAULT_PROFILE_WEEKS = 4
+
+
+class RepairResult(NamedTuple):
+    """
+    Repaired values on a regular grid, and a boolean frame of the same shape marking the
+    imputed cells. Cells that could not be filled stay NaN and are not marked.
+    """
+    data: pd.DataFrame
+    imputed: pd.DataFrame
+
+
+def regular_grid(index: pd.DatetimeIndex, freq: str | pd.Timedelta | None = None) -> pd.DatetimeIndex:
+    """
+    Regular index from the first to the last timestamp, with step `freq` or the median step.
+    """
+    index = pd.DatetimeIndex(index)
+    step = pd.Timedelta(freq) if freq is not None else _native_step(index)
+    if step is None or len(index) == 0:
+        return index
+    return pd.date_range(index.min(), index.max(), freq=step, name=index.name)
+
+
+def _neighbours(valid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Row of the previous and next valid value for every cell (-1 / len if there is none).
+    """
+    n = len(valid)
+    rows = np.arange(n)[:, None]
+    prev = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    nxt = np.minimum.accumulate(np.where(valid, rows, n)[::-1], axis=0)[::-1]
+    return prev, nxt
+
+
+def _fill_linear(x: np.ndarray, valid: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Interpolate gaps of at most `limit` rows that have a valid value on both sides.
+    """
+    n = len(x)
+    prev, nxt = _neighbours(valid)
+    short = ~valid & (prev >= 0) & (nxt < n) & (nxt - prev - 1 <= limit)
+    if not short.any():
+        return x
+    rows, cols = np.nonzero(short)
+    lo, hi = prev[rows, cols], nxt[rows, cols]
+    weight = (rows - lo) / (hi - lo)
+    out = x.copy()
+    out[rows, cols] = x[lo, cols] * (1 - weight) + x[hi, cols] * weight
+    return out
+
+
+def _fill_profile(x: np.ndarray, keys: np.ndarray, week: int, weeks: int) -> np.ndarray:
+    """
+    Fill remaining gaps with the value at the same weekday and time of day in the nearest
+    week (up to `weeks` away, earlier weeks first), then with that slot's mean over the series.
+    """
+    out = x.copy()
+    for k in range(1, weeks + 1):
+        missing = np.isnan(out)
+        if not missing.any():
+            return out
+        shift = k * week
+        if shift >= len(x):
+            break
+        earlier = np.full_like(x, np.nan)
+        earlier[shift:] = x[:-shift]
+        later = np.full_like(x, np.nan)
+        later[:-shift] = x[shift:]
+        out = np.where(missing, np.where(np.isnan(earlier), later, earlier), out)
+
+    missing = np.isnan(out)
+    if missing.any():
+        profile = pd.DataFrame(x).groupby(keys).mean().reindex(range(keys.max() + 1)).to_numpy()
+        out = np.where(missing, profile[keys], out)
+    return out
+
+
+def _bound(bound, columns: list[str], frame: pd.DataFrame) -> np.ndarray | None:
+    """
+    Bound for every cell of `columns`: a scalar, or a mapping of column -> scalar or name
+    of a column of `frame` (e.g. an installed capacity, carried over its own gaps).
+    """
+    if bound is None:
+        return None
+    if np.isscalar(bound):
+        return np.full((1, len(columns)), float(bound))
+    out = np.full((len(frame), len(columns)), np.nan)
+    for i, col in enumerate(columns):
+        b = bound.get(col)
+        if isinstance(b, str):
+            if b in frame.columns:
+                out[:, i] = frame[b].ffill().bfill().to_numpy(dtype=np.float64)
+        elif b is not None:
+            out[:, i] = b
+    return out
+
+
+def repair_profiles(
+    df: pd.DataFrame,
+    freq: str | pd.Timedelta | None = None,
+    linear_limit: int = DEFAULT_LINEAR_LIMIT,
+    profile_weeks: int | None = DEFAULT_PROFILE_WEEKS,
+    lower: float | dict | None = None,
+    upper: float | dict | None = None,
+    block_columns: int = REPAIR_BLOCK_COLUMNS,
+) -> RepairResult:
+    """
+    Reindex the numeric columns of a time-indexed frame to a regular grid and fill the gaps.
+
+    Missing runs of at most `linear_limit` rows are interpolated linearly. Longer runs are
+    copied from the same weekday and time of day in the nearest of the `profile_weeks`
+    surrounding weeks, falling back to that slot's mean (disable with profile_weeks=None).
+    Imputed values are clipped to `lower`/`upper`, given as for detect_anomalies: a scalar,
+    or a mapping of column -> scalar or name of a capacity column. Measured values are kept.
+
+    Columns are processed `block_columns` at a time. Returns the repaired frame and the
+    mask of imputed cells, e.g.
+
+        data, imputed = repair_profiles(load_opsd(countries=["DE"]), upper={"DE_solar_generation_actual": "DE_solar_capacity"})
+    """
+    frame = df.select_dtypes(include="number")
+    frame = frame[~frame.index.duplicated()].sort_index()
+    grid = regular_grid(frame.index, freq)
+    frame = frame.reindex(grid)
+    columns = list(frame.columns)
+
+    step = _native_step(grid) or pd.Timedelta("1h")
+    week = max(int(pd.Timedelta("7D") // step), 1)
+    # Slot of each row within the week, counted from Monday 00:00
+    since_monday = grid - grid.normalize() + pd.to_timedelta(grid.dayofweek, unit="D")
+    keys = np.asarray(since_monday // step, dtype=np.int64) if len(grid) else np.zeros(0, dtype=np.int64)
+
+    values = np.empty(frame.shape)
+    imputed = np.zeros(frame.shape, dtype=bool)
+    for lo in range(0, len(columns), block_columns):
+        block_cols = columns[lo:lo + block_columns]
+        x = frame[block_cols].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(x)
+        # Only columns with gaps go through the fill passes
+        gappy = ~valid.all(axis=0)
+        out = x.copy()
+        if gappy.any():
+            part = _fill_linear(x[:, gappy], valid[:, gappy], linear_limit) if linear_limit else x[:, gappy]
+            if profile_weeks is not None:
+                part = _fill_profile(part, keys, week, profile_weeks)
+            out[:, gappy] = part
+
+        filled = ~valid & ~np.isnan(out)
+        lower_bound, upper_bound = _bound(lower, block_cols, frame), _bound(upper, block_cols, frame)
+        with np.errstate(invalid="ignore"):
+            if lower_bound is not None:
+                out = np.where(filled & (out < lower_bound), lower_bound, out)
+            if upper_bound is not None:
+                out = np.where(filled & (out > upper_bound), upper_bound, out)
+        values[:, lo:lo + block_columns] = out
+        imputed[:, lo:lo + block_columns] = filled
+
+    return RepairResult(
+        pd.DataFrame(values, index=grid, columns=frame.columns),
+        pd.DataFrame(imputed, index=grid, columns=frame.columns),
+    )
+
+
+def repair_source(
+    source: str,
+    fp: str | Path | None = None,
+    columns: list[str] | None = None,
+    **repair_kwargs,
+) -> RepairResult:
+    """
+    Read a catalog source through the columnar cache, move it to UTC and repair it with the
+    source's bounds from anomaly_kwargs (non-negative values, OPSD capacities, SimBench p.u. limit).
+    """
+    spec = source_spec(source, fp)
+    df = read_cached(spec.fp, spec.reader, **spec.reader_kwargs)
+    if spec.time_col is not None:
+        df = df.set_index(spec.time_col)
+    if columns is not None:
+        df = df[columns]
+    df.index = _to_utc(df.index, spec.tz)
+    df = df[df.index.notna()]
+
+    bounds = anomaly_kwargs(source, df.columns)
+    repair_kwargs = {"lower": bounds.get("lower"), "upper": bounds.get("upper"), **repair_kwargs}
+    return repair_profiles(df, **repair_kwargs)
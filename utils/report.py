@@ -0,0 +1,147 @@
+# utils/report.py
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+
+from .data_catalog import source_folder
+
+# Output formats written for every figure unless overridden
+DEFAULT_FORMATS = ("png",)
+
+
+class ReportJob(NamedTuple):
+    """
+    One plotter call of a report. `plotter` must accept show=False and be importable
+    by name (a module-level function), so it can be sent to worker processes.
+    """
+    name: str
+    plotter: Callable
+    kwargs: dict = {}
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render_job(job: ReportJob, out_dir: str | Path, formats: Iterable[str] = DEFAULT_FORMATS, dpi: int = 100) -> list[Path]:
+    """
+    Run one plotter without showing and save every figure it opened as
+    `{name}.{format}`, or `{name}-{i}.{format}` for plotters drawing several figures.
+    Expects a non-interactive backend (set up by render_report's workers).
+    """
+    import matplotlib.pyplot as plt
+
+    out_dir = Path(out_dir)
+    plt.close("all")
+    try:
+        job.plotter(**job.kwargs, show=False)
+        numbers = plt.get_fignums()
+        paths = []
+        for i, number in enumerate(numbers, start=1):
+            figure = plt.figure(number)
+            stem = job.name if len(numbers) == 1 else f"{job.name}-{i}"
+            for fmt in formats:
+                path = out_dir / f"{stem}.{fmt}"
+                figure.savefig(path, dpi=dpi)
+                paths.append(path)
+        return paths
+    finally:
+        plt.close("all")
+
+
+def _render(job: ReportJob, out_dir: Path, formats: tuple[str, ...], dpi: int, return_exceptions: bool):
+    if not return_exceptions:
+        return render_job(job, out_dir, formats, dpi)
+    try:
+        return render_job(job, out_dir, formats, dpi)
+    except Exception as e:
+        return e
+
+
+def render_report(
+    jobs: Iterable[ReportJob],
+    out_dir: str | Path,
+    formats: Iterable[str] = DEFAULT_FORMATS,
+    dpi: int = 100,
+    max_workers: int | None = None,
+    return_exceptions: bool = False,
+) -> dict[str, list[Path] | Exception]:
+    """
+    Render report jobs to image files in parallel with the Agg backend.
+
+    Each job runs in a worker process, so the calling session's backend is untouched and
+    data loading and drawing of different figures overlap. Results are keyed by job name
+    in input order. With `return_exceptions`, a failing job yields its exception instead
+    of aborting the whole report.
+    """
+    jobs = list(jobs)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    formats = tuple(formats)
+    max_workers = max_workers or min(len(jobs), os.cpu_count() or 1) or 1
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_render, job, out_dir, formats, dpi, return_exceptions) for job in jobs]
+        return {job.name: future.result() for job, future in zip(jobs, futures)}
+
+
+def _slug(value) -> str:
+    return re.sub(r"[^0-9A-Za-z]+", "", str(value)) if value is not None else "all"
+
+
+def source_report_jobs(
+    windows: Iterable[tuple[str | None, str | None]] = ((None, None),),
+    years: Iterable[int] = (2020,),
+) -> list[ReportJob]:
+    """
+    Jobs for the standard figures of every source: windowed plots once per (start, end)
+    window, Ember summaries once per year, and the full-period plots once.
+    """
+    # Imported here so rendering helpers do not load every plotter module
+    from .agenceore_consumption_plotter import plot_consumption_total_active_power
+    from .agenceore_loader import consumption_files
+    from .elmas_plotter import plot_total_elmas_load
+    from .ember_plotter import plot_ember_summary
+    from .opsd_60min_plotter import (
+        plot_opsd_daily_avg_renewables,
+        plot_opsd_max_energy_by_category,
+        plot_opsd_total_load_over_time,
+    )
+    from .simbench_plotter import (
+        plot_simbench_profile_max_loads_as_bar,
+        plot_simbench_res_daily_avg_as_bar,
+        plot_simbench_total_load_over_time,
+    )
+    from .zenodo_plotter import plot_zenodo_2016, plot_zenodo_2017
+
+    opsd = source_folder("OPSD") / "raw" / "time_series_60min_singleindex.csv"
+    simbench = source_folder("SimBench") / "raw"
+    zenodo = source_folder("Zenodo") / "raw"
+    elmas = source_folder("ELMAS") / "raw" / "Time_series_18_clusters.csv"
+    ember = source_folder("Ember") / "raw" / "europe_monthly_full_release_long_format.csv"
+
+    jobs = [
+        ReportJob("simbench_max_loads", plot_simbench_profile_max_loads_as_bar, {"fp": simbench / "consumer" / "LoadProfile.csv"}),
+        ReportJob("simbench_res_daily_avg", plot_simbench_res_daily_avg_as_bar, {"fp": simbench / "producer" / "RESProfile.csv"}),
+        ReportJob("zenodo_2016", plot_zenodo_2016, {"fp": zenodo / "LoadProfile_20IPs_2016.csv"}),
+        ReportJob("zenodo_2017", plot_zenodo_2017, {"fp": zenodo / "LoadProfile_30IPs_2017.csv"}),
+    ]
+    for start, end in windows:
+        window = {"start_time": start, "end_time": end}
+        suffix = f"{_slug(start)}_{_slug(end)}"
+        jobs += [
+            ReportJob(f"opsd_total_load_{suffix}", plot_opsd_total_load_over_time, {"fp": opsd, **window}),
+            ReportJob(f"opsd_max_energy_{suffix}", plot_opsd_max_energy_by_category, {"fp": opsd, **window}),
+            ReportJob(f"opsd_daily_renewables_{suffix}", plot_opsd_daily_avg_renewables, {"fp": opsd, **window}),
+            ReportJob(f"simbench_total_load_{suffix}", plot_simbench_total_load_over_time,
+                      {"fp": simbench / "consumer" / "LoadProfile.csv", **window}),
+            ReportJob(f"agenceore_total_{suffix}", plot_consumption_total_active_power,
+                      {"fp": consumption_files(), **window}),
+            ReportJob(f"elmas_total_{suffix}", plot_total_elmas_load, {"filepath": elmas, **window}),
+        ]
+    for year in years:
+        jobs.append(ReportJob(f"ember_summary_{year}", plot_ember_summary, {"year": year, "fp": ember}))
+    return jobs
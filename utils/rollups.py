@@ -0,0 +1,288 @@
+# utils/rollups.py
+import os
+import shutil
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from .agenceore_loader import _parse_consumption_by_region
+from .columnar_cache import CACHE_DIR, cache_enabled, cache_path, read_cached, read_cached_window
+from .data_catalog import source_files
+from .elmas_loader import _parse_elmas_csv
+from .opsd_loader import _parse_opsd_csv
+from .simbench_loader import _parse_simbench_csv
+from .zenodo_loader import _parse_zenodo_csv
+
+ROLLUP_DIR = CACHE_DIR / "rollups"
+
+# Pyramid levels from finest to coarsest
+ROLLUP_LEVELS = {"hourly": "1h", "daily": "1D", "monthly": "MS"}
+
+ROLLUP_STATS = ("sum", "mean", "min", "max", "count")
+
+# Length of one period of each level, as calendar steps
+_LEVEL_STEPS = {"hourly": pd.Timedelta(hours=1), "daily": pd.DateOffset(days=1), "monthly": pd.DateOffset(months=1)}
+
+_CALENDAR_OFFSETS = (
+    pd.offsets.MonthBegin, pd.offsets.MonthEnd,
+    pd.offsets.QuarterBegin, pd.offsets.QuarterEnd,
+    pd.offsets.YearBegin, pd.offsets.YearEnd,
+)
+
+
+def _aggregate(level: pd.DataFrame | None, raw: pd.DataFrame | None, freq: str) -> pd.DataFrame:
+    """
+    One pyramid level with (stat, column) columns, built either from raw rows or by
+    re-aggregating a finer level (sum of sums, min of mins, sum of counts, mean = sum / count).
+    """
+    if raw is not None:
+        resampled = raw.resample(freq)
+        sums, mins, maxs, counts = resampled.sum(), resampled.min(), resampled.max(), resampled.count()
+    else:
+        resampled = level.resample(freq)
+        sums = resampled.sum()["sum"]
+        mins = resampled.min()["min"]
+        maxs = resampled.max()["max"]
+        counts = resampled.sum()["count"]
+    means = sums / counts.where(counts > 0)
+    return pd.concat({"sum": sums, "mean": means, "min": mins, "max": maxs, "count": counts}, axis=1)
+
+
+def compute_rollups(df: pd.DataFrame, levels: dict[str, str] = ROLLUP_LEVELS) -> dict[str, pd.DataFrame]:
+    """
+    Sum/mean/min/max/count tables for every level, each derived from the previous one,
+    so only the finest level touches the full-resolution data.
+    """
+    numeric = df.select_dtypes(include="number")
+    rollups = {}
+    previous = None
+    for name, freq in levels.items():
+        rollups[name] = _aggregate(previous, numeric if previous is None else None, freq)
+        previous = rollups[name]
+    return rollups
+
+
+def _rollup_path(fp: str | Path, reader: Callable, **reader_kwargs) -> Path:
+    return ROLLUP_DIR / cache_path(fp, reader, **reader_kwargs).stem
+
+
+def _load_frame(fp: str | Path, reader: Callable, time_col: str | None, **reader_kwargs) -> pd.DataFrame:
+    df = read_cached(fp, reader, **reader_kwargs)
+    return df.set_index(time_col) if time_col is not None else df
+
+
+def _level_start(ts: pd.Timestamp, level: str) -> pd.Timestamp:
+    """
+    Start of the `level` period containing `ts`.
+    """
+    if level == "hourly":
+        return ts.floor("h")
+    if level == "daily":
+        return ts.normalize()
+    return ts.normalize().replace(day=1)
+
+
+def _raw_window(
+    fp: str | Path,
+    reader: Callable,
+    time_col: str | None,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    columns: list[str] | None,
+    **reader_kwargs,
+) -> pd.DataFrame:
+    """
+    Numeric rows of `reader(fp)` with start <= time <= end, read through the time-window
+    pushdown of the cache where the reader indexes by time.
+    """
+    if time_col is None and cache_enabled():
+        df = read_cached_window(fp, reader, start=start, end=end, columns=columns, **reader_kwargs)
+    else:
+        df = _load_frame(fp, reader, time_col, **reader_kwargs).loc[start:end]
+        df = df[columns] if columns is not None else df
+    return df.select_dtypes(include="number")
+
+
+def _recompute_edges(
+    table: pd.DataFrame,
+    level: str,
+    start: pd.Timestamp | None,
+    end: pd.Timestamp | None,
+    raw: Callable[[pd.Timestamp, pd.Timestamp], pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Replace the level periods cut by `start` or `end` with statistics of only their rows
+    inside the window, computed from `raw(lo, hi)`.
+    """
+    step = _LEVEL_STEPS[level]
+    edges = set()
+    if start is not None and _level_start(start, level) < start:
+        edges.add(_level_start(start, level))
+    if end is not None:
+        last = _level_start(end, level)
+        if end < last + step - pd.Timedelta(1, "ns"):
+            edges.add(last)
+    for period in sorted(edges):
+        lo = period if start is None else max(period, start)
+        hi = period + step - pd.Timedelta(1, "ns")
+        hi = hi if end is None else min(hi, end)
+        part = compute_rollups(raw(lo, hi), {level: ROLLUP_LEVELS[level]})[level]
+        table = pd.concat([table.drop(period, errors="ignore"), part.reindex(columns=table.columns)]).sort_index()
+    return table
+
+
+def build_rollups(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    time_col: str | None = None,
+    refresh: bool = False,
+    **reader_kwargs,
+) -> Path:
+    """
+    Materialize the rollup pyramid of `reader(fp)` under the cache directory once per
+    source version. `time_col` names the timestamp column if the reader does not index by time.
+    """
+    path = _rollup_path(fp, reader, **reader_kwargs)
+    if path.exists() and not refresh:
+        return path
+
+    return write_rollups(path, compute_rollups(_load_frame(fp, reader, time_col, **reader_kwargs)))
+
+
+def write_rollups(path: Path, rollups: dict[str, pd.DataFrame]) -> Path:
+    """
+    Atomically replace the pyramid at `path` and drop pyramids of older source versions.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.mkdir(parents=True, exist_ok=True)
+    for name, table in rollups.items():
+        table.to_parquet(tmp / f"{name}.parquet", engine="pyarrow")
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+    # Drop pyramids built from older versions of the same source
+    slot_prefix = path.name.rsplit("-", 1)[0]
+    for old in path.parent.glob(f"{slot_prefix}-*"):
+        if old != path:
+            shutil.rmtree(old, ignore_errors=True)
+    return path
+
+
+def pick_level(resolution: str) -> str:
+    """
+    Coarsest pyramid level from which `resolution` can be answered exactly.
+    Month, quarter and year offsets of any multiple ("MS", "3MS", "QS", "YS") use the
+    monthly level; weeks the daily level; fixed steps ("h", "D", "6h") the coarsest
+    level they are a multiple of.
+    """
+    try:
+        offset = pd.tseries.frequencies.to_offset(resolution)
+    except ValueError:
+        raise ValueError(f"Unsupported resolution '{resolution}'.") from None
+    if isinstance(offset, _CALENDAR_OFFSETS):
+        return "monthly"
+    if isinstance(offset, pd.offsets.Week):
+        return "daily"
+    # Day is a calendar offset rather than a Tick in recent pandas
+    if isinstance(offset, pd.offsets.Day):
+        step = pd.Timedelta(days=offset.n)
+    elif isinstance(offset, pd.offsets.Tick):
+        step = pd.Timedelta(offset)
+    else:
+        raise ValueError(f"Unsupported resolution '{resolution}'.")
+
+    for name in ("daily", "hourly"):
+        level_step = pd.Timedelta(ROLLUP_LEVELS[name])
+        if step >= level_step and step % level_step == pd.Timedelta(0):
+            return name
+    raise ValueError(f"Resolution '{resolution}' is finer than the hourly rollup; query the raw data instead.")
+
+
+def query_rollup(
+    fp: str | Path,
+    reader: Callable[..., pd.DataFrame],
+    resolution: str = "1D",
+    stat: str = "mean",
+    columns: list[str] | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    time_col: str | None = None,
+    **reader_kwargs,
+) -> pd.DataFrame:
+    """
+    Aggregated values of `reader(fp)` at `resolution` (e.g. "1D", "6h", "W", "MS"), read from
+    the coarsest rollup level that can answer it and re-aggregated when coarser.
+
+    Only rows with start <= time <= end are aggregated, as when resampling the windowed raw
+    data: periods cut by the window cover just their rows inside it. The level periods at
+    the cuts are recomputed from raw rows, read through the cache's time-window pushdown
+    where the reader indexes by time.
+    """
+    if stat not in ROLLUP_STATS:
+        raise ValueError(f"stat must be one of {ROLLUP_STATS}")
+    level = pick_level(resolution)
+
+    if cache_enabled():
+        table = pd.read_parquet(build_rollups(fp, reader, time_col, **reader_kwargs) / f"{level}.parquet")
+    else:
+        table = compute_rollups(_load_frame(fp, reader, time_col, **reader_kwargs))[level]
+
+    if columns is not None:
+        table = table.loc[:, table.columns.get_level_values(1).isin(columns)]
+    if start is not None or end is not None:
+        tz = table.index.tz
+        start = _align_tz(start, tz)
+        end = _align_tz(end, tz)
+        table = table.loc[_level_start(start, level) if start is not None else None:end]
+        table = _recompute_edges(
+            table, level, start, end,
+            lambda lo, hi: _raw_window(fp, reader, time_col, lo, hi, columns, **reader_kwargs),
+        )
+
+    if pd.tseries.frequencies.to_offset(resolution) != pd.tseries.frequencies.to_offset(ROLLUP_LEVELS[level]):
+        table = _aggregate(table, None, resolution)
+
+    result = table[stat]
+    return result[columns] if columns is not None else result
+
+
+def _align_tz(ts, tz):
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    if tz is not None and ts.tzinfo is None:
+        return ts.tz_localize(tz)
+    return ts
+
+
+def source_rollup_spec(source: str, fp: str | Path) -> tuple[Callable, str | None, dict]:
+    """
+    (reader, time_col, reader_kwargs) used to build the rollups of a catalog source file.
+    AgenceORE files are rolled up per region from their streaming aggregate.
+    """
+    if source == "OPSD":
+        return _parse_opsd_csv, None, {}
+    if source == "SimBench":
+        return _parse_simbench_csv, "time", {}
+    if source == "Zenodo":
+        return _parse_zenodo_csv, None, {"time_format": "%d.%m.%Y %H:%M:%S"}
+    if source == "ELMAS":
+        return _parse_elmas_csv, None, {}
+    if source == "AgenceORE_Consumption_lt36kVA":
+        return _parse_consumption_by_region, None, {}
+    raise ValueError(f"No rollup definition for source '{source}'.")
+
+
+def build_source_rollups(source: str, pattern: str | None = None, refresh: bool = False) -> list[Path]:
+    """
+    Build the rollup pyramid for every time-series file of a catalog source.
+    """
+    if pattern is None:
+        pattern = "raw/**/*Profile*.csv" if source == "SimBench" else "raw/**/*.csv"
+    paths = []
+    for fp in source_files(source, pattern):
+        reader, time_col, reader_kwargs = source_rollup_spec(source, fp)
+        paths.append(build_rollups(fp, reader, time_col, refresh=refresh, **reader_kwargs))
+    return paths
@@ -0,0 +1,203 @@
+# utils/simbench_injections.py
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .simbench_store import ProfileMatrix, open_profile_store
+
+try:
+    from scipy import sparse
+except ImportError:  # optional; a NumPy segment sum is used instead
+    sparse = None
+
+# Element table -> (profile file, active capacity column, reactive capacity column, sign).
+# Injections are positive for generation and negative for consumption.
+ELEMENT_TABLES = {
+    "Load": ("LoadProfile", "pLoad", "qLoad", -1.0),
+    "RES": ("RESProfile", "pRES", "qRES", 1.0),
+    "PowerPlant": ("PowerPlantProfile", "pPP", "qPP", 1.0),
+    "Storage": ("StorageProfile", "pStor", "qStor", -1.0),
+}
+
+# Timesteps evaluated per chunk by default: one 31-day month at 15 min
+CHUNK_STEPS = 2976
+
+
+def load_elements(grid_dir: str | Path) -> pd.DataFrame:
+    """
+    All profile-driven elements of a SimBench grid with their node, profile file, profile
+    columns for P and Q, and signed p/q capacities. Elements without a profile have NA columns
+    and inject their capacity constantly.
+    """
+    grid_dir = Path(grid_dir)
+    frames = []
+    for kind, (profile_file, p_col, q_col, sign) in ELEMENT_TABLES.items():
+        fp = grid_dir / f"{kind}.csv"
+        if not fp.exists():
+            continue
+        df = pd.read_csv(fp, sep=";")
+        if df.empty:
+            continue
+        profile = df["profile"].astype("string")
+        p_suffix, q_suffix = ("_pload", "_qload") if kind == "Load" else ("", "")
+        frames.append(pd.DataFrame({
+            "kind": kind,
+            "id": df["id"].astype(str),
+            "node": df["node"].astype(str),
+            "profile_file": profile_file,
+            "p_column": profile + p_suffix,
+            "q_column": profile + q_suffix,
+            "p": sign * df[p_col].astype(float),
+            "q": sign * df[q_col].astype(float) if q_col in df.columns else 0.0,
+        }))
+    if not frames:
+        raise ValueError(f"No element tables found in {grid_dir}")
+    return pd.concat(frames, ignore_index=True)
+
+
+class _Term:
+    """
+    Contribution of one profile file to one quantity: the profile columns it uses and the
+    sparse (profile column x node) incidence weighted by element capacity.
+    """
+
+    def __init__(self, matrix: ProfileMatrix, columns: pd.Series, nodes: np.ndarray, weights: np.ndarray, n_nodes: int):
+        used, rows = np.unique(columns.to_numpy(dtype=str), return_inverse=True)
+        self.matrix = matrix
+        self.positions = matrix.positions(list(used))
+        if sparse is not None:
+            self.incidence = sparse.csr_matrix((weights, (rows, nodes)), shape=(len(used), n_nodes))
+        else:
+            # Elements sorted by node, so each node's sum is one contiguous segment
+            order = np.argsort(nodes, kind="stable")
+            self.rows = rows[order]
+            self.weights = weights[order]
+            self.segment_nodes, self.segment_starts = np.unique(nodes[order], return_index=True)
+
+    def add_to(self, out: np.ndarray, lo: int, hi: int):
+        block = np.asarray(self.matrix.values[lo:hi][:, self.positions], dtype=np.float64)
+        if sparse is not None:
+            out += np.asarray(self.incidence.T.dot(block.T)).T
+        else:
+            weighted = block[:, self.rows] * self.weights
+            out[:, self.segment_nodes] += np.add.reduceat(weighted, self.segment_starts, axis=1)
+
+
+class NodalInjectionModel:
+    """
+    Maps the profiles of a SimBench grid onto its nodes. For each quantity the nodal series are
+    (timesteps x profile columns) @ (profile columns x nodes), one sparse product per profile
+    file, plus the constant injection of elements without a profile.
+    """
+
+    def __init__(self, elements: pd.DataFrame, profiles: dict[str, ProfileMatrix], nodes: list[str] | None = None):
+        self.nodes = pd.Index(nodes if nodes is not None else sorted(elements["node"].unique()), name="node")
+        node_idx = self.nodes.get_indexer(elements["node"])
+        if (node_idx < 0).any():
+            missing = elements.loc[node_idx < 0, "node"].unique().tolist()
+            raise KeyError(f"Elements reference unknown nodes: {missing}")
+
+        self.time = None
+        self.terms = {"p": [], "q": []}
+        self.constant = {}
+        for quantity in ("p", "q"):
+            columns = elements[f"{quantity}_column"]
+            static = columns.isna().to_numpy()
+            self.constant[quantity] = np.bincount(
+                node_idx[static], weights=elements[quantity].to_numpy()[static], minlength=len(self.nodes)
+            ).astype(np.float64)
+            for profile_file, group in elements[~static].groupby("profile_file"):
+                matrix = profiles[profile_file]
+                if self.time is None:
+                    self.time = matrix.time
+                elif not matrix.time.equals(self.time):
+                    raise ValueError(f"{profile_file} does not share the grid's time axis.")
+                rows = group.index.to_numpy()
+                self.terms[quantity].append(
+                    _Term(matrix, group[f"{quantity}_column"], node_idx[rows], group[quantity].to_numpy(), len(self.nodes))
+                )
+        if self.time is None:
+            self.time = next(iter(profiles.values())).time
+
+    def __repr__(self) -> str:
+        return f"NodalInjectionModel({len(self.nodes)} nodes, {len(self.time)} steps)"
+
+    def _evaluate(self, quantity: str, lo: int, hi: int) -> np.ndarray:
+        out = np.tile(self.constant[quantity], (hi - lo, 1))
+        for term in self.terms[quantity]:
+            term.add_to(out, lo, hi)
+        return out
+
+    def _rows(self, start, end) -> tuple[int, int]:
+        rows = self.time.slice_indexer(
+            pd.Timestamp(start) if start is not None else None,
+            pd.Timestamp(end) if end is not None else None,
+        )
+        return rows.start or 0, rows.stop if rows.stop is not None else len(self.time)
+
+    def iter_chunks(
+        self,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+        chunk_steps: int = CHUNK_STEPS,
+    ) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Nodal (P, Q) frames (timesteps x nodes) for the inclusive window, `chunk_steps` rows
+        at a time, so only one chunk of profiles and results is in memory.
+        """
+        first, last = self._rows(start, end)
+        for lo in range(first, last, chunk_steps):
+            hi = min(lo + chunk_steps, last)
+            index = self.time[lo:hi]
+            yield (
+                pd.DataFrame(self._evaluate("p", lo, hi), index=index, columns=self.nodes),
+                pd.DataFrame(self._evaluate("q", lo, hi), index=index, columns=self.nodes),
+            )
+
+    def compute(
+        self,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+        chunk_steps: int = CHUNK_STEPS,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Nodal (P, Q) frames for the whole window, evaluated chunk by chunk into
+        preallocated result arrays.
+        """
+        first, last = self._rows(start, end)
+        p = np.empty((last - first, len(self.nodes)))
+        q = np.empty_like(p)
+        for lo in range(first, last, chunk_steps):
+            hi = min(lo + chunk_steps, last)
+            p[lo - first:hi - first] = self._evaluate("p", lo, hi)
+            q[lo - first:hi - first] = self._evaluate("q", lo, hi)
+        index = self.time[first:last]
+        return pd.DataFrame(p, index=index, columns=self.nodes), pd.DataFrame(q, index=index, columns=self.nodes)
+
+
+def build_injection_model(grid_dir: str | Path, store_dir: str | Path | None = None) -> NodalInjectionModel:
+    """
+    Injection model of a SimBench grid over its memory-mapped profile store.
+    All nodes of Node.csv are included, so nodes without elements get zero injection.
+    """
+    grid_dir = Path(grid_dir)
+    elements = load_elements(grid_dir)
+    node_fp = grid_dir / "Node.csv"
+    nodes = pd.read_csv(node_fp, sep=";")["id"].astype(str).tolist() if node_fp.exists() else None
+    return NodalInjectionModel(elements, open_profile_store(grid_dir, store_dir), nodes)
+
+
+def nodal_injections(
+    grid_dir: str | Path,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    chunk_steps: int = CHUNK_STEPS,
+    store_dir: str | Path | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Nodal active and reactive power injections (timesteps x nodes) of a SimBench grid,
+    e.g. nodal_injections("raw/1-complete_data-mixed-all-0-sw", "2016-06-01", "2016-06-07").
+    """
+    return build_injection_model(grid_dir, store_dir).compute(start, end, chunk_steps)
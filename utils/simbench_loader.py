@@ -0,0 +1,57 @@
+# utils/simbench_loader.py
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from .columnar_cache import read_cached
+from .timestamps import parse_timestamps
+
+
+def _parse_simbench_csv(fp: str | Path) -> pd.DataFrame:
+    """
+    Parse a SimBench CSV, normalize 'time' column, and parse European datetime format.
+    """
+    df = pd.read_csv(fp, sep=";")
+    time_col = [col for col in df.columns if col.lower() == "time"]
+    if not time_col:
+        raise ValueError("No 'time' column found.")
+    df.rename(columns={time_col[0]: "time"}, inplace=True)
+    df["time"] = parse_timestamps(df["time"], source="simbench")
+    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+    return df
+
+
+def _read_simbench_csv(fp: str | Path) -> pd.DataFrame:
+    """
+    Read a SimBench CSV through the columnar cache.
+    """
+    return read_cached(fp, _parse_simbench_csv)
+
+
+def _capacity_vector(load_info: pd.DataFrame, columns: list[str], default_capacity: float) -> np.ndarray:
+    """
+    Capacity aligned to profile columns: summed pLoad of the loads using a profile for its
+    '_pload' column, summed qLoad for its '_qload' column. Missing profiles get default_capacity.
+    """
+    grouped = load_info.groupby("profile")
+    capacities = pd.concat({kind: grouped[col].sum() for kind, col in (("pload", "pLoad"), ("qload", "qLoad"))
+                            if col in load_info.columns})
+    keys = pd.MultiIndex.from_tuples([tuple(reversed(c.rsplit("_", 1))) for c in columns])
+    return capacities.reindex(keys).fillna(default_capacity).to_numpy(dtype=np.float64)
+
+
+def _scale_simbench_loadprofile(
+    fp_profile: str | Path,
+    fp_capacity: str,
+    capacity_identity: dict,
+    default_capacity: float,
+) -> pd.DataFrame:
+    """
+    Scale all '_pload' and '_qload' columns with one broadcast multiply.
+    `capacity_identity` is unused here; it keys the cache entry to the capacity file version.
+    """
+    df = _parse_simbench_csv(fp_profile)
+    load_info = pd.read_csv(fp_capacity, sep=";")
+    cols = [c for c in df.columns if c.endswith(("_pload", "_qload"))]
+    df[cols] = df[cols].to_numpy(dtype=np.float64) * _capacity_vector(load_info, cols, default_capacity)
+    return df
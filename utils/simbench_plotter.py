@@ -1,33 +1,27 @@
 # simbench_plotter.py
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import Literal
 
+from .columnar_cache import file_identity, read_cached
+from .downsampling import Method, downsample
+from .memo import memoize
+from .rollups import query_rollup
+from .simbench_loader import _parse_simbench_csv, _read_simbench_csv, _scale_simbench_loadprofile
 
-def _read_simbench_csv(fp: str | Path) -> pd.DataFrame:
-    """
-    Read a SimBench CSV, normalize 'time' column, and parse European datetime format.
-    """
-    df = pd.read_csv(fp, sep=";")
-    time_col = [col for col in df.columns if col.lower() == "time"]
-    if not time_col:
-        raise ValueError("No 'time' column found.")
-    df.rename(columns={time_col[0]: "time"}, inplace=True)
-    df["time"] = pd.to_datetime(df["time"], dayfirst=True)
-    df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-    return df
 
-
-def plot_simbench_total_load_over_time(
+@memoize
+def compute_simbench_total_load(
     fp: str | Path,
     kind: Literal["pload", "qload"] = "pload",
     start_time: str | None = None,
     end_time: str | None = None,
     max_points: int = 500,
-):
+    downsample_method: Method = "minmax",
+) -> pd.DataFrame:
     """
-    Plot the total (summed) load over time for active or reactive load.
+    Total (summed) active or reactive load over time, downsampled for display.
+    Returns a frame with 'time' and 'total' columns.
     """
     df = _read_simbench_csv(fp)
 
@@ -41,10 +35,25 @@ def plot_simbench_total_load_over_time(
         raise ValueError(f"No '{kind}' columns found in file.")
 
     df["total"] = df[cols].sum(axis=1)
+    return downsample(df.set_index("time")["total"], max_points, downsample_method).reset_index()
+
+
+def plot_simbench_total_load_over_time(
+    fp: str | Path,
+    kind: Literal["pload", "qload"] = "pload",
+    start_time: str | None = None,
+    end_time: str | None = None,
+    max_points: int = 500,
+    downsample_method: Method = "minmax",
+    show: bool = True,
+) -> pd.DataFrame | None:
+    """
+    Plot the total (summed) load over time for active or reactive load.
+    Returns the plotted totals when show=False.
+    """
+    import matplotlib.pyplot as plt
 
-    if len(df) > max_points:
-        step = max(1, len(df) // max_points)
-        df = df.iloc[::step]
+    df = compute_simbench_total_load(fp, kind, start_time, end_time, max_points, downsample_method)
 
     plt.figure(figsize=(12, 6))
     plt.plot(df["time"], df["total"], label=f"Total {kind.upper()}", color="tab:blue")
@@ -55,53 +64,75 @@ def plot_simbench_total_load_over_time(
     plt.grid(True)
     plt.tight_layout()
     plt.legend()
-    plt.show()
+    if show:
+        plt.show()
+        return None
+    return df
 
 
 def unnormalize_simbench_loadprofile(
     fp_profile: str | Path,
     fp_capacity: str | Path,
-    output_fp: str | Path = "raw/consumer/LoadProfile_scaled.csv",
+    output_fp: str | Path | None = "raw/consumer/LoadProfile_scaled.csv",
     plot: bool = True,
     default_capacity: float = 1.0
-):
+) -> pd.DataFrame:
     """
-    Unnormalize LoadProfile.csv using pLoad values from Load.csv and save the scaled version.
-    Missing profiles will be scaled with default_capacity silently.
+    Unnormalize LoadProfile.csv using pLoad/qLoad values from Load.csv.
+    Active and reactive columns are scaled by the summed capacity of their profile;
+    missing profiles will be scaled with default_capacity silently.
+    The scaled profiles are written to output_fp (skipped for output_fp=None), kept in the
+    columnar cache and returned.
     Optionally plot the result using the bar chart function.
+    For per-load series of whole grids see simbench_store.scale_simbench_grids.
     """
-    load_info = pd.read_csv(fp_capacity, sep=";")
-    capacity_map = load_info.groupby("profile")["pLoad"].sum().to_dict()
+    df = read_cached(
+        fp_profile,
+        _scale_simbench_loadprofile,
+        fp_capacity=str(Path(fp_capacity).resolve()),
+        capacity_identity=file_identity(fp_capacity),
+        default_capacity=default_capacity,
+    )
+
+    if output_fp is not None:
+        out = df.assign(time=df["time"].dt.strftime("%d.%m.%Y %H:%M"))
+        out.to_csv(output_fp, sep=";", index=False)
 
-    df = pd.read_csv(fp_profile, sep=";")
-    cols = [col for col in df.columns if col.endswith("_pload")]
-
-    for col in cols:
-        profile = col.replace("_pload", "")
-        capacity = capacity_map.get(profile, default_capacity)
-        df[col] = df[col] * capacity
+    if plot:
+        plot_simbench_profile_max_loads_as_bar(df, kind="pload", figsize="auto")
+    return df
 
-    df.to_csv(output_fp, sep=";", index=False)
 
-    if plot:
-        plot_simbench_profile_max_loads_as_bar(output_fp, kind="pload", figsize="auto")
+@memoize
+def compute_simbench_profile_max_loads(
+    fp: str | Path | pd.DataFrame,
+    kind: Literal["pload", "qload"] = "pload",
+) -> pd.Series:
+    """
+    Max load of each individual profile (active/reactive), largest first.
+    `fp` may also be an already loaded frame, e.g. the result of unnormalize_simbench_loadprofile.
+    """
+    df = fp if isinstance(fp, pd.DataFrame) else _read_simbench_csv(fp)
+    cols = [c for c in df.columns if c.endswith(f"_{kind}")]
+    if not cols:
+        raise ValueError(f"No '{kind}' columns found.")
+    return df[cols].max().sort_values(ascending=False)
 
 
 def plot_simbench_profile_max_loads_as_bar(
-    fp: str | Path,
+    fp: str | Path | pd.DataFrame,
     kind: Literal["pload", "qload"] = "pload",
-    figsize: tuple | Literal["auto"] = "auto"
-):
+    figsize: tuple | Literal["auto"] = "auto",
+    show: bool = True,
+) -> pd.Series | None:
     """
     Bar plot of max load for each individual profile (active/reactive).
     Use figsize="auto" to dynamically scale width based on number of profiles.
+    Returns the plotted maxima when show=False.
     """
-    df = _read_simbench_csv(fp)
-    cols = [c for c in df.columns if c.endswith(f"_{kind}")]
-    if not cols:
-        raise ValueError(f"No '{kind}' columns found.")
+    import matplotlib.pyplot as plt
 
-    max_vals = df[cols].max().sort_values(ascending=False)
+    max_vals = compute_simbench_profile_max_loads(fp, kind)
 
     # Auto-size width if specified
     if figsize == "auto":
@@ -124,29 +155,41 @@ def plot_simbench_profile_max_loads_as_bar(
                     ha='center', va='bottom', fontsize=8)
 
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+        return None
+    return max_vals
 
 
-def plot_simbench_res_daily_avg_as_bar(fp: str | Path):
+@memoize
+def compute_simbench_res_daily_avg(fp: str | Path) -> pd.Series:
     """
-    For each RES profile (PV, WP, BM, Hydro...), compute:
-    - Daily average time series
-    - Then take the **yearly mean** of daily averages
-    - Plot the results as a bar chart
+    For each RES profile (PV, WP, BM, Hydro...), the **yearly mean** of its daily averages.
     """
-    df = _read_simbench_csv(fp)
-    df.set_index("time", inplace=True)
+    # Step 1: Daily averages from the precomputed daily rollup
+    df_daily_avg = query_rollup(fp, _parse_simbench_csv, "1D", "mean", time_col="time")
 
     # Get all renewable columns
-    res_cols = [col for col in df.columns if col.startswith(("PV", "WP", "BM", "Hydro"))]
+    res_cols = [col for col in df_daily_avg.columns if col.startswith(("PV", "WP", "BM", "Hydro"))]
     if not res_cols:
         raise ValueError("No RES columns found.")
-
-    # Step 1: Resample to daily averages
-    df_daily_avg = df[res_cols].resample("1D").mean()
+    df_daily_avg = df_daily_avg[res_cols]
 
     # Step 2: Compute yearly average of the daily averages for each profile
-    yearly_avg = df_daily_avg.mean().sort_values(ascending=False)
+    return df_daily_avg.mean().sort_values(ascending=False)
+
+
+def plot_simbench_res_daily_avg_as_bar(fp: str | Path, show: bool = True) -> pd.Series | None:
+    """
+    For each RES profile (PV, WP, BM, Hydro...), compute:
+    - Daily average time series
+    - Then take the **yearly mean** of daily averages
+    - Plot the results as a bar chart
+    Returns the plotted averages when show=False.
+    """
+    import matplotlib.pyplot as plt
+
+    yearly_avg = compute_simbench_res_daily_avg(fp)
 
     # Step 3: Plot
     plt.figure(figsize=(16, 6))
@@ -166,4 +209,7 @@ def plot_simbench_res_daily_avg_as_bar(fp: str | Path):
                     ha='center', va='bottom', fontsize=9)
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    if show:
+        plt.show()
+        return None
+    return yearly_avg
@@ -0,0 +1,281 @@
+# utils/simbench_store.py
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .columnar_cache import CACHE_DIR, file_identity
+from .data_catalog import source_folder
+from .simbench_loader import _parse_simbench_csv
+
+STORE_DIR = CACHE_DIR / "simbench"
+
+# Complete-data grids scaled by scale_simbench_grids, relative to the SimBench folder
+SIMBENCH_GRID_PATTERN = "raw/1-complete_data-mixed-all-*-sw"
+
+# Loads scaled per block; bounds the temporary gathered profile columns
+SCALE_BLOCK_SIZE = 256
+
+# Bump when the on-disk layout changes so old stores are rebuilt
+STORE_VERSION = 1
+
+
+class ProfileMatrix:
+    """
+    Read-only view of one SimBench profile file backed by a memory-mapped float32 matrix.
+    Values are stored column-major, so each column is one contiguous block and only the
+    pages of columns actually touched are loaded. Processes opening the same store share
+    those pages through the OS page cache.
+    """
+
+    def __init__(self, name: str, columns: list[str], time: pd.DatetimeIndex, values: np.memmap):
+        self.name = name
+        self.columns = columns
+        self.time = time
+        self.values = values
+        self._positions = {c: i for i, c in enumerate(columns)}
+
+    def __repr__(self) -> str:
+        return f"ProfileMatrix({self.name!r}, {len(self.time)} steps x {len(self.columns)} columns)"
+
+    def positions(self, columns: list[str]) -> list[int]:
+        missing = [c for c in columns if c not in self._positions]
+        if missing:
+            raise KeyError(f"Columns not in {self.name}: {missing}")
+        return [self._positions[c] for c in columns]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Zero-copy view of a single column.
+        """
+        return self.values[:, self.positions([name])[0]]
+
+    def to_frame(
+        self,
+        columns: list[str] | None = None,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        Materialize the requested columns and inclusive time window as a DataFrame.
+        """
+        columns = self.columns if columns is None else columns
+        rows = self.time.slice_indexer(
+            pd.Timestamp(start) if start is not None else None,
+            pd.Timestamp(end) if end is not None else None,
+        )
+        data = self.values[rows][:, self.positions(columns)]
+        return pd.DataFrame(data, index=self.time[rows], columns=columns)
+
+
+def _store_path(grid_dir: Path, store_dir: Path) -> Path:
+    key = hashlib.sha1(str(grid_dir.resolve()).encode()).hexdigest()[:8]
+    return store_dir / f"{grid_dir.resolve().name}-{key}"
+
+
+def _profile_files(grid_dir: Path) -> list[Path]:
+    return sorted(grid_dir.glob("*Profile*.csv"))
+
+
+def _is_fresh(path: Path, grid_dir: Path) -> bool:
+    manifest_fp = path / "manifest.json"
+    if not manifest_fp.exists():
+        return False
+    manifest = json.loads(manifest_fp.read_text())
+    if manifest.get("version") != STORE_VERSION:
+        return False
+    sources = {fp.stem: file_identity(fp) for fp in _profile_files(grid_dir)}
+    stored = {name: entry["source"] for name, entry in manifest["profiles"].items()}
+    return sources == stored
+
+
+def write_profile_matrix(
+    path: Path,
+    name: str,
+    df: pd.DataFrame,
+    shared_time: np.ndarray | None,
+) -> dict:
+    """
+    Write the numeric columns of a time-indexed frame as a column-major float32 matrix.
+    The time axis is written separately only when it differs from `shared_time`.
+    Returns the manifest entry describing the matrix.
+    """
+    values = df.to_numpy(dtype=np.float32)
+    # Transposed C-order bytes are the column-major layout of `values`
+    values.T.tofile(path / f"{name}.f32")
+
+    time = df.index.to_numpy(dtype="datetime64[ns]")
+    entry = {"columns": list(df.columns), "shape": list(values.shape), "time": "time.npy"}
+    if shared_time is None or not np.array_equal(time, shared_time):
+        entry["time"] = f"{name}.time.npy"
+        np.save(path / entry["time"], time)
+    return entry
+
+
+def build_profile_store(
+    grid_dir: str | Path,
+    store_dir: str | Path | None = None,
+    refresh: bool = False,
+) -> Path:
+    """
+    Convert every *Profile*.csv of a SimBench grid folder into a memory-mappable store.
+
+    The store holds one float32 matrix per profile file, a single shared time axis
+    (profiles with a different axis keep their own) and a manifest with the column
+    names and source file identities. Rebuilds only when a source file changed.
+    """
+    grid_dir = Path(grid_dir)
+    path = _store_path(grid_dir, Path(store_dir) if store_dir is not None else STORE_DIR)
+    if not refresh and _is_fresh(path, grid_dir):
+        return path
+
+    files = _profile_files(grid_dir)
+    if not files:
+        raise ValueError(f"No profile CSVs found in {grid_dir}")
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    shared_time = None
+    profiles = {}
+    for fp in files:
+        df = _parse_simbench_csv(fp).set_index("time")
+        if shared_time is None:
+            shared_time = df.index.to_numpy(dtype="datetime64[ns]")
+            np.save(tmp / "time.npy", shared_time)
+        entry = write_profile_matrix(tmp, fp.stem, df, shared_time)
+        entry["source"] = file_identity(fp)
+        profiles[fp.stem] = entry
+
+    manifest = {"version": STORE_VERSION, "grid": str(grid_dir.resolve()), "profiles": profiles}
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=1))
+
+    shutil.rmtree(path, ignore_errors=True)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # Another process finished the same build first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return path
+
+
+def open_store_path(path: str | Path) -> dict[str, ProfileMatrix]:
+    """
+    Open every profile matrix of an existing store directory without copying data.
+    """
+    path = Path(path)
+    manifest = json.loads((path / "manifest.json").read_text())
+    times = {}
+    profiles = {}
+    for name, entry in manifest["profiles"].items():
+        if entry["time"] not in times:
+            raw = np.load(path / entry["time"], mmap_mode="r")
+            times[entry["time"]] = pd.DatetimeIndex(raw)
+        values = np.memmap(path / f"{name}.f32", dtype=np.float32, mode="r",
+                           shape=tuple(entry["shape"]), order="F")
+        profiles[name] = ProfileMatrix(name, entry["columns"], times[entry["time"]], values)
+    return profiles
+
+
+def open_profile_store(
+    grid_dir: str | Path,
+    store_dir: str | Path | None = None,
+) -> dict[str, ProfileMatrix]:
+    """
+    Open all profiles of a SimBench grid as memory-mapped matrices, keyed by file stem
+    (e.g. "LoadProfile", "RESProfile"). Builds the store first if it is missing or stale.
+    """
+    return open_store_path(build_profile_store(grid_dir, store_dir))
+
+
+def _scaled_sources(grid_dir: Path) -> dict:
+    return {name: file_identity(grid_dir / f"{name}.csv") for name in ("Load", "LoadProfile")}
+
+
+def build_scaled_load_store(
+    grid_dir: str | Path,
+    store_dir: str | Path | None = None,
+    refresh: bool = False,
+    block_size: int = SCALE_BLOCK_SIZE,
+) -> Path:
+    """
+    Write the per-load active and reactive power of a grid as a memory-mappable store.
+
+    Every row of Load.csv gets its own '{id}_pload' and '{id}_qload' column: the normalized
+    profile it references times its own pLoad/qLoad. Profile columns are gathered from the
+    memory-mapped LoadProfile matrix and scaled in blocks of `block_size` loads straight
+    into the output matrix. Rebuilds only when Load.csv or LoadProfile.csv changed.
+    """
+    grid_dir = Path(grid_dir)
+    store_dir = Path(store_dir) if store_dir is not None else STORE_DIR
+    base = _store_path(grid_dir, store_dir)
+    path = base.with_name(f"{base.name}-scaled")
+    sources = _scaled_sources(grid_dir)
+    manifest_fp = path / "manifest.json"
+    if not refresh and manifest_fp.exists():
+        manifest = json.loads(manifest_fp.read_text())
+        if manifest.get("version") == STORE_VERSION and manifest.get("sources") == sources:
+            return path
+
+    profile = open_profile_store(grid_dir, store_dir)["LoadProfile"]
+    loads = pd.read_csv(grid_dir / "Load.csv", sep=";")
+    ids = loads["id"].astype(str)
+    columns = [f"{i}_pload" for i in ids] + [f"{i}_qload" for i in ids]
+    positions = np.asarray(
+        profile.positions([f"{p}_pload" for p in loads["profile"]])
+        + profile.positions([f"{p}_qload" for p in loads["profile"]])
+    )
+    capacities = np.concatenate([loads["pLoad"], loads["qLoad"]]).astype(np.float32)
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    shape = (len(profile.time), len(columns))
+    out = np.memmap(tmp / "LoadScaled.f32", dtype=np.float32, mode="w+", shape=shape, order="F")
+    for lo in range(0, len(columns), block_size):
+        hi = lo + block_size
+        out[:, lo:hi] = profile.values[:, positions[lo:hi]] * capacities[lo:hi]
+    out.flush()
+    del out
+
+    np.save(tmp / "time.npy", profile.time.to_numpy(dtype="datetime64[ns]"))
+    manifest = {
+        "version": STORE_VERSION,
+        "grid": str(grid_dir.resolve()),
+        "sources": sources,
+        "profiles": {"LoadScaled": {"columns": columns, "shape": list(shape), "time": "time.npy"}},
+    }
+    (tmp / "manifest.json").write_text(json.dumps(manifest, indent=1))
+
+    shutil.rmtree(path, ignore_errors=True)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return path
+
+
+def scale_simbench_grids(
+    grid_dirs: list[str | Path] | None = None,
+    store_dir: str | Path | None = None,
+    refresh: bool = False,
+) -> dict[str, ProfileMatrix]:
+    """
+    Per-load P/Q time series for several grids (by default all
+    1-complete_data-mixed-all-{0,1,2}-sw grids), keyed by grid folder name.
+
+    Results are memory-mapped from the binary store, so they can be passed straight on:
+    plot_simbench_profile_max_loads_as_bar(scaled[grid].to_frame()).
+    """
+    if grid_dirs is None:
+        grid_dirs = sorted(source_folder("SimBench").glob(SIMBENCH_GRID_PATTERN))
+    return {
+        Path(grid_dir).name: open_store_path(build_scaled_load_store(grid_dir, store_dir, refresh))["LoadScaled"]
+        for grid_dir in grid_dirs
+    }
@@ -0,0 +1,146 @@
+# utils/timestamps.py
+import numpy as np
+import pandas as pd
+
+# Formats seen across the sources, tried in order on a sample:
+# SimBench "01.01.2016 00:00", Zenodo "01.01.2016 00:00:00",
+# OPSD/AgenceORE/ELMAS/Ember ISO 8601 (with or without offset, date-only for Ember)
+CANDIDATE_FORMATS = (
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "ISO8601",
+)
+
+# Day-first fixed-width layouts handled by the vectorized parser: format -> string width
+_FIXED_WIDTH_FORMATS = {
+    "%d.%m.%Y %H:%M": 16,
+    "%d.%m.%Y %H:%M:%S": 19,
+}
+
+# Detected format per source key, filled on first parse
+_DETECTED_FORMATS: dict[str, str] = {}
+
+
+def detect_format(values: pd.Series, sample_size: int = 100) -> str:
+    """
+    First candidate format that parses a sample of non-null values without error.
+    """
+    sample = values.dropna().astype(str).str.strip()
+    sample = pd.concat([sample.head(sample_size), sample.tail(sample_size)])
+    if sample.empty:
+        raise ValueError("Cannot detect a timestamp format from an empty column.")
+    for fmt in CANDIDATE_FORMATS:
+        try:
+            pd.to_datetime(sample, format=fmt, utc=True)
+        except (ValueError, TypeError):
+            continue
+        return fmt
+    raise ValueError(f"No known timestamp format matches values like {sample.iloc[0]!r}.")
+
+
+def _parse_fixed_width_dmy(values: np.ndarray, fmt: str) -> np.ndarray:
+    """
+    Parse 'dd.mm.yyyy HH:MM[:SS]' strings with NumPy digit arithmetic.
+    Raises ValueError if any value does not have the exact layout and width.
+    """
+    width = _FIXED_WIDTH_FORMATS[fmt]
+    # One spare byte: a longer value (e.g. seconds under '%H:%M') leaves it non-NUL
+    # instead of being silently truncated; shorter values leave NULs in digit positions
+    raw = np.asarray(values, dtype=f"S{width + 1}")
+    chars = raw.view(np.uint8).reshape(len(raw), width + 1)
+    if np.any(chars[:, width]):
+        raise ValueError(f"Values are longer than {fmt!r}.")
+    chars = chars[:, :width]
+
+    separators = {2: b".", 5: b".", 10: b" ", 13: b":"}
+    if width == 19:
+        separators[16] = b":"
+    for pos, sep in separators.items():
+        if not np.all(chars[:, pos] == ord(sep)):
+            raise ValueError(f"Values do not match {fmt!r}.")
+
+    digits = chars.astype(np.int64) - ord("0")
+    digit_pos = [i for i in range(width) if i not in separators]
+    if np.any((digits[:, digit_pos] < 0) | (digits[:, digit_pos] > 9)):
+        raise ValueError(f"Values do not match {fmt!r}.")
+
+    def field(i: int, n: int) -> np.ndarray:
+        out = np.zeros(len(digits), dtype=np.int64)
+        for k in range(n):
+            out = out * 10 + digits[:, i + k]
+        return out
+
+    day, month, year = field(0, 2), field(3, 2), field(6, 4)
+    hour, minute = field(11, 2), field(14, 2)
+    second = field(17, 2) if width == 19 else 0
+
+    if np.any((month < 1) | (month > 12) | (day < 1) | (hour > 23) | (minute > 59) | (np.asarray(second) > 59)):
+        raise ValueError(f"Out-of-range date fields for {fmt!r}.")
+
+    months = ((year - 1970) * 12 + (month - 1)).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + (day - 1)
+    if np.any(days >= (months + 1).astype("datetime64[D]")):
+        raise ValueError(f"Day out of range for month in {fmt!r}.")
+
+    seconds = hour * 3600 + minute * 60 + second
+    return days.astype("datetime64[ns]") + seconds.astype("timedelta64[s]")
+
+
+def parse_with_format(values: pd.Series, fmt: str, utc: bool = False) -> pd.DatetimeIndex:
+    """
+    Parse a whole column with a fixed format, using the vectorized parser where possible.
+    """
+    if fmt in _FIXED_WIDTH_FORMATS:
+        stripped = values.astype(str).str.strip()
+        try:
+            parsed = pd.DatetimeIndex(_parse_fixed_width_dmy(stripped.to_numpy(), fmt))
+            return parsed.tz_localize("UTC") if utc else parsed
+        except ValueError:
+            pass
+    return pd.DatetimeIndex(pd.to_datetime(values, format=fmt, utc=utc))
+
+
+def parse_timestamps(
+    values: pd.Series | pd.Index,
+    source: str | None = None,
+    fmt: str | None = None,
+    utc: bool = False,
+) -> pd.Series | pd.DatetimeIndex:
+    """
+    Parse a timestamp column with an explicit format instead of per-element inference.
+
+    Parameters:
+        values: Raw timestamp strings.
+        source: Key under which the detected format is cached (e.g. "opsd", "simbench"),
+            so only the first file of a source pays for detection.
+        fmt: Known format; skips detection.
+        utc: Return UTC-aware timestamps (offsets are converted, naive values localized).
+
+    Returns a Series aligned with `values` for Series input, else a DatetimeIndex.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if fmt is not None:
+        parsed = parse_with_format(series, fmt, utc=utc)
+    elif source in _DETECTED_FORMATS:
+        try:
+            parsed = parse_with_format(series, _DETECTED_FORMATS[source], utc=utc)
+        except (ValueError, TypeError):
+            # The cached format no longer fits (e.g. a source changed layout); detect again
+            del _DETECTED_FORMATS[source]
+            return parse_timestamps(values, source=source, utc=utc)
+    else:
+        detected = detect_format(series)
+        if source is not None:
+            _DETECTED_FORMATS[source] = detected
+        parsed = parse_with_format(series, detected, utc=utc)
+
+    if isinstance(values, pd.Series):
+        return pd.Series(parsed, index=values.index, name=values.name)
+    return parsed
+
+
+def detected_formats() -> dict[str, str]:
+    """
+    Formats detected so far, per source key.
+    """
+    return dict(_DETECTED_FORMATS)
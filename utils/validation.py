@@ -0,0 +1,303 @@
+# utils/validation.py
+import json
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+# Number of gap intervals listed individually in a report
+MAX_LISTED_GAPS = 100
+
+
+class _ProfileAccumulator:
+    """
+    Running per-column statistics and collected timestamps over a stream of chunks.
+    Every chunk is visited once; the report is assembled from the accumulated state.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.dtypes = {}
+        self.nulls = {}
+        self.count = {}
+        self.total = {}
+        self.minimum = {}
+        self.maximum = {}
+        self.times = []
+        self.keys = []
+        self.monotonic = True
+        self.last_time = None
+
+    def update(self, chunk: pd.DataFrame, time_values: np.ndarray | None, key_hashes: np.ndarray | None):
+        self.rows += len(chunk)
+
+        numeric = chunk.select_dtypes(include="number")
+        other = chunk.drop(columns=numeric.columns)
+        if len(numeric.columns):
+            arr = numeric.to_numpy(dtype=np.float64)
+            nan = np.isnan(arr)
+            nulls = nan.sum(axis=0)
+            chunk_stats = zip(
+                numeric.columns,
+                nulls,
+                len(arr) - nulls,
+                np.where(nan, 0.0, arr).sum(axis=0),
+                np.fmin.reduce(arr, axis=0) if len(arr) else np.full(arr.shape[1], np.nan),
+                np.fmax.reduce(arr, axis=0) if len(arr) else np.full(arr.shape[1], np.nan),
+            )
+            for col, n_null, n, s, lo, hi in chunk_stats:
+                self._add(col, str(numeric[col].dtype), n_null)
+                self.count[col] = self.count.get(col, 0) + int(n)
+                self.total[col] = self.total.get(col, 0.0) + float(s)
+                self.minimum[col] = float(np.fmin(self.minimum.get(col, np.nan), lo))
+                self.maximum[col] = float(np.fmax(self.maximum.get(col, np.nan), hi))
+        for col, n_null in other.isna().sum().items():
+            self._add(col, str(other[col].dtype), n_null)
+
+        if time_values is not None and len(time_values):
+            if self.last_time is not None and time_values[0] < self.last_time:
+                self.monotonic = False
+            if self.monotonic and np.any(np.diff(time_values) < 0):
+                self.monotonic = False
+            self.last_time = time_values[-1]
+            self.times.append(time_values)
+        if key_hashes is not None:
+            self.keys.append(key_hashes)
+
+    def _add(self, col: str, dtype: str, n_null):
+        self.dtypes.setdefault(col, dtype)
+        self.nulls[col] = self.nulls.get(col, 0) + int(n_null)
+
+    def column_report(self) -> dict:
+        report = {}
+        for col, dtype in self.dtypes.items():
+            entry = {
+                "dtype": dtype,
+                "nulls": self.nulls[col],
+                "null_fraction": self.nulls[col] / self.rows if self.rows else 0.0,
+            }
+            if col in self.count:
+                n = self.count[col]
+                entry.update({
+                    "min": _json_float(self.minimum[col]),
+                    "max": _json_float(self.maximum[col]),
+                    "mean": self.total[col] / n if n else None,
+                })
+            report[col] = entry
+        return report
+
+
+def _json_float(value: float) -> float | None:
+    return None if np.isnan(value) else value
+
+
+def _to_utc_ns(values: pd.Series | pd.DatetimeIndex) -> tuple[np.ndarray, bool]:
+    """
+    Timestamps as int64 nanoseconds (UTC for aware values) and whether they were tz-aware.
+    """
+    index = pd.DatetimeIndex(values)
+    aware = index.tz is not None
+    if aware:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8, aware
+
+
+def _dst_windows(start: pd.Timestamp, end: pd.Timestamp, local_tz: str) -> list[tuple[pd.Timestamp, str]]:
+    """
+    Local wall-clock times at which the UTC offset of `local_tz` changes within [start, end].
+    """
+    hours = pd.date_range(start.floor("D") - pd.Timedelta(days=1), end.ceil("D") + pd.Timedelta(days=1),
+                          freq="h", tz="UTC")
+    offsets = (hours.tz_convert(local_tz).tz_localize(None) - hours.tz_localize(None)).to_numpy()
+    changes = np.nonzero(offsets[1:] != offsets[:-1])[0] + 1
+    windows = []
+    for i in changes:
+        kind = "spring_forward" if offsets[i] > offsets[i - 1] else "fall_back"
+        local = (hours[i] + offsets[i - 1]).tz_localize(None)
+        windows.append((local, kind))
+    return windows
+
+
+def _time_report(
+    times: np.ndarray,
+    monotonic: bool,
+    freq: str | None,
+    aware: bool,
+    local_tz: str | None,
+    key_hashes: np.ndarray | None,
+) -> dict:
+    if not len(times):
+        return {"unique_timestamps": 0}
+
+    unique = np.unique(times)
+    if key_hashes is not None:
+        duplicates = int(len(key_hashes) - len(np.unique(key_hashes)))
+    else:
+        duplicates = int(len(times) - len(unique))
+
+    diffs = np.diff(unique)
+    if freq is not None:
+        step = pd.Timedelta(freq).value
+    elif len(diffs):
+        values, counts = np.unique(diffs, return_counts=True)
+        step = int(values[np.argmax(counts)])
+    else:
+        step = None
+
+    report = {
+        "start": str(pd.Timestamp(unique[0], tz="UTC" if aware else None)),
+        "end": str(pd.Timestamp(unique[-1], tz="UTC" if aware else None)),
+        "monotonic": monotonic,
+        "unique_timestamps": int(len(unique)),
+        "duplicates": duplicates,
+    }
+    if step is None:
+        return report
+
+    on_grid = (unique - unique[0]) % step == 0
+    expected = int((unique[-1] - unique[0]) // step) + 1
+    gap_pos = np.nonzero(diffs > step)[0]
+    gaps = [
+        {
+            "after": str(pd.Timestamp(unique[i], tz="UTC" if aware else None)),
+            "before": str(pd.Timestamp(unique[i + 1], tz="UTC" if aware else None)),
+            "missing_steps": int(diffs[i] // step) - 1,
+        }
+        for i in gap_pos
+    ]
+    report.update({
+        "freq": str(pd.Timedelta(step)),
+        "expected_steps": expected,
+        "missing_steps": expected - int(on_grid.sum()),
+        "off_grid": int((~on_grid).sum()),
+        "gap_count": len(gaps),
+        "gaps": gaps[:MAX_LISTED_GAPS],
+    })
+
+    # Naive local timestamps: gaps/duplicates around clock changes are DST artefacts
+    if local_tz is not None and not aware:
+        dst = []
+        dup_times = unique[np.nonzero(np.bincount(np.searchsorted(unique, times), minlength=len(unique)) > 1)[0]]
+        for local, kind in _dst_windows(pd.Timestamp(unique[0]), pd.Timestamp(unique[-1]), local_tz):
+            lo = (local - pd.Timedelta(hours=2)).value
+            hi = (local + pd.Timedelta(hours=2)).value
+            n_gap = sum(g["missing_steps"] for g, i in zip(gaps, gap_pos) if lo <= unique[i] <= hi)
+            n_dup = int(((dup_times >= lo) & (dup_times <= hi)).sum())
+            if n_gap or n_dup:
+                dst.append({"transition": str(local), "kind": kind, "missing_steps": n_gap, "duplicate_steps": n_dup})
+        report["dst_anomalies"] = dst
+    return report
+
+
+def profile_dataset(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    time_col: str | None = None,
+    freq: str | None = None,
+    key_cols: list[str] | None = None,
+    local_tz: str | None = None,
+) -> dict:
+    """
+    Data-quality profile of a DataFrame or a stream of chunks, computed in one pass.
+
+    Reports row count, per-column dtype, null counts/fraction and min/max/mean, and for the
+    time axis: monotonicity, duplicates, expected vs actual steps, gap intervals, off-grid
+    stamps and, for naive local timestamps with `local_tz` set, DST anomalies.
+
+    Parameters:
+        data: A frame or an iterable of frames with the same columns.
+        time_col: Timestamp column; defaults to the index when it is a DatetimeIndex.
+        freq: Expected spacing (e.g. "15min"); inferred from the most common step if omitted.
+        key_cols: For long-format data, duplicates are counted on (time, *key_cols).
+        local_tz: Timezone of naive timestamps, e.g. "Europe/Berlin" for SimBench.
+    """
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    acc = _ProfileAccumulator()
+    aware = False
+    has_time = False
+
+    for chunk in chunks:
+        if time_col is not None:
+            stamps, aware = _to_utc_ns(chunk[time_col])
+            values = chunk.drop(columns=[time_col])
+        elif isinstance(chunk.index, pd.DatetimeIndex):
+            stamps, aware = _to_utc_ns(chunk.index)
+            values = chunk
+        else:
+            stamps, values = None, chunk
+        has_time = has_time or stamps is not None
+
+        key_hashes = None
+        if key_cols and stamps is not None:
+            keyed = chunk[key_cols].assign(__time=stamps)
+            key_hashes = pd.util.hash_pandas_object(keyed, index=False).to_numpy()
+        acc.update(values, stamps, key_hashes)
+
+    report = {"rows": acc.rows, "columns": acc.column_report()}
+    if has_time:
+        times = np.concatenate(acc.times) if acc.times else np.array([], dtype=np.int64)
+        key_hashes = np.concatenate(acc.keys) if acc.keys else None
+        report["time"] = _time_report(times, acc.monotonic, freq, aware, local_tz, key_hashes)
+    return report
+
+
+def profile_csv(
+    fp: str | Path,
+    time_col: str | None = None,
+    sep: str = ",",
+    chunksize: int = 200_000,
+    time_format: str | None = None,
+    dayfirst: bool = False,
+    utc: bool = False,
+    **profile_kwargs,
+) -> dict:
+    """
+    Profile a CSV by streaming it in chunks, so each file is read exactly once.
+    """
+    def chunks():
+        for chunk in pd.read_csv(fp, sep=sep, chunksize=chunksize):
+            chunk = chunk.loc[:, ~chunk.columns.str.contains("^Unnamed")]
+            if time_col is not None:
+                parsed = pd.to_datetime(chunk[time_col], format=time_format, dayfirst=dayfirst, utc=utc)
+                chunk = chunk.assign(**{time_col: parsed})
+            yield chunk
+
+    report = profile_dataset(chunks(), time_col=time_col, **profile_kwargs)
+    report["file"] = str(fp)
+    return report
+
+
+def _profile_file(fp: str | Path, reader: Callable[[str | Path], pd.DataFrame], **profile_kwargs) -> dict:
+    report = profile_dataset(reader(fp), **profile_kwargs)
+    report["file"] = str(fp)
+    return report
+
+
+def profile_source(
+    source: str,
+    pattern: str = "raw/**/*.csv",
+    max_workers: int | None = None,
+    **profile_kwargs,
+) -> list[dict]:
+    """
+    Profile every file of a catalog source in parallel, one read per file.
+    Files that fail to load get a report with an "error" entry instead.
+    """
+    from .ingestion import default_reader, read_files
+    from .data_catalog import source_files
+
+    files = source_files(source, pattern)
+    readers = [partial(_profile_file, reader=default_reader(source, fp), **profile_kwargs) for fp in files]
+    results = read_files(files, readers, max_workers=max_workers, return_exceptions=True)
+    return [
+        {"file": str(fp), "error": repr(result)} if isinstance(result, Exception) else result
+        for fp, result in zip(files, results)
+    ]
+
+
+def write_report(report: dict | list[dict], fp: str | Path):
+    """
+    Save a profile report (or a list of them) as JSON.
+    """
+    Path(fp).write_text(json.dumps(report, indent=2, default=str))
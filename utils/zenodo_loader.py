@@ -0,0 +1,52 @@
+# utils/zenodo_loader.py
+import pandas as pd
+
+from .columnar_cache import read_cached
+from .timestamps import parse_timestamps
+
+
+def _parse_zenodo_csv(fp, time_format):
+    """
+    Internal helper to parse a Zenodo dataset file into a timestamp-indexed frame.
+
+    Parameters:
+        fp (str): Path to CSV file (2016 or 2017 dataset).
+        time_format (str): Explicit datetime format used in the file.
+    """
+
+    # Read just the header to detect timestamp column
+    with open(fp, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+    columns = first_line.strip().split(';')
+    time_col = next((col for col in columns if 'time' in col.lower()), None)
+
+    if time_col is None:
+        raise ValueError("Timestamp column not found. Expected something like 'Time stamp'.")
+
+    # Load CSV
+    df = pd.read_csv(fp, sep=';', encoding='utf-8')
+    df.rename(columns={time_col: 'timestamp'}, inplace=True)
+
+    # Parse timestamp with the fixed-width fast path; fall back to cleaning stray characters
+    try:
+        df['timestamp'] = parse_timestamps(df['timestamp'], fmt=time_format)
+    except ValueError:
+        df['timestamp'] = (
+            df['timestamp']
+            .astype(str)
+            .str.strip()
+            .str.extract(r'([\d]{2}\.[\d]{2}\.[\d]{4} [\d]{2}:[\d]{2}:[\d]{2})')[0]
+        )
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format=time_format, errors='raise')
+
+    # Set and sort index
+    df = df.set_index('timestamp')
+    df = df.sort_index()
+    return df
+
+
+def _read_zenodo_csv(fp, time_format):
+    """
+    Internal helper to load a Zenodo dataset file through the columnar cache.
+    """
+    return read_cached(fp, _parse_zenodo_csv, time_format=time_format)
@@ -1,7 +1,21 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from .downsampling import Method, downsample
+from .memo import memoize
+from .zenodo_loader import _read_zenodo_csv
 
-def _plot_total_load(fp, time_format, max_points=300):
+@memoize
+def _compute_total_load(fp, time_format, max_points=300, downsample_method: Method = "minmax"):
+    """
+    Internal helper computing the downsampled total load of a Zenodo dataset file.
+    """
+    df = _read_zenodo_csv(fp, time_format)
+
+    # Compute total load
+    df['total_load'] = df.sum(axis=1)
+
+    # Downsample if needed; "minmax" keeps peaks and troughs
+    return downsample(df[['total_load']], max_points, downsample_method)
+
+def _plot_total_load(fp, time_format, max_points=300, downsample_method: Method = "minmax", show=True):
     """
     Internal helper function to plot total load from a Zenodo dataset file.
 
@@ -9,42 +23,14 @@ def _plot_total_load(fp, time_format, max_points=300):
         fp (str): Path to CSV file (2016 or 2017 dataset).
         time_format (str): Explicit datetime format used in the file.
         max_points (int): Maximum number of points to display on the plot.
-    """
-
-    # Read just the header to detect timestamp column
-    with open(fp, 'r', encoding='utf-8') as f:
-        first_line = f.readline()
-    columns = first_line.strip().split(';')
-    time_col = next((col for col in columns if 'time' in col.lower()), None)
-
-    if time_col is None:
-        raise ValueError("Timestamp column not found. Expected something like 'Time stamp'.")
+        downsample_method (str): "minmax" (keeps extrema) or "lttb" (keeps the overall shape).
+        show (bool): Call plt.show(); pass False to keep the figure open for saving.
 
-    # Load CSV
-    df = pd.read_csv(fp, sep=';', encoding='utf-8')
-    df.rename(columns={time_col: 'timestamp'}, inplace=True)
-
-    # Clean and parse timestamp
-    df['timestamp'] = (
-        df['timestamp']
-        .astype(str)
-        .str.strip()
-        .str.extract(r'([\d]{2}\.[\d]{2}\.[\d]{4} [\d]{2}:[\d]{2}:[\d]{2})')[0]
-    )
-    df['timestamp'] = pd.to_datetime(df['timestamp'], format=time_format, errors='raise')
-
-    # Set and sort index
-    df = df.set_index('timestamp')
-    df = df.sort_index()
-
-    # Compute total load
-    df['total_load'] = df.sum(axis=1)
+    Returns the plotted (downsampled) total load when show=False.
+    """
+    import matplotlib.pyplot as plt
 
-    # Downsample if needed
-    if len(df) > max_points:
-        df_downsampled = df.iloc[::len(df)//max_points]
-    else:
-        df_downsampled = df
+    df_downsampled = _compute_total_load(fp, time_format, max_points, downsample_method)
 
     # Plot
     plt.figure(figsize=(10, 5))
@@ -55,16 +41,28 @@ def _plot_total_load(fp, time_format, max_points=300):
     plt.grid(True)
     plt.legend()
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+        return None
+    return df_downsampled
+
+def compute_zenodo_total_load(fp, max_points=300, downsample_method: Method = "minmax"):
+    """
+    Downsampled total load of a Zenodo dataset file (2016 or 2017).
+    """
+    return _compute_total_load(fp, time_format='%d.%m.%Y %H:%M:%S', max_points=max_points,
+                               downsample_method=downsample_method)
 
-def plot_zenodo_2016(fp, max_points=300):
+def plot_zenodo_2016(fp, max_points=300, downsample_method: Method = "minmax", show=True):
     """
     Plot total load for the full year of 2016 dataset.
     """
-    _plot_total_load(fp, time_format='%d.%m.%Y %H:%M:%S', max_points=max_points)
+    return _plot_total_load(fp, time_format='%d.%m.%Y %H:%M:%S', max_points=max_points,
+                            downsample_method=downsample_method, show=show)
 
-def plot_zenodo_2017(fp, max_points=300):
+def plot_zenodo_2017(fp, max_points=300, downsample_method: Method = "minmax", show=True):
     """
     Plot total load for the full year of 2017 dataset.
     """
-    _plot_total_load(fp, time_format='%d.%m.%Y %H:%M:%S', max_points=max_points)
+    return _plot_total_load(fp, time_format='%d.%m.%Y %H:%M:%S', max_points=max_points,
+                            downsample_method=downsample_method, show=show)